@@ -0,0 +1,273 @@
+# bench_api.py
+#
+# old/server/app.py 부하 테스트 벤치마크.
+# 픽스처 menus.json으로 API 서버를 띄운 뒤, 점심시간과 비슷한 요청 비율로
+# 동시성을 단계별로 올려가며 처리량과 p50/p95/p99 지연 시간을 측정합니다.
+# 외부 네트워크 없이 한 대의 리눅스 머신에서 돌아가도록 표준 라이브러리만 사용합니다.
+#
+# 사용 예:
+#   python benchmarks/bench_api.py
+#   python benchmarks/bench_api.py --concurrency 1,8,32 --duration 5
+#   python benchmarks/bench_api.py --compare benchmarks/results/api-20251016-120000.json
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SERVER_DIR = ROOT_DIR / "old" / "server"
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "menus.json"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# 점심시간 요청 비율 (경로, 가중치)
+# 대부분은 전체 식단, 그다음은 자주 가는 식당 몇 곳만 골라 보는 요청입니다.
+REQUEST_MIX = [
+    ("/api/today", 45),
+    ("/api/today?places=students", 12),
+    ("/api/today?places=students,dodam", 12),
+    ("/api/today?places=dodam,students", 6),
+    ("/api/today?places=dorm", 8),
+    ("/api/today?places=students,foodcourt", 5),
+    ("/api/places", 12),
+]
+
+
+# --- 유틸리티 함수 ---
+
+def _free_port() -> int:
+    """사용 가능한 로컬 포트를 하나 골라 반환합니다."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    """정렬된 값 목록에서 nearest-rank 방식으로 백분위수를 구합니다."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, timeout=5
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# --- 서버 실행 ---
+
+def start_server(data_path: Path, port: int, workers: int = 1) -> subprocess.Popen:
+    """픽스처 데이터로 uvicorn 서버를 띄우고 응답할 때까지 기다립니다."""
+    # 부하 도구 하나가 모든 요청을 보내므로 IP별 요청 제한은 끕니다.
+    env = {**os.environ, "SSU_DINING_DATA_PATH": str(data_path), "SSU_DINING_RATE_LIMIT": "0"}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app",
+         "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=SERVER_DIR, env=env,
+    )
+
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버가 시작 직후 종료되었습니다 (exit {proc.returncode})")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5) as s:
+                s.sendall(b"GET /api/places HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n")
+                if s.recv(16).startswith(b"HTTP/1.1 200"):
+                    return proc
+        except OSError:
+            pass
+        time.sleep(0.1)
+
+    proc.terminate()
+    raise RuntimeError("서버가 20초 안에 준비되지 않았습니다.")
+
+
+def stop_server(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# --- 부하 생성기 ---
+
+async def _request(reader, writer, path: str) -> int:
+    """keep-alive 연결로 GET 요청 하나를 보내고 상태 코드를 반환합니다."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("서버가 연결을 닫았습니다.")
+    status = int(status_line.split()[1])
+
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value.strip())
+    if length:
+        await reader.readexactly(length)
+    return status
+
+
+async def _worker(port: int, paths: list, stop_at: float, warmup_until: float, samples: dict, rng: random.Random):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    weights = [w for _, w in paths]
+    choices = [p for p, _ in paths]
+    try:
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            path = rng.choices(choices, weights)[0]
+            start = time.perf_counter()
+            try:
+                status = await _request(reader, writer, path)
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                samples["errors"] += 1
+                writer.close()
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                continue
+            elapsed = time.perf_counter() - start
+            if start < warmup_until:
+                continue
+            if status != 200:
+                samples["errors"] += 1
+                continue
+            samples["latencies"].append(elapsed)
+            samples["by_path"].setdefault(path, []).append(elapsed)
+    finally:
+        writer.close()
+
+
+async def run_level(port: int, concurrency: int, duration: float, warmup: float, seed: int) -> dict:
+    """주어진 동시성으로 duration초 동안 요청을 보내고 통계를 반환합니다."""
+    samples = {"latencies": [], "by_path": {}, "errors": 0}
+    begin = time.perf_counter()
+    warmup_until = begin + warmup
+    stop_at = warmup_until + duration
+
+    await asyncio.gather(*(
+        _worker(port, REQUEST_MIX, stop_at, warmup_until, samples, random.Random(seed + i))
+        for i in range(concurrency)
+    ))
+
+    latencies = sorted(samples["latencies"])
+    ms = lambda v: round(v * 1000, 3)
+    return {
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "requests": len(latencies),
+        "errors": samples["errors"],
+        "throughput_rps": round(len(latencies) / duration, 1),
+        "latency_ms": {
+            "p50": ms(_percentile(latencies, 50)),
+            "p95": ms(_percentile(latencies, 95)),
+            "p99": ms(_percentile(latencies, 99)),
+            "max": ms(latencies[-1]) if latencies else 0.0,
+        },
+        "by_path": {
+            path: {"requests": len(v), "p50_ms": ms(_percentile(sorted(v), 50)), "p99_ms": ms(_percentile(sorted(v), 99))}
+            for path, v in sorted(samples["by_path"].items())
+        },
+    }
+
+
+# --- 결과 출력/비교 ---
+
+def print_level(level: dict):
+    lat = level["latency_ms"]
+    print(f"  c={level['concurrency']:>4}  {level['throughput_rps']:>9.1f} req/s  "
+          f"p50 {lat['p50']:>7.2f}ms  p95 {lat['p95']:>7.2f}ms  p99 {lat['p99']:>7.2f}ms  "
+          f"errors {level['errors']}")
+
+
+def print_comparison(current: dict, previous: dict):
+    """이전 결과 파일과 동시성 단계별로 처리량/p99를 비교해 출력합니다."""
+    prev_levels = {lv["concurrency"]: lv for lv in previous.get("levels", [])}
+    print(f"\n이전 결과와 비교 ({previous.get('started_at')}, commit {previous.get('git_commit')}):")
+    for lv in current["levels"]:
+        prev = prev_levels.get(lv["concurrency"])
+        if not prev:
+            continue
+        rps_delta = (lv["throughput_rps"] / prev["throughput_rps"] - 1) * 100 if prev["throughput_rps"] else 0.0
+        p99_delta = (lv["latency_ms"]["p99"] / prev["latency_ms"]["p99"] - 1) * 100 if prev["latency_ms"]["p99"] else 0.0
+        print(f"  c={lv['concurrency']:>4}  처리량 {rps_delta:+6.1f}%  p99 {p99_delta:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSU Dining API 부하 테스트")
+    parser.add_argument("--data", type=Path, default=FIXTURE_PATH, help="서버에 넣을 menus.json 픽스처")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="쉼표로 구분한 동시성 단계")
+    parser.add_argument("--duration", type=float, default=10.0, help="단계별 측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="단계별 워밍업 시간(초)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 경로 (기본: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    port = _free_port()
+    started_at = datetime.now()
+
+    print(f"API 서버 시작 중... (port {port}, data {args.data})")
+    proc = start_server(args.data, port, args.workers)
+    try:
+        results = []
+        for c in levels:
+            level = asyncio.run(run_level(port, c, args.duration, args.warmup, args.seed))
+            print_level(level)
+            results.append(level)
+    finally:
+        stop_server(proc)
+
+    report = {
+        "benchmark": "api",
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "workers": args.workers,
+        "fixture": str(args.data),
+        "request_mix": [{"path": p, "weight": w} for p, w in REQUEST_MIX],
+        "levels": results,
+    }
+
+    out = args.output or RESULTS_DIR / f"api-{started_at.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 결과 저장: {out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print_comparison(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
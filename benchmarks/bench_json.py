@@ -0,0 +1,140 @@
+# bench_json.py
+#
+# JSON 직렬화 벤치마크.
+# 픽스처 메뉴(menus.json 하루치)와 그것을 여러 날로 늘린 기간 조회 응답을
+# 설치된 라이브러리(표준 json, orjson, msgspec)별로 인코딩/디코딩해 1회당 시간을 비교합니다.
+# menu_json.py가 실제로 고르는 백엔드도 함께 표시합니다.
+#
+# 사용 예:
+#   python benchmarks/bench_json.py
+#   python benchmarks/bench_json.py --days 93 --repeat 200
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import menu_json  # noqa: E402
+
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "menus.json"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _codecs() -> dict:
+    """라이브러리 이름 -> {작업 이름: 함수}. decode로 시작하는 작업은 인코딩된 bytes를 받습니다."""
+    codecs = {
+        "json": {
+            "encode": lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            "encode_pretty": lambda obj: json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"),
+            "decode": json.loads,
+        },
+    }
+    try:
+        import orjson
+        codecs["orjson"] = {
+            "encode": orjson.dumps,
+            "encode_pretty": lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2),
+            "decode": orjson.loads,
+        }
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        encoder = msgspec.json.Encoder()
+        codecs["msgspec"] = {
+            "encode": encoder.encode,
+            "encode_pretty": lambda obj: msgspec.json.format(encoder.encode(obj), indent=2),
+            "decode": msgspec.json.Decoder().decode,
+            "decode_typed": msgspec.json.Decoder(menu_json.Snapshot).decode,
+        }
+    except ImportError:
+        pass
+    return codecs
+
+
+def _payloads(snapshot: dict, days: int) -> dict:
+    """벤치마크할 페이로드: 하루치 기록, days일치 기간 조회 응답과 같은 모양의 열 단위 데이터"""
+    columns = {"date": [], "place": [], "meal": [], "corner": [], "items": []}
+    for d in range(days):
+        for key, place in snapshot["places"].items():
+            for menu in place["menus"]:
+                columns["date"].append(f"day-{d}")
+                columns["place"].append(key)
+                columns["meal"].append(menu["meal"])
+                columns["corner"].append(menu["corner"])
+                columns["items"].append(menu["items"])
+    return {
+        "today": snapshot,
+        f"range_{days}d": {"dates": [f"day-{d}" for d in range(days)], "count": len(columns["date"]), "columns": columns},
+    }
+
+
+def _time(fn, arg, repeat: int) -> float:
+    fn(arg)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat
+
+
+def run(payloads: dict, repeat: int) -> list:
+    results = []
+    for payload_name, payload in payloads.items():
+        encoded = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        print(f"\n[{payload_name}] {len(encoded) / 1024:,.1f}KB")
+        for codec_name, ops in _codecs().items():
+            for op, fn in ops.items():
+                # 스키마 디코딩은 하루치 기록 모양에만 해당합니다.
+                if op == "decode_typed" and payload_name != "today":
+                    continue
+                arg = encoded if op.startswith("decode") else payload
+                seconds = _time(fn, arg, repeat)
+                results.append({
+                    "payload": payload_name,
+                    "bytes": len(encoded),
+                    "library": codec_name,
+                    "op": op,
+                    "us_per_op": round(seconds * 1e6, 2),
+                    "mb_per_s": round(len(encoded) / seconds / 1e6, 1),
+                })
+                print(f"  {codec_name:<8} {op:<14} {seconds * 1e6:>10,.1f}µs  ({len(encoded) / seconds / 1e6:,.0f}MB/s)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 직렬화 벤치마크")
+    parser.add_argument("--fixture", type=Path, default=FIXTURE_PATH)
+    parser.add_argument("--days", type=int, default=31, help="기간 조회 페이로드의 날짜 수")
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        snapshot = json.load(f)
+
+    started_at = datetime.now()
+    print(f"menu_json 백엔드: {menu_json.BACKEND}")
+    results = run(_payloads(snapshot, args.days), args.repeat)
+
+    out = args.output or RESULTS_DIR / f"json-{started_at.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({
+            "benchmark": "json",
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "backend": menu_json.BACKEND,
+            "repeat": args.repeat,
+            "results": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 결과 저장: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# bench_parsers.py
+#
+# 코너 파서 벤치마크.
+# 픽스처 코너 텍스트를 여러 번 반복해 기록 전체 재파싱과 비슷한 부하를 만들고,
+# 식당 형식별 처리량(코너/초)을 측정해 JSON으로 저장합니다.
+#
+# 사용 예:
+#   python benchmarks/bench_parsers.py
+#   python benchmarks/bench_parsers.py --repeat 20000
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from menu_parsers import parse_dodam_corner, parse_students_corner  # noqa: E402
+
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "corners.json"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+PARSERS = {
+    "students": parse_students_corner,
+    "dodam": parse_dodam_corner,
+}
+
+
+def run(corners: dict, repeat: int) -> list:
+    results = []
+    for key, parser in PARSERS.items():
+        texts = corners.get(key, [])
+        if not texts:
+            continue
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                parser(text)
+        elapsed = time.perf_counter() - start
+        count = repeat * len(texts)
+        results.append({
+            "format": key,
+            "corners": count,
+            "seconds": round(elapsed, 4),
+            "corners_per_s": round(count / elapsed),
+            "us_per_corner": round(elapsed / count * 1e6, 2),
+        })
+        print(f"  {key:<10} {count / elapsed:>12,.0f} 코너/초  ({elapsed / count * 1e6:.2f}µs/코너)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="코너 파서 벤치마크")
+    parser.add_argument("--fixture", type=Path, default=FIXTURE_PATH)
+    parser.add_argument("--repeat", type=int, default=10000)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        corners = json.load(f)
+
+    started_at = datetime.now()
+    results = run(corners, args.repeat)
+
+    out = args.output or RESULTS_DIR / f"parsers-{started_at.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({
+            "benchmark": "parsers",
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "repeat": args.repeat,
+            "results": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 결과 저장: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# browser_pool.py
+#
+# 프로세스 안에서 함께 쓰는 비동기 Playwright 브라우저 풀.
+# Chromium은 처음 필요할 때 한 번만 띄우고, 스크랩 한 번마다 가벼운 브라우저 컨텍스트를 새로 만들어 빌려줍니다.
+# 동시에 빌려줄 수 있는 컨텍스트 수를 제한하며, 브라우저가 죽었으면 다음 요청 때 다시 띄웁니다.
+# 스크래퍼 CLI(실행마다 풀 하나)와 API 서버의 /api/refresh(서버가 떠 있는 동안 풀 하나)가 같은 코드를 씁니다.
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+# 동시에 열 수 있는 컨텍스트 수 기본값
+MAX_CONTEXTS = 2
+
+
+class BrowserPool:
+    """Chromium 하나를 띄워 두고 컨텍스트를 빌려주는 풀입니다."""
+
+    def __init__(self, max_contexts: int = MAX_CONTEXTS, launch_args: list | None = None):
+        self.max_contexts = max_contexts
+        self.launch_args = launch_args or []
+        self._semaphore = asyncio.Semaphore(max_contexts)
+        self._launch_lock = asyncio.Lock()
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+
+    @property
+    def browser(self) -> Browser | None:
+        return self._browser
+
+    async def _ensure_browser(self) -> Browser:
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True, args=self.launch_args)
+            return self._browser
+
+    @asynccontextmanager
+    async def context(self, **options):
+        """
+        새 브라우저 컨텍스트를 빌려줍니다. 블록을 빠져나가면 컨텍스트를 닫습니다.
+        (HAR 기록은 컨텍스트를 닫을 때 파일로 써집니다.)
+        """
+        async with self._semaphore:
+            browser = await self._ensure_browser()
+            context: BrowserContext = await browser.new_context(**options)
+            try:
+                yield context
+            finally:
+                await context.close()
+
+    async def restart(self):
+        """브라우저를 닫습니다. 다음 context() 호출 때 새로 띄웁니다."""
+        async with self._launch_lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+
+    async def close(self):
+        await self.restart()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
@@ -0,0 +1,168 @@
+# dish_index.py
+#
+# 메뉴 이름 정규화와 메뉴 ID 사전.
+# 같은 메뉴가 띄어쓰기, 기호, 여러 ★ 줄을 ' & '로 합친 이름 등 여러 형태로 나오므로
+# 이름을 정규화한 키로 정수 ID를 붙이고, 그 사전을 history/dishes.json에 영구 보관합니다.
+# 한 번 붙은 ID는 바뀌지 않으므로 검색, 통계, 중복 제거를 문자열 대신 정수로 할 수 있습니다.
+#
+# 기록의 각 메뉴 항목에는 다음 필드가 붙습니다.
+#   dish_id        : 이름 전체의 ID
+#   component_ids  : '&'로 묶인 메뉴라면 구성 메뉴별 ID (예: 등심돈까스 & 삼겹살김치볶음밥)
+# 영문명은 날마다 표기가 달라 ID 계산에 쓰지 않습니다.
+# 스크래퍼 CLI와 API(/api/refresh)가 함께 사전을 고치므로, ID를 붙이고 저장하는 동안은 open_index()로 파일을 잠급니다.
+#
+# 사용 예:
+#   python dish_index.py backfill           # 기존 기록 전체에 ID 붙이기
+#   python dish_index.py lookup "등심 돈까스"
+
+import argparse
+import json
+import os
+import re
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+
+import menu_store
+
+INDEX_PATH = menu_store.HISTORY_DIR / "dishes.json"
+
+# 구성 메뉴 구분자
+_SPLIT_RE = re.compile(r"\s*[&＆+]\s*")
+# 공백과 구두점(괄호, 쉼표, 점, 가운뎃점 등)은 모두 지웁니다. 한글 메뉴는 띄어쓰기가 들쭉날쭉합니다.
+_FOLD_RE = re.compile(r"[\s\W_]+")
+
+
+def normalize(name: str) -> str:
+    """
+    비교용 정규화 키를 반환합니다.
+    NFKC 정규화(조합형 한글 통일 + 전각 기호 등 호환 문자 통일) → 소문자 → 공백/구두점 제거
+    NFC가 아니라 NFKC를 씁니다. 결과는 NFC처럼 한글이 완성형으로 합쳐지면서, 식단에 섞여 나오는
+    전각 영숫자(ＢＢＱ), 동그라미 숫자(①) 같은 호환 문자도 일반 글자로 바뀌어 같은 메뉴가 한 키로 모입니다.
+    이미 붙은 ID가 바뀌지 않도록 이 규칙은 바꾸지 않습니다.
+    """
+    name = unicodedata.normalize("NFKC", name or "").casefold()
+    return _FOLD_RE.sub("", name)
+
+
+def split_components(name: str) -> list[str]:
+    """'&'로 묶인 메뉴 이름을 구성 메뉴 이름들로 나눕니다."""
+    return [part for part in _SPLIT_RE.split(unicodedata.normalize("NFKC", name or "").strip()) if part]
+
+
+class DishIndex:
+    """정규화 키 -> 정수 ID 사전입니다. 조회는 dict 한 번(O(1))입니다."""
+
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = path
+        self.ids = {}
+        self.names = []
+        self.dirty = False
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.names = data.get("names", [])
+            self.ids = {key: i for i, key in enumerate(data.get("keys", []))}
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, name: str) -> int | None:
+        """이미 등록된 메뉴의 ID를 반환합니다. 없으면 None을 반환합니다."""
+        return self.ids.get(normalize(name))
+
+    def id_for(self, name: str) -> int | None:
+        """메뉴의 ID를 반환하며, 처음 보는 메뉴면 새 ID를 붙입니다. 정규화 후 빈 이름이면 None입니다."""
+        key = normalize(name)
+        if not key:
+            return None
+        dish_id = self.ids.get(key)
+        if dish_id is None:
+            dish_id = self.ids[key] = len(self.names)
+            # 처음 본 표기를 대표 이름으로 씁니다.
+            self.names.append(name.strip())
+            self.dirty = True
+        return dish_id
+
+    def name_of(self, dish_id: int) -> str:
+        return self.names[dish_id]
+
+    def annotate(self, result: dict) -> dict:
+        """스크랩 결과(menus.json 구조)의 모든 메뉴 항목에 dish_id/component_ids를 붙입니다."""
+        for place in result.get("places", {}).values():
+            for menu in place.get("menus", []):
+                for item in menu.get("items", []):
+                    name = item.get("name")
+                    if not name:
+                        continue
+                    item["dish_id"] = self.id_for(name)
+                    components = split_components(name)
+                    if len(components) > 1:
+                        item["component_ids"] = [self.id_for(c) for c in components]
+                    else:
+                        item.pop("component_ids", None)
+        return result
+
+    def save(self):
+        """새 ID가 생겼을 때만 사전 파일을 교체합니다."""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        keys = [None] * len(self.names)
+        for key, i in self.ids.items():
+            keys[i] = key
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"keys": keys, "names": self.names}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+@contextmanager
+def open_index(path: Path = INDEX_PATH):
+    """
+    사전 파일을 잠그고 읽은 DishIndex를 돌려주고, 블록이 끝나면 새 ID를 저장한 뒤 잠금을 풉니다.
+    두 프로세스가 같은 사전을 따로 읽어 같은 번호를 서로 다른 메뉴에 붙이는 일을 막습니다.
+    """
+    with menu_store.file_lock(path):
+        index = DishIndex(path)
+        yield index
+        index.save()
+
+
+def backfill() -> int:
+    """기존 기록 전체에 메뉴 ID를 붙여 다시 저장합니다. 처리한 날짜 수를 반환합니다."""
+    count = 0
+    with open_index() as index:
+        for snapshot in menu_store.iter_snapshots(None, None, use_cache=False):
+            menu_store.save_snapshot(index.annotate(snapshot))
+            count += 1
+    return count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="메뉴 ID 사전 관리")
+    sub = arg_parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("backfill", help="기존 기록 전체에 메뉴 ID 붙이기")
+    lookup = sub.add_parser("lookup", help="메뉴 이름의 ID 조회")
+    lookup.add_argument("name")
+    args = arg_parser.parse_args()
+
+    if args.command == "backfill":
+        count = backfill()
+        print(f"✅ {count}일치 기록에 메뉴 ID를 붙였습니다. (메뉴 {len(DishIndex())}종)")
+    else:
+        index = DishIndex()
+        dish_id = index.lookup(args.name)
+        if dish_id is None:
+            print(f"등록되지 않은 메뉴입니다: {args.name}")
+        else:
+            print(f"{dish_id}: {index.name_of(dish_id)} (키: {normalize(args.name)})")
+        components = split_components(args.name)
+        if len(components) > 1:
+            for part in components:
+                print(f"  - {part}: {index.lookup(part)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# dorm_board.py
+#
+# 기숙사 식단 게시판을 브라우저 없이 읽습니다.
+# 식단표(.ht_area 표)는 자바스크립트 없이 HTML에 그대로 들어 있으므로,
+# HTTPS 요청(포트 444) 한 번으로 받아 표를 파싱하면 Chromium을 띄워 기다릴 필요가 없습니다.
+#   - fetch_board(): 게시판 HTML을 받아 문자열로 반환 (응답 헤더/meta의 문자셋으로 디코딩)
+#   - parse_week(): 식사(조식/중식/석식)별로 월~일 7칸의 메뉴 줄 목록을 반환
+#   - cells_for(): 그날 요일 칸을 DormSource의 원본 캡처 형식([식사, 칸 HTML])으로 반환
+# 칸 안의 <br>을 줄 경계로 보고, 나머지 태그는 버리며 &amp; 같은 엔티티는 원래 글자로 바꿉니다.
+#
+# lxml이 있으면 lxml로, 없으면 표준 html.parser로 파싱합니다. (결과는 같음)
+
+import html
+import re
+import ssl
+import urllib.request
+from html.parser import HTMLParser
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml이 없으면 표준 html.parser를 씁니다.
+    lxml_html = None
+
+DORM_URL = "https://ssudorm.ssu.ac.kr:444/SShostel/mall_main.php?viewform=B0001_foodboard_list&board_no=1"
+USER_AGENT = "Mozilla/5.0 (compatible; ssu-dining-scraper)"
+
+MEALS = ("조식", "중식", "석식")
+WEEKDAYS = 7
+
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+# <br>을 표시하는 구분 문자. 원본 HTML의 줄바꿈(공백)과 구분하기 위해 씁니다.
+_BR = "\x1f"
+
+
+def fetch_board(url: str = DORM_URL, timeout: float = 10.0) -> str:
+    """게시판 HTML을 받아 반환합니다. 인증서 검증은 그대로 하므로 실패하면 ssl.SSLError(URLError)가 납니다."""
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout, context=ssl.create_default_context()) as response:
+        body = response.read()
+        charset = response.headers.get_content_charset()
+    if not charset:
+        m = _META_CHARSET_RE.search(body[:4096])
+        charset = m.group(1).decode("ascii") if m else "utf-8"
+    return body.decode(charset, errors="replace")
+
+
+def _clean_lines(text: str) -> list:
+    """구분 문자로 나눈 칸 텍스트를 공백을 정리한 줄 목록으로 바꿉니다. 빈 줄은 뺍니다."""
+    return [line for line in (" ".join(part.split()) for part in text.split(_BR)) if line]
+
+
+def _rows_lxml(text: str) -> list:
+    doc = lxml_html.fromstring(text)
+    # 브라우저와 달리 lxml은 tbody를 끼워 넣지 않으므로 .ht_area 아래의 모든 tr을 봅니다.
+    rows = []
+    for tr in doc.xpath("//*[contains(concat(' ', normalize-space(@class), ' '), ' ht_area ')]//tr"):
+        cells = []
+        for td in tr.xpath("./td"):
+            for br in td.iter("br"):
+                br.tail = _BR + (br.tail or "")
+            cells.append(_clean_lines(td.text_content()))
+        rows.append(cells)
+    return rows
+
+
+class _TableParser(HTMLParser):
+    """.ht_area 안의 표를 [행 -> [칸 -> 줄 목록]]으로 모읍니다. (lxml이 없을 때)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self._area_depth = 0   # .ht_area 요소 안에서의 열린 태그 깊이 (0이면 바깥)
+        self._cell = None      # 지금 읽는 칸의 텍스트 조각
+
+    def handle_starttag(self, tag, attrs):
+        if self._area_depth:
+            if tag not in ("br", "img", "input", "hr", "meta", "link"):
+                self._area_depth += 1
+        elif "ht_area" in (dict(attrs).get("class") or "").split():
+            self._area_depth = 1
+            return
+        else:
+            return
+
+        if tag == "tr":
+            self.rows.append([])
+        elif tag == "td" and self.rows:
+            self._cell = []
+        elif tag == "br" and self._cell is not None:
+            self._cell.append(_BR)
+
+    def handle_endtag(self, tag):
+        if not self._area_depth:
+            return
+        if tag == "td" and self._cell is not None:
+            self.rows[-1].append(_clean_lines("".join(self._cell)))
+            self._cell = None
+        if tag not in ("br", "img", "input", "hr", "meta", "link"):
+            self._area_depth -= 1
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def _rows_stdlib(text: str) -> list:
+    parser = _TableParser()
+    parser.feed(text)
+    parser.close()
+    return parser.rows
+
+
+def parse_week(text: str) -> dict:
+    """
+    게시판 HTML에서 {식사: [월, 화, ..., 일 칸의 메뉴 줄 목록]}을 반환합니다.
+    식단표를 찾지 못하면 ValueError가 납니다. (페이지 구조가 바뀐 경우)
+    """
+    rows = _rows_lxml(text) if lxml_html is not None else _rows_stdlib(text)
+    week = {}
+    for cells in rows:
+        # 첫 칸이 식사 이름('구분' 열)이고 그 뒤로 월~일 칸이 이어집니다.
+        if cells and cells[0] and cells[0][0] in MEALS:
+            days = cells[1:WEEKDAYS + 1]
+            week[cells[0][0]] = days + [[] for _ in range(WEEKDAYS - len(days))]
+    if not week:
+        raise ValueError("기숙사 식단표(.ht_area)를 찾을 수 없습니다.")
+    return week
+
+
+def cells_for(week: dict, weekday: int) -> list:
+    """
+    weekday(월요일=0) 칸들을 [식사, 칸 HTML] 목록으로 반환합니다.
+    브라우저로 읽은 원본 캡처와 형식을 맞추기 위해 줄을 <br>로 다시 잇습니다. (parse_dorm_cell이 그대로 파싱)
+    """
+    return [[meal, "<br>".join(html.escape(line, quote=False) for line in days[weekday])]
+            for meal, days in week.items()]
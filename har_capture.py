@@ -0,0 +1,61 @@
+# har_capture.py
+#
+# 스크래퍼 기록/재생(record/replay) 모듈.
+# record 모드는 스크랩 중 받은 모든 응답을 HAR 파일로 저장하고,
+# replay 모드는 네트워크 없이 그 HAR 파일에서만 응답을 돌려줍니다.
+# 파서를 고치거나 스크래퍼 속도를 측정할 때 매번 실제 사이트에 접속하지 않아도 됩니다.
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from dateutil import parser as date_parser
+from playwright.async_api import BrowserContext
+
+CAPTURE_DIR = Path(__file__).resolve().parent / "captures"
+
+MODES = ("live", "record", "replay")
+
+
+def default_har_path(date: str) -> Path:
+    """날짜별 기본 HAR 저장 경로를 반환합니다. (예: captures/2025-10-16.har)"""
+    return CAPTURE_DIR / f"{date}.har"
+
+
+async def attach(context: BrowserContext, mode: str, har_path: Path | None):
+    """
+    브라우저 컨텍스트에 기록/재생 라우팅을 연결합니다.
+    record 모드의 HAR 파일은 context.close() 시점에 저장되므로
+    호출하는 쪽에서 반드시 컨텍스트를 닫아야 합니다.
+    """
+    if mode not in MODES:
+        raise ValueError(f"알 수 없는 모드입니다: {mode} (가능한 값: {', '.join(MODES)})")
+    if mode == "live":
+        return
+
+    if har_path is None:
+        raise ValueError(f"{mode} 모드에는 HAR 파일 경로가 필요합니다.")
+
+    if mode == "record":
+        har_path.parent.mkdir(parents=True, exist_ok=True)
+        # update=True: 실제 네트워크로 요청하면서 응답을 HAR에 기록
+        await context.route_from_har(har_path, update=True, update_content="embed", update_mode="full")
+        print(f"📼 기록 모드: {har_path}")
+    else:
+        if not har_path.exists():
+            raise FileNotFoundError(f"재생할 HAR 파일이 없습니다: {har_path}")
+        # not_found="abort": HAR에 없는 요청은 네트워크로 내보내지 않고 실패 처리
+        await context.route_from_har(har_path, not_found="abort")
+        print(f"▶️  재생 모드: {har_path}")
+
+
+def recorded_at(har_path: Path) -> datetime | None:
+    """
+    HAR 파일의 첫 요청 시각을 반환합니다.
+    재생 시 '오늘' 기준(기숙사 요일 열, 결과 date)을 기록 당시로 맞추는 데 씁니다.
+    """
+    with open(har_path, "r", encoding="utf-8") as f:
+        entries = json.load(f).get("log", {}).get("entries", [])
+    if not entries:
+        return None
+    return date_parser.isoparse(entries[0]["startedDateTime"])
@@ -0,0 +1,250 @@
+# menu_cache.py
+#
+# API 응답 캐시 (2단계).
+#   1단계: 프로세스 안의 LRU. 인코딩을 마친 응답 본문(bytes)을 날짜/식당/형식 등으로 만든 키에 담습니다.
+#   2단계: 여러 서버(노드)가 함께 쓰는 공유 캐시. Redis를 쓰거나, 테스트/단일 노드용으로 메모리 구현을 씁니다.
+# 한 노드가 만든 본문을 다른 노드는 공유 캐시에서 가져가므로 노드마다 같은 데이터를 다시 읽고 인코딩하지 않습니다.
+#
+# 스크래퍼가 새 메뉴를 저장하면 publish_invalidation()으로 알림을 보내고(pub/sub),
+# 구독 중인 노드는 1단계 캐시를 비우고 menus.json을 다시 읽습니다.
+# 캐시 키에는 데이터 버전(generated_at 등)이 들어가므로 공유 캐시의 예전 본문은 TTL이 지나 저절로 사라집니다.
+#
+# 공유 캐시 주소는 SSU_DINING_CACHE_URL 환경 변수로 정합니다.
+#   redis://localhost:6379/0   Redis (pip install redis)
+#   memory://                  같은 프로세스 안에서만 공유되는 메모리 구현
+#   (없음)                     1단계 캐시만 씀
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # redis가 없으면 redis:// 주소를 쓸 수 없습니다.
+    redis = None
+
+CACHE_URL = os.environ.get("SSU_DINING_CACHE_URL")
+
+# 공유 캐시의 키 접두사와 무효화 알림 채널
+KEY_PREFIX = "ssu-dining:"
+CHANNEL = "ssu-dining:invalidate"
+
+# 1단계 캐시의 최대 항목 수, 공유 캐시 항목의 수명(초)
+LOCAL_MAX_ENTRIES = 256
+SHARED_TTL = 6 * 3600
+
+
+def available() -> bool:
+    """Redis 공유 캐시를 쓸 수 있는지 여부 (redis 패키지 설치 여부)"""
+    return redis is not None
+
+
+class LocalLRU:
+    """항목 수가 max_entries를 넘으면 가장 오래 안 쓴 항목부터 버리는 LRU입니다. 여러 스레드에서 써도 됩니다."""
+
+    def __init__(self, max_entries: int = LOCAL_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class MemorySharedTier:
+    """
+    공유 캐시의 메모리 구현. 같은 객체를 쓰는 TieredCache끼리만 공유됩니다.
+    Redis 없이 여러 노드를 흉내 내는 테스트나 단일 노드 배포에 씁니다. (TTL은 무시합니다)
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        return self._items.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int = SHARED_TTL):
+        self._items[key] = value
+
+    def publish(self, message: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(message)
+
+    def subscribe(self, callback):
+        """무효화 알림마다 callback(message)를 부릅니다. 구독을 끊는 함수를 반환합니다."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def close(self):
+        pass
+
+
+class RedisSharedTier:
+    """
+    Redis 공유 캐시. 연결 문제로 명령이 실패하면 캐시에 없는 것으로 보고 넘어가
+    Redis가 잠시 멈춰도 API는 (느려질 뿐) 계속 응답합니다.
+    """
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("redis 패키지가 설치되어 있지 않습니다. (pip install redis)")
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._threads = []
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self.client.get(KEY_PREFIX + key)
+        except redis.RedisError:
+            return None
+
+    def set(self, key: str, value: bytes, ttl: int = SHARED_TTL):
+        try:
+            self.client.set(KEY_PREFIX + key, value, ex=ttl)
+        except redis.RedisError:
+            pass
+
+    def publish(self, message: dict):
+        self.client.publish(CHANNEL, json.dumps(message, ensure_ascii=False))
+
+    def subscribe(self, callback):
+        """무효화 알림마다 callback(message)를 부릅니다. (백그라운드 스레드) 구독을 끊는 함수를 반환합니다."""
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{CHANNEL: lambda raw: callback(json.loads(raw["data"]))})
+        thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        self._threads.append(thread)
+        return thread.stop
+
+    def close(self):
+        for thread in self._threads:
+            thread.stop()
+        self.client.close()
+
+
+# memory:// 주소는 프로세스 안에서 하나의 저장소를 같이 씁니다.
+_memory_tier = None
+
+
+def open_shared_tier(url: str | None = CACHE_URL):
+    """주소에 맞는 공유 캐시를 엽니다. 주소가 없으면 None(1단계 캐시만 씀)을 반환합니다."""
+    global _memory_tier
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        if _memory_tier is None:
+            _memory_tier = MemorySharedTier()
+        return _memory_tier
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSharedTier(url)
+    raise ValueError(f"지원하지 않는 캐시 주소입니다: {url}")
+
+
+class TieredCache:
+    """1단계(LocalLRU)와 2단계(공유 캐시)를 차례로 찾고, 둘 다 없으면 만들어 두 곳에 담습니다."""
+
+    def __init__(self, shared=None, max_entries: int = LOCAL_MAX_ENTRIES, ttl: int = SHARED_TTL):
+        self.local = LocalLRU(max_entries)
+        self.shared = shared
+        self.ttl = ttl
+        self.stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0}
+        self._unsubscribe = None
+
+    def get(self, key: str) -> bytes | None:
+        value = self.local.get(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.stats["shared_hits"] += 1
+                self.local.set(key, value)
+                return value
+        return None
+
+    def set(self, key: str, value: bytes):
+        self.local.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value, self.ttl)
+
+    def get_or_build(self, key: str, build) -> bytes:
+        """key의 본문을 반환합니다. 어느 단계에도 없으면 build()로 만들어 담습니다."""
+        value = self.get(key)
+        if value is None:
+            self.stats["misses"] += 1
+            value = build()
+            self.set(key, value)
+        return value
+
+    def invalidate(self):
+        """1단계 캐시를 비웁니다. 공유 캐시는 키의 데이터 버전이 바뀌므로 따로 지우지 않습니다."""
+        self.local.clear()
+        self.stats["invalidations"] += 1
+
+    def listen(self, on_invalidate=None):
+        """공유 캐시의 무효화 알림을 구독합니다. 알림이 오면 1단계 캐시를 비우고 on_invalidate(message)를 부릅니다."""
+        if self.shared is None or self._unsubscribe is not None:
+            return
+
+        def handle(message):
+            self.invalidate()
+            if on_invalidate is not None:
+                on_invalidate(message)
+        self._unsubscribe = self.shared.subscribe(handle)
+
+    def close(self):
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+
+def publish_invalidation(message: dict, url: str | None = CACHE_URL) -> bool:
+    """
+    새 메뉴를 저장했다고 공유 캐시 구독자(API 노드)들에게 알립니다.
+    공유 캐시를 쓰지 않거나 알림을 보내지 못했으면 False를 반환합니다. (저장 자체는 이미 끝났으므로 실패해도 넘어갑니다)
+    """
+    try:
+        tier = open_shared_tier(url)
+    except (RuntimeError, ValueError) as e:
+        print(f"⚠️ 캐시 무효화 알림을 보내지 못했습니다: {e}")
+        return False
+    if tier is None:
+        return False
+    try:
+        tier.publish(message)
+        return True
+    except Exception as e:
+        print(f"⚠️ 캐시 무효화 알림을 보내지 못했습니다: {e}")
+        return False
+    finally:
+        # memory:// 저장소는 프로세스 안에서 계속 같이 써야 하므로 닫지 않습니다.
+        if not isinstance(tier, MemorySharedTier):
+            tier.close()
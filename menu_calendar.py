@@ -0,0 +1,195 @@
+# menu_calendar.py
+#
+# 식당 휴무 달력.
+# 페이지를 열어 보기 전에 그날 식당이 쉬는지 판단해, 스크래퍼는 쉬는 식당을 건너뛰고 API는 바로 "휴무"라고 답합니다.
+# 다음 순서로 확인해 처음 걸리는 이유를 씁니다.
+#   1. 관측된 휴무: 스크랩하다 페이지에서 명시적인 휴무 안내를 본 날 (history/closures.json, 스크래퍼가 기록)
+#      강제로 다시 스크랩해(--ignore-calendar, /api/refresh?force=true) 메뉴를 읽으면 그 기록은 지워집니다.
+#   2. 학사 일정: calendar.json의 "academic" 기간 (방학 중 휴점 등)
+#   3. 공휴일: calendar.json의 "holidays" (holidays 패키지가 있으면 그 목록도 함께 씀)
+#   4. 요일: 식당별 운영 요일 (PLACE_RULES)
+#
+# calendar.json 형식:
+#   {"holidays": {"2025-10-03": "개천절", ...},
+#    "academic": [{"from": "2025-12-22", "to": "2026-02-28", "name": "겨울방학", "places": ["foodcourt"]}, ...]}
+#   academic 항목에 places가 없으면 모든 식당에 적용합니다.
+# 날짜는 모두 한국 시간(Asia/Seoul) 기준입니다. 서버 시간대와 상관없이 today()/now()를 씁니다.
+
+import os
+from datetime import date, datetime
+from pathlib import Path
+
+from dateutil import tz
+
+import menu_json
+import menu_store
+
+try:
+    import holidays
+except ImportError:  # holidays가 없으면 calendar.json의 공휴일만 씁니다.
+    holidays = None
+
+KST = tz.gettz("Asia/Seoul")
+
+CALENDAR_PATH = Path(os.environ.get("SSU_DINING_CALENDAR_PATH", Path(__file__).resolve().parent / "calendar.json"))
+
+WEEKDAYS = (0, 1, 2, 3, 4)
+EVERY_DAY = (0, 1, 2, 3, 4, 5, 6)
+
+# 식당별 운영 규칙. weekdays는 운영 요일(월요일=0), holidays는 공휴일 운영 여부,
+# hours는 식사별 운영 시간(시작, 끝)입니다. 학교 공지가 바뀌면 여기를 고칩니다.
+PLACE_RULES = {
+    "students": {"weekdays": WEEKDAYS, "holidays": False,
+                 "hours": {"조식": ("08:00", "09:30"), "중식": ("11:00", "14:00")}},
+    "dodam": {"weekdays": WEEKDAYS, "holidays": False,
+              "hours": {"중식": ("11:00", "14:00"), "석식": ("17:00", "18:30")}},
+    "foodcourt": {"weekdays": WEEKDAYS, "holidays": False,
+                  "hours": {"중식": ("10:30", "15:00")}},
+    "dorm": {"weekdays": EVERY_DAY, "holidays": True,
+             "hours": {"조식": ("07:30", "09:00"), "중식": ("11:30", "13:30"), "석식": ("17:30", "19:00")}},
+}
+# 규칙이 없는 식당은 매일 운영한다고 봅니다.
+DEFAULT_RULE = {"weekdays": EVERY_DAY, "holidays": True, "hours": {}}
+
+_WEEKDAY_NAMES = "월화수목금토일"
+
+# 파일 경로 -> (mtime, 데이터)
+_file_cache = {}
+# 연도 -> holidays 패키지의 공휴일 목록
+_package_holidays = {}
+
+
+def _load(path: Path, default):
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return default
+    cached = _file_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    data = menu_json.load(path)
+    _file_cache[path] = (mtime, data)
+    return data
+
+
+def now() -> datetime:
+    """한국 시간 기준 현재 시각"""
+    return datetime.now(tz=KST)
+
+
+def today() -> date:
+    """한국 시간 기준 오늘 날짜. 스크래퍼와 같은 날짜를 쓰도록 서버 시간대를 따르지 않습니다."""
+    return now().date()
+
+
+def observed_path(history_dir: Path | None = None) -> Path:
+    return (history_dir or menu_store.HISTORY_DIR) / "closures.json"
+
+
+def holiday_name(day: date, calendar_path: Path = CALENDAR_PATH) -> str | None:
+    """day가 공휴일이면 이름을, 아니면 None을 반환합니다."""
+    name = _load(calendar_path, {}).get("holidays", {}).get(day.isoformat())
+    if name or holidays is None:
+        return name
+    if day.year not in _package_holidays:
+        _package_holidays[day.year] = holidays.country_holidays("KR", years=day.year)
+    return _package_holidays[day.year].get(day)
+
+
+def rule_for(key: str) -> dict:
+    return PLACE_RULES.get(key, DEFAULT_RULE)
+
+
+def closure_reason(key: str, day: date, calendar_path: Path = CALENDAR_PATH,
+                   history_dir: Path | None = None) -> str | None:
+    """key 식당이 day에 쉬면 그 이유를, 운영하면 None을 반환합니다."""
+    observed = _load(observed_path(history_dir), {}).get(day.isoformat(), {})
+    if key in observed:
+        return observed[key]
+
+    iso = day.isoformat()
+    for period in _load(calendar_path, {}).get("academic", []):
+        if period["from"] <= iso <= period["to"] and key in period.get("places", [key]):
+            return period.get("name", "학사 일정")
+
+    rule = rule_for(key)
+    if not rule["holidays"]:
+        name = holiday_name(day, calendar_path)
+        if name:
+            return name
+    if day.weekday() not in rule["weekdays"]:
+        return f"{_WEEKDAY_NAMES[day.weekday()]}요일 휴무"
+    return None
+
+
+def closed_places(keys: list, day: date, **kwargs) -> dict:
+    """keys 중 day에 쉬는 식당의 {키: 이유}를 반환합니다."""
+    reasons = {key: closure_reason(key, day, **kwargs) for key in keys}
+    return {key: reason for key, reason in reasons.items() if reason}
+
+
+def is_open_at(key: str, when: datetime) -> bool:
+    """when 시각에 key 식당이 식사를 내고 있는지 여부 (휴무일이면 False)"""
+    if closure_reason(key, when.date()):
+        return False
+    now = when.strftime("%H:%M")
+    return any(start <= now < end for start, end in rule_for(key)["hours"].values())
+
+
+def day_status(day: date, keys: list | None = None, when: datetime | None = None) -> dict:
+    """
+    day의 식당별 운영 여부와 휴무 이유, 식사별 운영 시간을 반환합니다. (API 응답용)
+    when(한국 시간)이 같은 날이면 식당별로 그 시각에 식사를 내고 있는지(open_now)도 넣습니다.
+    """
+    keys = keys or list(PLACE_RULES)
+    places = {}
+    for key in keys:
+        reason = closure_reason(key, day)
+        places[key] = {
+            "closed": reason is not None,
+            "reason": reason,
+            "hours": {meal: f"{start}-{end}" for meal, (start, end) in rule_for(key)["hours"].items()},
+        }
+        if when is not None and when.date() == day:
+            places[key]["open_now"] = is_open_at(key, when)
+    return {"date": day.isoformat(), "holiday": holiday_name(day), "places": places}
+
+
+def record_observed(day: str, closures: dict, history_dir: Path | None = None) -> Path | None:
+    """
+    스크랩 중에 확인한 휴무({키: 이유})를 기록합니다. 같은 날 다시 스크랩할 때는 이 식당들을 건너뜁니다.
+    기록할 것이 없으면 아무것도 하지 않고 None을 반환합니다.
+    """
+    if not closures:
+        return None
+    path = observed_path(history_dir)
+    observed = dict(_load(path, {}))
+    observed[day] = {**observed.get(day, {}), **closures}
+    _save_observed(observed, path)
+    return path
+
+
+def clear_observed(day: str, keys: list, history_dir: Path | None = None) -> list:
+    """
+    day에 관측된 휴무 중 keys 식당의 기록을 지우고 지운 식당 키 목록을 반환합니다.
+    강제로 다시 스크랩해 메뉴를 읽었다면 예전 휴무 기록은 틀린 것이므로 지웁니다.
+    """
+    path = observed_path(history_dir)
+    observed = dict(_load(path, {}))
+    closures = dict(observed.get(day, {}))
+    removed = [key for key in keys if closures.pop(key, None) is not None]
+    if not removed:
+        return []
+    if closures:
+        observed[day] = closures
+    else:
+        observed.pop(day)
+    _save_observed(observed, path)
+    return removed
+
+
+def _save_observed(observed: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    menu_json.dump(observed, tmp_path, pretty=True)
+    os.replace(tmp_path, path)
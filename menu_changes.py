@@ -0,0 +1,211 @@
+# menu_changes.py
+#
+# 메뉴 변경 기록(delta).
+# 스크랩 결과를 저장할 때마다 직전 menus.json과 식당/식사/코너 단위로 비교해
+# 바뀐 부분만 JSON Patch(RFC 6902) 연산 목록으로 남기고, 1씩 늘어나는 버전 번호를 붙입니다.
+# 이전 버전의 menus.json을 가진 쪽은 그 뒤의 패치만 차례로 적용하면 최신 menus.json이 됩니다.
+#
+#   history/changes.ndjson : 한 줄에 변경 하나 {"version", "generated_at", "date", "patch"}
+#   history/latest.json    : 변경 기록이 이어지는 기준 스냅샷. 마지막 버전의 menus.json과 같고 "version"이 들어 있습니다.
+#
+# 스크래퍼 CLI와 API(/api/refresh)가 menus.json을 서로 다른 경로에 쓰더라도 모든 쓰기는 publish()로
+# 같은 기준 스냅샷과 비교하므로 패치가 끊기지 않고 이어집니다. publish()는 기준 스냅샷을 먼저 쓰고
+# 기록을 나중에 덧붙이므로, 기준 스냅샷을 받은 클라이언트는 그 버전 뒤의 패치를 빠짐없이 받습니다.
+#
+# 예) 기숙사 석식 코너만 바뀌었다면
+#   [{"op": "replace", "path": "/places/dorm/menus/2", "value": {...}},
+#    {"op": "replace", "path": "/generated_at", "value": "..."}]
+
+import os
+from pathlib import Path
+
+import menu_json
+import menu_store
+
+# 기록에 남겨 둘 최대 변경 수. 넘으면 오래된 것부터 버리고, 그보다 오래된 버전의 클라이언트는 전체를 다시 받습니다.
+MAX_ENTRIES = 1000
+
+# 식당 기본 정보 필드 (메뉴 말고 바뀔 수 있는 값)
+PLACE_FIELDS = ("name", "building", "location_detail")
+
+# 파일 경로 -> (mtime, 변경 목록 또는 기준 스냅샷)
+_log_cache = {}
+_base_cache = {}
+
+
+def log_path(history_dir: Path | None = None) -> Path:
+    return (history_dir or menu_store.HISTORY_DIR) / "changes.ndjson"
+
+
+def base_path(history_dir: Path | None = None) -> Path:
+    return (history_dir or menu_store.HISTORY_DIR) / "latest.json"
+
+
+def _pointer(*parts) -> str:
+    """JSON Pointer 경로를 만듭니다. 키 안의 '~'와 '/'는 규칙대로 바꿉니다."""
+    return "".join("/" + str(p).replace("~", "~0").replace("/", "~1") for p in parts)
+
+
+def _menu_key(menu: dict) -> tuple:
+    return menu.get("meal"), menu.get("corner")
+
+
+def _diff_menus(key: str, old: list, new: list) -> list:
+    """식당 하나의 메뉴 목록을 (식사, 코너) 단위로 비교해 패치 연산을 반환합니다."""
+    if old == new:
+        return []
+    path = ("places", key, "menus")
+    old_keys = [_menu_key(m) for m in old]
+    new_keys = [_menu_key(m) for m in new]
+    common = set(old_keys) & set(new_keys)
+    # 같은 코너가 두 번 나오거나 남은 코너의 순서가 바뀌었으면 목록째 바꿉니다.
+    if (len(set(old_keys)) != len(old_keys) or len(set(new_keys)) != len(new_keys)
+            or [k for k in old_keys if k in common] != [k for k in new_keys if k in common]):
+        return [{"op": "replace", "path": _pointer(*path), "value": new}]
+
+    ops = []
+    # 없어진 코너는 뒤에서부터 지워야 앞쪽 인덱스가 바뀌지 않습니다.
+    for i in reversed(range(len(old))):
+        if old_keys[i] not in common:
+            ops.append({"op": "remove", "path": _pointer(*path, i)})
+    # 새 코너는 앞에서부터 최종 위치에 끼워 넣습니다.
+    for j, menu in enumerate(new):
+        if new_keys[j] not in common:
+            ops.append({"op": "add", "path": _pointer(*path, j), "value": menu})
+    # 남은 코너 중 내용이 바뀐 것만 최종 위치에서 바꿉니다.
+    old_by_key = dict(zip(old_keys, old))
+    for j, menu in enumerate(new):
+        if new_keys[j] in common and old_by_key[new_keys[j]] != menu:
+            ops.append({"op": "replace", "path": _pointer(*path, j), "value": menu})
+    return ops
+
+
+def diff(old: dict | None, new: dict) -> list:
+    """
+    old 기록을 new로 바꾸는 JSON Patch 연산 목록을 반환합니다. 메뉴가 그대로면 빈 목록입니다.
+    (generated_at만 바뀐 경우는 변경으로 보지 않습니다)
+    """
+    if not old:
+        return [{"op": "replace", "path": "", "value": new}]
+    old_places = old.get("places", {})
+    new_places = new.get("places", {})
+    ops = []
+    if list(old_places) != list(new_places) and set(old_places) == set(new_places):
+        # 식당 순서만 바뀌었으면 places째 바꿉니다.
+        return [{"op": "replace", "path": "/places", "value": new_places},
+                {"op": "replace", "path": "/generated_at", "value": new.get("generated_at")},
+                {"op": "replace", "path": "/date", "value": new.get("date")}]
+
+    for key in old_places:
+        if key not in new_places:
+            ops.append({"op": "remove", "path": _pointer("places", key)})
+    for key, place in new_places.items():
+        previous = old_places.get(key)
+        if previous is None:
+            ops.append({"op": "add", "path": _pointer("places", key), "value": place})
+            continue
+        for field in PLACE_FIELDS:
+            if previous.get(field) != place.get(field):
+                ops.append({"op": "replace", "path": _pointer("places", key, field), "value": place.get(field)})
+        ops.extend(_diff_menus(key, previous.get("menus", []), place.get("menus", [])))
+
+    if old.get("date") != new.get("date"):
+        ops.append({"op": "replace", "path": "/date", "value": new.get("date")})
+    if ops:
+        ops.append({"op": "replace", "path": "/generated_at", "value": new.get("generated_at")})
+    return ops
+
+
+def load_log(history_dir: Path | None = None) -> list:
+    """변경 기록 전체를 오래된 순서로 반환합니다."""
+    path = log_path(history_dir)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    cached = _log_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, "rb") as f:
+        entries = [menu_json.loads(line) for line in f if line.strip()]
+    _log_cache[path] = (mtime, entries)
+    return entries
+
+
+def latest_version(history_dir: Path | None = None) -> int:
+    entries = load_log(history_dir)
+    return entries[-1]["version"] if entries else 0
+
+
+def load_base(history_dir: Path | None = None) -> dict | None:
+    """기준 스냅샷(마지막으로 publish한 menus.json, "version" 포함)을 반환합니다. 아직 없으면 None입니다."""
+    path = base_path(history_dir)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _base_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    # 우리가 쓴 파일이므로 스키마 검증 없이 모든 키("version" 포함)를 그대로 읽습니다.
+    data = menu_json.load(path)
+    _base_cache[path] = (mtime, data)
+    return data
+
+
+def publish(new: dict, history_dir: Path | None = None) -> dict | None:
+    """
+    new를 기준 스냅샷과 비교해 바뀌었으면 다음 버전으로 기록하고 그 항목을 반환합니다. 바뀐 메뉴가 없으면 None입니다.
+    new에는 그 결과의 버전("version")을 넣으므로, 이어서 menus.json에 쓰면 그 파일도 버전을 갖습니다.
+    여러 프로세스가 함께 쓰므로 기준 스냅샷을 읽고 기록을 덧붙일 때까지 잠급니다.
+    """
+    with menu_store.file_lock(log_path(history_dir)):
+        old = load_base(history_dir)
+        patch = diff(old, new)
+        if not patch:
+            new["version"] = (old or {}).get("version", latest_version(history_dir))
+            return None
+        version = max(latest_version(history_dir), (old or {}).get("version", 0)) + 1
+        new["version"] = version
+        if old:
+            patch.append({"op": "add", "path": "/version", "value": version})
+        entry = {"version": version, "generated_at": new.get("generated_at"), "date": new.get("date"), "patch": patch}
+        # 기준 스냅샷을 먼저 바꿔야, 그 사이에 기준 스냅샷을 받은 클라이언트가 이 버전의 패치를 놓치지 않습니다.
+        path = base_path(history_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        menu_json.dump(new, tmp_path)
+        os.replace(tmp_path, path)
+        _append(entry, history_dir)
+    return entry
+
+
+def _append(entry: dict, history_dir: Path | None = None):
+    """변경 항목을 기록에 덧붙입니다. 기록이 MAX_ENTRIES를 넘으면 오래된 항목을 버립니다."""
+    entries = load_log(history_dir)
+    path = log_path(history_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if len(entries) >= MAX_ENTRIES:
+        # 쓰는 도중 API가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        tmp_path = path.with_suffix(".ndjson.tmp")
+        with open(tmp_path, "wb") as f:
+            for kept in entries[-(MAX_ENTRIES - 1):] + [entry]:
+                f.write(menu_json.dumps(kept) + b"\n")
+        os.replace(tmp_path, path)
+    else:
+        with open(path, "ab") as f:
+            f.write(menu_json.dumps(entry) + b"\n")
+
+
+def changes_since(since: int, history_dir: Path | None = None) -> list | None:
+    """
+    since 버전 뒤의 변경들을 오래된 순서로 반환합니다.
+    since가 기록에 남은 범위를 벗어나 이어 붙일 수 없으면 None을 반환합니다. (전체를 다시 받아야 함)
+    """
+    entries = load_log(history_dir)
+    latest = entries[-1]["version"] if entries else 0
+    if since == latest:
+        return []
+    if since > latest or not entries or since < entries[0]["version"] - 1:
+        return None
+    return [entry for entry in entries if entry["version"] > since]
@@ -0,0 +1,179 @@
+# menu_compact.py
+#
+# 앱(네이티브 클라이언트)용 압축 표현.
+#   - fields 투영: 메뉴 항목에서 필요한 키만 남깁니다. (예: fields=name 이면 name만)
+#     식사(meal)와 코너(corner)는 메뉴 단위 정보라 항상 남습니다.
+#   - MessagePack 인코딩: 키 이름을 반복하지 않는 위치 기반 배열과, 여러 번 나오는 식당/식사/코너 이름을
+#     한 번만 싣는 문자열 표(strings)를 씁니다. 구조는 다음과 같습니다.
+#
+#       {"v": 1, "date": "2025-10-16", "generated_at": "...",
+#        "strings": ["students", "학생식당", "학생회관", "2층", "중식", "뚝배기코너", ...],
+#        "item_fields": ["name", "name_en", "rating"],
+#        "places": [[키, 이름, 건물, 위치, [[식사, 코너, [[name, name_en, rating], ...]], ...]], ...]}
+#
+#     키/이름/건물/위치/식사/코너는 strings의 인덱스(정수)이고, 항목 배열은 item_fields 순서를 따릅니다.
+#
+# msgpack 패키지가 있으면 그것으로 인코딩하고, 없으면 이 모듈의 작은 인코더를 씁니다. (결과는 같은 형식)
+
+import struct
+
+try:
+    import msgpack
+except ImportError:  # msgpack이 없으면 내장 인코더를 씁니다.
+    msgpack = None
+
+MEDIA_TYPE = "application/msgpack"
+ACCEPTED_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+FORMAT_VERSION = 1
+
+ITEM_FIELDS = ("name", "name_en", "rating", "dish_id", "component_ids")
+
+
+def parse_fields(value: str | None) -> tuple | None:
+    """fields 쿼리 값을 항목 키 튜플로 바꿉니다. 비어 있으면 None(전체)입니다. 모르는 키는 ValueError입니다."""
+    if not value:
+        return None
+    fields = tuple(dict.fromkeys(f.strip() for f in value.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in ITEM_FIELDS]
+    if unknown:
+        raise ValueError(f"fields는 {', '.join(ITEM_FIELDS)} 중에서 골라야 합니다: {', '.join(unknown)}")
+    return fields or None
+
+
+def wants_msgpack(accept: str | None) -> bool:
+    """Accept 헤더가 MessagePack을 요청하는지 확인합니다."""
+    if not accept:
+        return False
+    return any(part.split(";")[0].strip() in ACCEPTED_MEDIA_TYPES for part in accept.split(","))
+
+
+def project(snapshot: dict, fields: tuple | None) -> dict:
+    """메뉴 항목에서 fields 키만 남긴 사본을 반환합니다. fields가 None이면 그대로 반환합니다."""
+    if not fields:
+        return snapshot
+    return {
+        **snapshot,
+        "places": {
+            key: {
+                **place,
+                "menus": [
+                    {**menu, "items": [{f: item[f] for f in fields if f in item} for item in menu.get("items", [])]}
+                    for menu in place.get("menus", [])
+                ],
+            }
+            for key, place in snapshot.get("places", {}).items()
+        },
+    }
+
+
+def compact(snapshot: dict, fields: tuple | None = None) -> dict:
+    """기록을 문자열 표와 위치 기반 배열로 바꿉니다. (위 구조 참고)"""
+    fields = fields or ITEM_FIELDS[:3]
+    strings = []
+    index = {}
+
+    def ref(value):
+        if value is None:
+            return None
+        i = index.get(value)
+        if i is None:
+            i = index[value] = len(strings)
+            strings.append(value)
+        return i
+
+    places = []
+    for key, place in snapshot.get("places", {}).items():
+        menus = [
+            [ref(menu.get("meal")), ref(menu.get("corner")),
+             [[item.get(f) for f in fields] for item in menu.get("items", [])]]
+            for menu in place.get("menus", [])
+        ]
+        places.append([ref(key), ref(place.get("name")), ref(place.get("building")),
+                       ref(place.get("location_detail")), menus])
+
+    return {
+        "v": FORMAT_VERSION,
+        "date": snapshot.get("date"),
+        "generated_at": snapshot.get("generated_at"),
+        "strings": strings,
+        "item_fields": list(fields),
+        "places": places,
+    }
+
+
+# --- MessagePack 인코딩 ---
+
+def _pack(obj, out: bytearray):
+    if obj is None:
+        out.append(0xC0)
+    elif obj is True:
+        out.append(0xC3)
+    elif obj is False:
+        out.append(0xC2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -32 <= obj < 0:
+            out += struct.pack(">b", obj)
+        elif 0 <= obj <= 0xFF:
+            out += struct.pack(">BB", 0xCC, obj)
+        elif 0 <= obj <= 0xFFFF:
+            out += struct.pack(">BH", 0xCD, obj)
+        elif 0 <= obj <= 0xFFFFFFFF:
+            out += struct.pack(">BI", 0xCE, obj)
+        elif obj > 0:
+            out += struct.pack(">BQ", 0xCF, obj)
+        elif obj >= -0x80:
+            out += struct.pack(">Bb", 0xD0, obj)
+        elif obj >= -0x8000:
+            out += struct.pack(">Bh", 0xD1, obj)
+        elif obj >= -0x80000000:
+            out += struct.pack(">Bi", 0xD2, obj)
+        else:
+            out += struct.pack(">Bq", 0xD3, obj)
+    elif isinstance(obj, float):
+        # rating 같은 값은 단정도로 충분합니다. (msgpack의 use_single_float=True와 같음)
+        out += struct.pack(">Bf", 0xCA, obj)
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        n = len(data)
+        if n < 32:
+            out.append(0xA0 | n)
+        elif n <= 0xFF:
+            out += struct.pack(">BB", 0xD9, n)
+        elif n <= 0xFFFF:
+            out += struct.pack(">BH", 0xDA, n)
+        else:
+            out += struct.pack(">BI", 0xDB, n)
+        out += data
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n < 16:
+            out.append(0x90 | n)
+        elif n <= 0xFFFF:
+            out += struct.pack(">BH", 0xDC, n)
+        else:
+            out += struct.pack(">BI", 0xDD, n)
+        for value in obj:
+            _pack(value, out)
+    elif isinstance(obj, dict):
+        n = len(obj)
+        if n < 16:
+            out.append(0x80 | n)
+        elif n <= 0xFFFF:
+            out += struct.pack(">BH", 0xDE, n)
+        else:
+            out += struct.pack(">BI", 0xDF, n)
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    else:
+        raise TypeError(f"MessagePack으로 인코딩할 수 없는 값입니다: {type(obj).__name__}")
+
+
+def packb(obj) -> bytes:
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True, use_single_float=True)
+    out = bytearray()
+    _pack(obj, out)
+    return bytes(out)
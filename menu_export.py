@@ -0,0 +1,117 @@
+# menu_export.py
+#
+# 메뉴 기록 내보내기.
+# history/의 날짜별 기록을 메뉴 항목 하나당 한 줄(NDJSON) 또는 한 행(CSV)으로 펼쳐 내보냅니다.
+# 하루치 기록만 메모리에 올리며 바로 흘려보내므로 기간이 길어도 메모리 사용량이 일정합니다.
+#
+# 사용 예:
+#   python menu_export.py --from 2025-09-01 --to 2025-12-31 > menus.ndjson
+#   python menu_export.py --format csv --out menus.csv
+
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Iterator
+
+import menu_store
+
+FIELDS = ("date", "place", "building", "meal", "corner", "name", "name_en", "rating", "dish_id")
+FORMATS = ("ndjson", "csv")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def flatten_snapshot(snapshot: dict, places: set | None = None, meals: set | None = None) -> Iterator[dict]:
+    """하루치 기록을 메뉴 항목 단위의 평평한 레코드로 펼칩니다."""
+    day = snapshot.get("date")
+    for key, place in snapshot.get("places", {}).items():
+        if places and key not in places:
+            continue
+        building = place.get("building")
+        for menu in place.get("menus", []):
+            if meals and menu.get("meal") not in meals:
+                continue
+            for item in menu.get("items", []):
+                yield {
+                    "date": day,
+                    "place": key,
+                    "building": building,
+                    "meal": menu.get("meal"),
+                    "corner": menu.get("corner"),
+                    "name": item.get("name"),
+                    "name_en": item.get("name_en"),
+                    "rating": item.get("rating"),
+                    "dish_id": item.get("dish_id"),
+                }
+
+
+def iter_records(start: date | None = None, end: date | None = None, places: set | None = None,
+                 meals: set | None = None, history_dir: Path | None = None) -> Iterator[dict]:
+    """기간 내 모든 기록을 레코드 단위로 돌려줍니다. 스냅샷 캐시에는 쌓지 않습니다."""
+    for snapshot in menu_store.iter_snapshots(start, end, history_dir, use_cache=False):
+        yield from flatten_snapshot(snapshot, places, meals)
+
+
+def iter_chunks(fmt: str, start: date | None = None, end: date | None = None, places: set | None = None,
+                meals: set | None = None, history_dir: Path | None = None) -> Iterator[str]:
+    """
+    레코드를 fmt 형식의 텍스트 조각으로 인코딩해 돌려줍니다.
+    하루치 기록을 한 조각으로 묶어 너무 잘게 쪼개지지 않게 합니다.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} (가능한 값: {', '.join(FORMATS)})")
+
+    buf = io.StringIO()
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(buf, fieldnames=FIELDS, lineterminator="\n")
+        writer.writeheader()
+
+    for snapshot in menu_store.iter_snapshots(start, end, history_dir, use_cache=False):
+        for record in flatten_snapshot(snapshot, places, meals):
+            if writer:
+                writer.writerow(record)
+            else:
+                buf.write(json.dumps(record, ensure_ascii=False))
+                buf.write("\n")
+        if buf.tell():
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+
+    # 기록이 하나도 없을 때도 CSV 헤더는 내보냅니다.
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="메뉴 기록을 NDJSON/CSV로 내보냅니다.")
+    arg_parser.add_argument("--from", dest="start", type=date.fromisoformat, default=None, help="시작 날짜 (YYYY-MM-DD)")
+    arg_parser.add_argument("--to", dest="end", type=date.fromisoformat, default=None, help="끝 날짜 (YYYY-MM-DD)")
+    arg_parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    arg_parser.add_argument("--places", default=None, help="쉼표로 구분한 식당 키 (예: students,dodam)")
+    arg_parser.add_argument("--meal", default=None, help="쉼표로 구분한 식사 (조식/중식/석식)")
+    arg_parser.add_argument("--out", type=Path, default=None, help="출력 파일 (기본: 표준 출력)")
+    args = arg_parser.parse_args()
+
+    places = {p.strip() for p in args.places.split(",") if p.strip()} if args.places else None
+    meals = {m.strip() for m in args.meal.split(",") if m.strip()} if args.meal else None
+
+    out = open(args.out, "w", encoding="utf-8", newline="") if args.out else sys.stdout
+    try:
+        for chunk in iter_chunks(args.format, args.start, args.end, places, meals):
+            out.write(chunk)
+    finally:
+        if args.out:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# menu_json.py
+#
+# JSON 직렬화 계층.
+# 설치된 라이브러리 중 가장 빠른 것을 골라 씁니다: orjson > msgspec > 표준 json
+#   - dumps()는 항상 UTF-8 bytes를 반환합니다. (한글을 \uXXXX로 바꾸지 않음)
+#   - 메뉴 기록(menus.json, history/*.json)은 위 순서대로 고른 라이브러리로 빠짐없이 디코딩하고,
+#     msgspec이 있으면 places/menus/items 구조를 스키마로 검증합니다. 구조가 깨진 파일은 읽을 때 바로 ValueError가 납니다.
+#     스키마에 없는 키(version, dish_id 같은 나중에 붙은 값)도 그대로 남습니다. 스키마로 디코딩한 결과(타입이 정해진 보기)는
+#     모르는 키를 버리므로 통째로 다시 저장할 기록에는 쓰지 않습니다.
+# 세 경우 모두 결과는 평범한 dict/list라 나머지 코드는 어떤 라이브러리를 쓰는지 몰라도 됩니다.
+#
+# 더 빠르게 쓰려면: pip install orjson (또는 msgspec)
+
+import json
+from pathlib import Path
+from typing import TypedDict
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 msgspec이나 표준 json을 씁니다.
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec이 없으면 스키마 검증 없이 디코딩합니다.
+    msgspec = None
+
+BACKEND = "orjson" if orjson else "msgspec" if msgspec else "json"
+
+
+# --- 메뉴 기록 스키마 (msgspec 검증용) ---
+
+class Item(TypedDict, total=False):
+    name: str
+    name_en: str | None
+    rating: float | None
+    dish_id: int | None
+    component_ids: list[int | None]
+
+
+class Menu(TypedDict, total=False):
+    meal: str
+    corner: str
+    items: list[Item]
+
+
+class Place(TypedDict, total=False):
+    name: str
+    building: str
+    location_detail: str
+    menus: list[Menu]
+
+
+class Snapshot(TypedDict, total=False):
+    generated_at: str | None
+    date: str
+    version: int
+    places: dict[str, Place]
+
+
+if msgspec is not None:
+    _decoder = msgspec.json.Decoder()
+    _encoder = msgspec.json.Encoder()
+
+
+def dumps(obj, pretty: bool = False) -> bytes:
+    """obj를 UTF-8 JSON bytes로 인코딩합니다. pretty가 True면 2칸 들여쓰기를 합니다."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if msgspec is not None:
+        encoded = _encoder.encode(obj)
+        return msgspec.json.format(encoded, indent=2) if pretty else encoded
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | str):
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        return _decoder.decode(data)
+    return json.loads(data)
+
+
+def loads_snapshot(data: bytes | str) -> dict:
+    """
+    메뉴 기록 하나를 모든 키를 남긴 채 디코딩합니다. msgspec이 있으면 스키마로 검증합니다.
+    (검증만 하고 결과는 디코딩한 dict 그대로 돌려주므로 스키마에 없는 키도 버려지지 않습니다)
+    """
+    snapshot = loads(data)
+    if msgspec is not None:
+        try:
+            msgspec.convert(snapshot, Snapshot)
+        except msgspec.ValidationError as e:
+            raise ValueError(f"메뉴 기록 형식이 올바르지 않습니다: {e}") from e
+    return snapshot
+
+
+def dump(obj, path: Path, pretty: bool = False):
+    with open(path, "wb") as f:
+        f.write(dumps(obj, pretty))
+
+
+def load(path: Path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def load_snapshot(path: Path) -> dict:
+    with open(path, "rb") as f:
+        return loads_snapshot(f.read())
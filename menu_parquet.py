@@ -0,0 +1,180 @@
+# menu_parquet.py
+#
+# 분석용 Parquet 스냅샷.
+# 스크랩 결과를 메뉴 항목 단위의 열 형식 테이블로 펼쳐 월별로 나눈 Parquet 데이터셋에 추가합니다.
+#   analytics/menus/month=2025-10/2025-10-16.parquet
+# 식당/코너/식사처럼 값 종류가 적은 열은 dictionary 인코딩으로 저장되어,
+# 1년치 집계도 JSON 수백 개를 다시 파싱하지 않고 바로 계산할 수 있습니다.
+#
+# pyarrow가 설치되어 있어야 합니다. (pip install pyarrow)
+#
+# 사용 예:
+#   python menu_parquet.py backfill                       # history/ 전체를 데이터셋으로 변환
+#   python menu_parquet.py top-dishes --place students     # 자주 나온 메뉴
+#   python menu_parquet.py ratings --from 2025-09-01       # 코너별 rating 통계
+
+import argparse
+import os
+from datetime import date
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow가 없으면 Parquet 저장은 건너뜁니다.
+    pa = None
+
+import menu_export
+import menu_store
+
+DATASET_DIR = Path(os.environ.get("SSU_DINING_PARQUET_DIR", Path(__file__).resolve().parent / "analytics" / "menus"))
+
+
+def available() -> bool:
+    return pa is not None
+
+
+def _schema():
+    dictionary = pa.dictionary(pa.int16(), pa.string())
+    return pa.schema([
+        ("date", pa.date32()),
+        ("place", dictionary),
+        ("building", dictionary),
+        ("meal", dictionary),
+        ("corner", dictionary),
+        ("name", pa.string()),
+        ("name_en", pa.string()),
+        ("rating", pa.float32()),
+        ("dish_id", pa.int32()),
+    ])
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("pyarrow가 설치되어 있지 않습니다. pip install pyarrow 후 다시 실행해주세요.")
+
+
+def snapshot_to_table(snapshot: dict):
+    """하루치 기록을 열 형식 테이블로 변환합니다."""
+    _require_pyarrow()
+    columns = {name: [] for name in menu_export.FIELDS}
+    for record in menu_export.flatten_snapshot(snapshot):
+        for name in menu_export.FIELDS:
+            columns[name].append(record[name])
+    columns["date"] = [date.fromisoformat(d) for d in columns["date"]]
+    return pa.table(columns, schema=_schema())
+
+
+def append_snapshot(snapshot: dict, dataset_dir: Path | None = None) -> Path:
+    """
+    하루치 기록을 해당 월 파티션에 저장합니다.
+    날짜마다 파일이 하나라서 같은 날을 다시 스크랩하면 그 파일만 교체됩니다.
+    """
+    table = snapshot_to_table(snapshot)
+    day = snapshot["date"]
+    partition = (dataset_dir or DATASET_DIR) / f"month={day[:7]}"
+    partition.mkdir(parents=True, exist_ok=True)
+
+    path = partition / f"{day}.parquet"
+    tmp_path = path.with_suffix(".parquet.tmp")
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return path
+
+
+def backfill(start: date | None = None, end: date | None = None, dataset_dir: Path | None = None) -> int:
+    """history/의 기록을 Parquet 데이터셋으로 다시 만듭니다. 변환한 날짜 수를 반환합니다."""
+    count = 0
+    for snapshot in menu_store.iter_snapshots(start, end, use_cache=False):
+        append_snapshot(snapshot, dataset_dir)
+        count += 1
+    return count
+
+
+# --- 조회 도우미 ---
+
+def load_table(start: date | None = None, end: date | None = None, places: set | None = None,
+               columns: list | None = None, dataset_dir: Path | None = None):
+    """
+    데이터셋에서 조건에 맞는 행만 읽어 테이블로 반환합니다.
+    월 파티션 이름으로 먼저 파일을 거르므로 기간이 짧으면 필요한 파일만 엽니다.
+    """
+    _require_pyarrow()
+    columns = columns or _schema().names
+    directory = dataset_dir or DATASET_DIR
+    if not directory.exists():
+        return _schema().empty_table().select(columns)
+
+    schema = _schema().append(pa.field("month", pa.string()))
+    dataset = ds.dataset(directory, format="parquet", partitioning="hive", schema=schema)
+
+    conditions = []
+    if start:
+        conditions.append(ds.field("month") >= start.strftime("%Y-%m"))
+        conditions.append(ds.field("date") >= pa.scalar(start, pa.date32()))
+    if end:
+        conditions.append(ds.field("month") <= end.strftime("%Y-%m"))
+        conditions.append(ds.field("date") <= pa.scalar(end, pa.date32()))
+    if places:
+        conditions.append(ds.field("place").isin(sorted(places)))
+
+    expr = None
+    for cond in conditions:
+        expr = cond if expr is None else expr & cond
+    return dataset.to_table(columns=columns, filter=expr)
+
+
+def top_dishes(limit: int = 20, **filters) -> list[dict]:
+    """가장 자주 나온 메뉴 이름과 등장 횟수를 반환합니다."""
+    table = load_table(columns=["place", "name"], **filters)
+    counts = table.group_by(["place", "name"]).aggregate([("name", "count")])
+    counts = counts.sort_by([("name_count", "descending")]).slice(0, limit)
+    return counts.to_pylist()
+
+
+def rating_by_corner(**filters) -> list[dict]:
+    """식당/코너별 rating 개수, 평균, 최소, 최대를 반환합니다. rating이 없는 항목은 제외합니다."""
+    table = load_table(columns=["place", "corner", "rating"], **filters)
+    table = table.filter(pc.is_valid(table["rating"]))
+    stats = table.group_by(["place", "corner"]).aggregate([
+        ("rating", "count"), ("rating", "mean"), ("rating", "min"), ("rating", "max"),
+    ])
+    # dictionary 열은 Arrow에서 바로 정렬할 수 없어 결과(식당 x 코너 수만큼)만 파이썬에서 정렬합니다.
+    return sorted(stats.to_pylist(), key=lambda row: (row["place"], row["corner"]))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="메뉴 기록 Parquet 데이터셋 관리/조회")
+    sub = arg_parser.add_subparsers(dest="command", required=True)
+
+    for name in ("backfill", "top-dishes", "ratings"):
+        cmd = sub.add_parser(name)
+        cmd.add_argument("--from", dest="start", type=date.fromisoformat, default=None)
+        cmd.add_argument("--to", dest="end", type=date.fromisoformat, default=None)
+        if name != "backfill":
+            cmd.add_argument("--place", action="append", default=None, help="식당 키 (여러 번 지정 가능)")
+        if name == "top-dishes":
+            cmd.add_argument("--limit", type=int, default=20)
+
+    args = arg_parser.parse_args()
+    _require_pyarrow()
+
+    if args.command == "backfill":
+        count = backfill(args.start, args.end)
+        print(f"✅ {count}일치 기록을 {DATASET_DIR}에 저장했습니다.")
+        return
+
+    filters = {"start": args.start, "end": args.end, "places": set(args.place) if args.place else None}
+    if args.command == "top-dishes":
+        for row in top_dishes(args.limit, **filters):
+            print(f"{row['name_count']:>5}  [{row['place']}] {row['name']}")
+    else:
+        for row in rating_by_corner(**filters):
+            print(f"[{row['place']}] {row['corner']}: {row['rating_count']}개, 평균 {row['rating_mean']:.2f} "
+                  f"(최소 {row['rating_min']}, 최대 {row['rating_max']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+# menu_parsers.py
+#
+# 식당별 메뉴 파서.
+# 소스 플러그인(menu_sources.py)들이 함께 쓰도록 soongguri_playwright_complete.py에서 분리했습니다.
+#
+# soongguri.com 코너 텍스트는 표(grammar) 기반 토크나이저로 처리합니다.
+# 줄 종류별 판별 규칙(미리 컴파일한 정규식)을 형식마다 표로 정의해 두고,
+# 각 줄을 한 번만 분류한 뒤 종류별로 값을 모읍니다.
+# 학생식당/도담식당/푸드코트가 같은 토크나이저를 쓰고, 주간 식단 <pre> 텍스트도 같은 Grammar로 훑습니다.
+
+import functools
+import html
+import re
+
+# --- 줄 토크나이저 ---
+
+# 줄 종류
+CORNER = "corner"    # [코너명]
+STAR = "star"        # ★ 메뉴
+RATING = "rating"    # 메뉴들- 별점
+ENGLISH = "english"  # 영문 메뉴명
+NOTE = "note"        # *원산지, *알러지
+LABEL = "label"      # 주간 식단의 식당 이름
+TEXT = "text"        # 그 외 (사이드 메뉴 후보)
+
+_CORNER_RE = re.compile(r"^\[(.*)\]$")
+# 학생식당 ★ 줄: 줄 어딘가에 '-'가 있어야 하며, 첫 ★ 뒤(다음 ★ 전까지)가 "메뉴 - 별점"
+_STUDENTS_STAR_RE = re.compile(r"^(?=.*-)[^★]*★([^★]*)")
+# 도담식당 별점 줄: 숫자가 있고 마지막 '-' 뒤가 별점
+_DODAM_RATING_RE = re.compile(r"^(?=.*\d).*-(.*)$")
+# 도담식당 영문명 줄: (영문명)
+_DODAM_PAREN_RE = re.compile(r"^(?!\*)(?=.*\().*\)")
+# 영문 메뉴명 판별용: 글자가 아닌 문자(공백, 숫자, 기호)를 한 번에 지웁니다.
+_NON_ALPHA_RE = re.compile(r"[\W\d_]+")
+
+# 주간 식단(<pre>)의 메뉴 줄
+_WEEKLY_STAR_RE = re.compile(r"^★\s*(.+)$")
+
+_SIDE_EXCLUDE_WORDS = ('알러지', '원산지')
+
+# 기숙사 식단표 칸: <br> 줄 경계와 그 밖의 태그
+_DORM_BR_RE = re.compile(r'\s*<br\s*/?>\s*', re.I)
+_TAG_RE = re.compile(r'<[^>]*>')
+
+
+def _is_english(line: str):
+    """대문자로 시작하는 여러 단어이면서 글자 비율이 절반을 넘는 줄을 영문 메뉴명 후보로 봅니다."""
+    if len(line) > 5 and line[0].isupper() and ' ' in line:
+        # 후보이지만 비율이 낮으면 값 없이(None) 영문 줄로만 분류해 사이드 메뉴로 새지 않게 합니다.
+        return (line,) if len(_NON_ALPHA_RE.sub('', line)) / len(line) > 0.5 else (None,)
+    return None
+
+
+def _is_note(line: str):
+    return () if line[0] == '*' else None
+
+
+class Grammar:
+    """
+    형식별 줄 분류 표입니다. rules는 (종류, 판별 함수) 목록이며 위에서부터 처음 맞는 규칙으로 줄을 분류합니다.
+    판별 함수는 맞으면 값 튜플(정규식이면 Match)을, 아니면 None을 반환합니다.
+    원산지/알러지, 반찬처럼 매일 반복되는 줄이 많아 한 번 분류한 줄은 표에 기억해 두고 다시 쓰기 때문에,
+    기록 전체를 다시 파싱할 때는 대부분의 줄이 dict 조회 한 번으로 끝납니다.
+    """
+
+    MAX_CACHED_LINES = 50000
+
+    def __init__(self, rules: tuple):
+        self.rules = rules
+        self._cache = {}
+
+    def classify(self, line: str) -> tuple:
+        token = self._cache.get(line)
+        if token is not None:
+            return token
+
+        token = (TEXT, line)
+        for kind, test in self.rules:
+            m = test(line)
+            if m is not None:
+                if isinstance(m, re.Match):
+                    token = (kind, m[1] if m.re.groups else None)
+                else:
+                    token = (kind, m[0] if m else None)
+                break
+
+        if len(self._cache) >= self.MAX_CACHED_LINES:
+            self._cache.clear()
+        self._cache[line] = token
+        return token
+
+
+# 규칙 순서는 기존 파서의 if/elif 순서와 같습니다.
+STUDENTS_GRAMMAR = Grammar((
+    (CORNER, _CORNER_RE.match),
+    (STAR, _STUDENTS_STAR_RE.match),
+    (ENGLISH, _is_english),
+    (NOTE, _is_note),
+))
+
+DODAM_GRAMMAR = Grammar((
+    (CORNER, _CORNER_RE.match),
+    (STAR, lambda line: (line.replace('★', '').strip(),) if line[0] == '★' else None),
+    (RATING, _DODAM_RATING_RE.match),
+    (ENGLISH, lambda line: (line.strip('()'),) if _DODAM_PAREN_RE.match(line) else None),
+    (NOTE, _is_note),
+))
+
+
+@functools.lru_cache(maxsize=8)
+def weekly_grammar(labels: tuple) -> Grammar:
+    """
+    주간 식단 <pre> 텍스트용 Grammar를 식당 이름 목록마다 한 번 만듭니다.
+    식당 이름 줄은 (이름, 이름 뒤에 이어지는 텍스트)로 분류합니다.
+    """
+    label_re = re.compile("|".join(re.escape(label) for label in labels))
+
+    def is_label(line: str):
+        m = label_re.search(line)
+        return ((m[0], line[m.end():]),) if m else None
+
+    return Grammar((
+        (LABEL, is_label),
+        (STAR, _WEEKLY_STAR_RE.match),
+    ))
+
+
+def tokenize(text: str, grammar: Grammar) -> list:
+    """텍스트를 줄 단위로 한 번 훑어 (종류, 값) 토큰 목록을 반환합니다. TEXT 토큰의 값은 줄 자체입니다."""
+    classify = grammar.classify
+    return [classify(line) for line in map(str.strip, text.split('\n')) if line]
+
+
+def _to_float(value: str) -> float | None:
+    try:
+        return float(value.strip())
+    except ValueError:
+        return None
+
+
+# --- soongguri.com 파싱 함수 ---
+
+def parse_students_corner(text: str) -> dict:
+    """학생식당 형식 파싱: [코너명] ★ 메뉴 - 별점"""
+    corner_name = None
+    menu_name = None
+    menu_name_en = None
+    rating = None
+    side_items = []
+    current_meal = "중식"
+
+    for kind, value in tokenize(text, STUDENTS_GRAMMAR):
+        if kind == TEXT:
+            if len(value) < 30 and not menu_name_en and menu_name and corner_name:
+                side_items.append(value)
+        elif kind == STAR:
+            name_part, sep, rating_part = value.strip().rpartition('-')
+            if sep:
+                menu_name = name_part.strip()
+                rating = _to_float(rating_part)
+        elif kind == ENGLISH:
+            if value:
+                menu_name_en = value
+        elif kind == CORNER:
+            corner_name = value
+            if '천원의아침밥' in corner_name:
+                current_meal = "조식"
+
+    if corner_name and menu_name:
+        items = [{"name": menu_name, "name_en": menu_name_en, "rating": rating}]
+        for side in side_items:
+            items.append({"name": side})
+        return {"meal": current_meal, "corner": corner_name, "items": items}
+    return None
+
+def parse_dodam_corner(text: str) -> dict:
+    """도담식당 형식 파싱: [코너명] ★ 메뉴1 ★ 메뉴2 ... 메뉴들- 별점"""
+    corner_name = None
+    menu_names = []
+    menu_name_en = None
+    rating = None
+    side_items = []
+    current_meal = "중식"
+
+    for kind, value in tokenize(text, DODAM_GRAMMAR):
+        if kind == TEXT:
+            if len(value) < 30 and corner_name and menu_names and '-' not in value:
+                side_items.append(value)
+        elif kind == STAR:
+            if value:
+                menu_names.append(value)
+        elif kind == RATING:
+            value = _to_float(value)
+            if value is not None:
+                rating = value
+        elif kind == ENGLISH:
+            menu_name_en = value
+        elif kind == CORNER:
+            corner_name = value
+
+    if corner_name and menu_names:
+        main_menu_name = ' & '.join(menu_names)
+        items = [{"name": main_menu_name, "name_en": menu_name_en, "rating": rating}]
+        for side in side_items[:5]:
+            if side and not any(word in side for word in _SIDE_EXCLUDE_WORDS):
+                items.append({"name": side})
+        return {"meal": current_meal, "corner": corner_name, "items": items}
+    return None
+
+
+def parse_weekly_text(text: str, labels: list) -> dict:
+    """
+    주간 식단 페이지의 <pre> 텍스트를 한 번 훑어 식당 이름별 ★ 메뉴 목록을 반환합니다.
+    식당 이름이 처음 나온 곳부터 다른 식당 이름이 나오기 전까지를 그 식당의 메뉴로 봅니다.
+    ★ 줄은 줄 맨 앞에 있어야 하므로 다른 파서와 달리 줄 앞뒤 공백을 지우지 않고 분류합니다.
+    """
+    classify = weekly_grammar(tuple(labels)).classify
+    menus = {label: [] for label in labels}
+    seen = set()
+    current = None
+
+    for line in text.split('\n'):
+        if not line:
+            continue
+        kind, value = classify(line)
+        if kind == LABEL:
+            label, rest = value
+            if label != current:
+                # 이미 지나간 식당 이름이 다시 나오면 새 블록을 시작하지 않습니다.
+                current = None if label in seen else label
+                seen.add(label)
+            # 식당 이름 뒤에 이어지는 텍스트도 같은 블록의 첫 줄로 봅니다. (식당 이름은 다시 찾지 않음)
+            star = _WEEKLY_STAR_RE.match(rest)
+            kind, value = (STAR, star[1]) if star else (TEXT, rest)
+        if current is not None and kind == STAR:
+            menus[current].append(value.strip())
+
+    return menus
+
+
+# --- 기숙사 식당 파싱 함수 ---
+
+def parse_dorm_cell(meal: str, cell_html: str) -> dict:
+    """기숙사 식단표의 한 칸(<br>로 구분된 HTML)을 파싱합니다."""
+    # inner_html을 <br> 태그로 분리하고, 남은 태그(<span> 등)는 버리고 엔티티(&amp; 등)는 글자로 바꿉니다.
+    menu_items_raw = [
+        " ".join(html.unescape(_TAG_RE.sub('', item)).split())
+        for item in _DORM_BR_RE.split(cell_html.strip())
+    ]
+
+    # 비어있거나 특정 단어가 포함된 항목 제외
+    items = [
+        {"name": item}
+        for item in menu_items_raw
+        if item and "운영없음" not in item and "휴무" not in item
+    ]
+
+    if items:
+        return {
+            "meal": meal,
+            "corner": "오늘의 메뉴",  # 기숙사는 코너가 없음
+            "items": items
+        }
+    return None
@@ -0,0 +1,106 @@
+# menu_refresh.py
+#
+# 요청 시점 스크랩(/api/refresh)을 처리하는 서비스.
+# API 서버 프로세스 안의 브라우저 풀(browser_pool.py)로 지정한 식당만 바로 다시 스크랩해 저장합니다.
+#   - 같은 식당을 스크랩하는 중에 들어온 요청은 새로 스크랩하지 않고 진행 중인 작업의 결과를 같이 기다립니다. (single-flight)
+#   - 한 식당은 min_interval초에 한 번만 새로 스크랩하며, 그보다 잦은 요청은 RateLimited로 거절합니다.
+#     스크랩에 실패한 식당은 간격 제한에서 빼 바로 다시 시도할 수 있게 합니다.
+#   - 스크랩에 실패한 식당은 기존 메뉴를 빈 메뉴로 덮어쓰지 않도록 저장에서 뺍니다.
+
+import asyncio
+import time
+from pathlib import Path
+
+import browser_pool
+import menu_sources
+import resource_governor
+import soongguri_playwright_complete as scraper
+
+# 식당별 최소 재스크랩 간격(초)
+MIN_INTERVAL = 60.0
+
+
+class RateLimited(Exception):
+    """최근에 스크랩한 식당을 너무 빨리 다시 스크랩하려 할 때 발생합니다."""
+
+    def __init__(self, keys: list, retry_after: float):
+        super().__init__(f"너무 자주 요청했습니다: {', '.join(keys)} ({retry_after:.0f}초 뒤에 다시 시도해주세요)")
+        self.keys = keys
+        self.retry_after = retry_after
+
+
+class RefreshService:
+    """식당별 single-flight와 요청 간격 제한을 거쳐 스크랩하고 out_path에 저장합니다."""
+
+    def __init__(self, out_path: Path = scraper.OUT_PATH, min_interval: float = MIN_INTERVAL,
+                 pool: browser_pool.BrowserPool | None = None):
+        self.out_path = out_path
+        self.min_interval = min_interval
+        # API 서버와 같은 프로세스에서 돌기 때문에 저메모리 옵션으로 브라우저 하나, 컨텍스트 하나만 씁니다.
+        self.pool = pool or browser_pool.BrowserPool(max_contexts=1, launch_args=resource_governor.LOW_MEMORY_ARGS)
+        # 식당 키 -> 그 식당을 스크랩 중인 작업
+        self._inflight = {}
+        # 식당 키 -> 마지막으로 스크랩을 시작한 시각 (time.monotonic). 실패한 스크랩은 지웁니다.
+        self._last_started = {}
+        # 저장(파일 쓰기)은 한 번에 하나씩 해야 식당별 결과가 서로 덮어쓰지 않습니다.
+        self._save_lock = asyncio.Lock()
+
+    async def refresh(self, keys: list | None = None, force: bool = False) -> dict:
+        """
+        keys 식당(없으면 전체)을 스크랩해 저장하고, 끝나면 식당별 처리 결과를 반환합니다.
+        force가 True면 휴무 달력(관측된 휴무 포함)과 상관없이 페이지를 열어 봅니다.
+        등록되지 않은 식당이 있으면 KeyError, 간격 제한에 걸리면 RateLimited가 발생합니다.
+        """
+        keys = [source.key for source in menu_sources.get_sources(keys)]
+        joined = [k for k in keys if k in self._inflight]
+        new = [k for k in keys if k not in self._inflight]
+
+        now = time.monotonic()
+        waits = {k: self.min_interval - (now - self._last_started[k])
+                 for k in new if k in self._last_started and now - self._last_started[k] < self.min_interval}
+        if waits:
+            raise RateLimited(sorted(waits), max(waits.values()))
+
+        if new:
+            task = asyncio.create_task(self._scrape(new, force))
+            for k in new:
+                self._inflight[k] = task
+                self._last_started[k] = now
+            task.add_done_callback(lambda done, ks=tuple(new): self._finish(done, ks))
+
+        outcomes = await asyncio.gather(*{self._inflight[k] for k in keys})
+        failed = sorted({k for outcome in outcomes for k in outcome["failed"]} & set(keys))
+        return {
+            "refreshed": [k for k in new if k not in failed],
+            "joined": [k for k in joined if k not in failed],
+            "failed": failed,
+        }
+
+    def _finish(self, task: asyncio.Task, keys: tuple):
+        if task.cancelled() or task.exception() is not None:
+            failed = keys
+        else:
+            failed = task.result()["failed"]
+        for k in keys:
+            if self._inflight.get(k) is task:
+                del self._inflight[k]
+        # 실패한 식당은 간격 제한 없이 바로 다시 요청할 수 있게 합니다.
+        for k in failed:
+            self._last_started.pop(k, None)
+
+    async def _scrape(self, keys: list, force: bool = False) -> dict:
+        result, captures = await scraper.scrape_places(places=keys, pool=self.pool, calendar=not force)
+        # 전체 에러로 캡처가 아예 없는 식당도 실패로 봅니다.
+        failed = [k for k in keys if k not in captures or captures[k].get("error")]
+        for k in failed:
+            result["places"].pop(k, None)
+            captures.pop(k, None)
+
+        if result["places"]:
+            async with self._save_lock:
+                # 파일 쓰기와 사이트 빌드는 이벤트 루프를 막지 않도록 스레드에서 합니다.
+                await asyncio.to_thread(scraper.save_result, result, captures, self.out_path, True)
+        return {"failed": failed}
+
+    async def close(self):
+        await self.pool.close()
@@ -0,0 +1,130 @@
+# menu_reparse.py
+#
+# 보관된 원본 캡처(history/raw/)를 현재 파서로 다시 파싱해 날짜별 기록을 새로 만듭니다.
+# 파서 버그를 고친 뒤 과거 기록까지 바로잡을 때 사용합니다.
+# 날짜 단위로 프로세스 풀에 나눠 파싱하고, 끝나는 날짜부터 바로 저장소에 씁니다.
+# 변경 기록의 기준 스냅샷(history/latest.json)과 같은 날짜의 결과는 menu_changes.publish()로 변경 기록에도 올려
+# /api/changes를 따라가는 클라이언트가 고친 메뉴를 받게 합니다. 스크래퍼가 쓰는 menus.json은 다시 쓰지 않으므로
+# 다음 스크랩 전까지 /api/today는 예전 결과(와 그 버전)를 돌려주고, 그 버전 뒤의 패치로 고친 메뉴를 받습니다.
+#
+# 사용 예:
+#   python menu_reparse.py                          # 보관된 원본 전체
+#   python menu_reparse.py --from 2025-09-01 --workers 8
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+
+import dish_index
+import menu_changes
+import menu_parquet
+import menu_sources
+import menu_store
+
+
+def reparse_day(day: str, paths: list) -> tuple[dict, int]:
+    """
+    하루치 원본 캡처들을 다시 파싱해 (기록 dict, 파싱한 원본 조각 수)를 반환합니다.
+    같은 날 여러 번 실행했다면 식당별로 가장 마지막 실행의 원본을 씁니다.
+    """
+    captures = {}
+    generated_at = None
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            run = json.load(f)
+        generated_at = run.get("generated_at", generated_at)
+        captures.update(run.get("sources", {}))
+
+    result = {"generated_at": generated_at, "date": day, "places": {}}
+    raw_count = 0
+    # 등록 순서대로 만들어 스크래퍼 결과와 식당 순서를 맞춥니다. 없어진 소스의 원본은 건너뜁니다.
+    for source in menu_sources.get_sources():
+        capture = captures.get(source.key)
+        if capture is None:
+            continue
+        if capture.get("closed"):
+            result["places"][source.key] = source.place_info()
+            continue
+        raw_items = capture.get("raw", [])
+        raw_count += len(raw_items)
+        result["places"][source.key] = source.build(raw_items)
+    return result, raw_count
+
+
+def _reparse_worker(args: tuple) -> tuple[dict, int]:
+    day, paths = args
+    return reparse_day(day, [Path(p) for p in paths])
+
+
+def reparse(start: date | None = None, end: date | None = None, workers: int | None = None,
+            parquet: bool = True, publish: bool = True) -> dict:
+    """
+    기간 내 원본 캡처를 모두 다시 파싱해 저장하고 처리 통계를 반환합니다.
+    publish가 켜져 있으면 기준 스냅샷과 같은 날짜의 결과를 변경 기록에도 올립니다.
+    """
+    runs = menu_store.raw_capture_runs(start, end)
+    total = len(runs)
+    if not total:
+        print("다시 파싱할 원본 캡처가 없습니다.")
+        return {"days": 0, "corners": 0, "seconds": 0.0}
+
+    workers = workers or os.cpu_count() or 1
+    write_parquet = parquet and menu_parquet.available()
+    base = menu_changes.load_base() if publish else None
+    base_day = base.get("date") if base else None
+    print(f"원본 {total}일치를 프로세스 {workers}개로 다시 파싱합니다...")
+
+    # 메뉴 ID는 사전 파일을 함께 고쳐야 하므로 작업 프로세스가 아닌 이 프로세스에서 붙입니다.
+    # 다시 파싱하는 동안은 사전을 잠가 두므로 그 사이 스크래퍼는 저장 단계에서 기다립니다.
+    started = time.perf_counter()
+    done = 0
+    corners = 0
+    report_every = max(1, total // 20)
+
+    with dish_index.open_index() as index, ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_reparse_worker, (day, [str(p) for p in paths])) for day, paths in runs]
+        for future in as_completed(futures):
+            result, raw_count = future.result()
+            index.annotate(result)
+            # 끝난 날짜부터 바로 저장해 중간에 멈춰도 그때까지의 결과는 남습니다.
+            menu_store.save_snapshot(result)
+            if write_parquet:
+                menu_parquet.append_snapshot(result)
+            if result["date"] == base_day:
+                entry = menu_changes.publish(result)
+                if entry:
+                    print(f"  📝 {base_day} 결과가 바뀌어 변경 기록에 올렸습니다. (v{entry['version']})")
+
+            done += 1
+            corners += raw_count
+            if done % report_every == 0 or done == total:
+                index.save()
+                elapsed = time.perf_counter() - started
+                print(f"  [{done}/{total}] {done / elapsed:,.1f}일/초, {corners / elapsed:,.0f}코너/초")
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {done}일, 원본 {corners}개를 {elapsed:.2f}초 만에 다시 파싱했습니다.")
+    return {"days": done, "corners": corners, "seconds": round(elapsed, 3)}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="보관된 원본 캡처를 현재 파서로 다시 파싱합니다.",
+        epilog="날짜별 기록(history/)과 Parquet을 다시 쓰고, 변경 기록의 기준 스냅샷과 같은 날짜의 결과는 "
+               "변경 기록(latest.json, changes.ndjson)에도 올립니다. menus.json은 다시 쓰지 않으므로 "
+               "다음 스크랩 때 바뀝니다.")
+    arg_parser.add_argument("--from", dest="start", type=date.fromisoformat, default=None)
+    arg_parser.add_argument("--to", dest="end", type=date.fromisoformat, default=None)
+    arg_parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    arg_parser.add_argument("--no-parquet", action="store_true", help="Parquet 데이터셋은 갱신하지 않음")
+    arg_parser.add_argument("--no-publish", action="store_true", help="변경 기록(latest.json, changes.ndjson)은 건드리지 않음")
+    args = arg_parser.parse_args()
+    reparse(args.start, args.end, args.workers, parquet=not args.no_parquet, publish=not args.no_publish)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+# menu_sources.py
+#
+# 식당별 소스 플러그인과 레지스트리.
+# 식당 하나가 플러그인 하나이며, 각 플러그인은 다음 단계를 구현합니다.
+#   fetch      : 페이지를 열고 해당 식당 메뉴가 보이도록 이동
+#   is_closed  : 페이지를 보고 오늘 휴무인지 판단
+#   extract    : 파싱할 원본 조각(코너 텍스트, 표 칸 HTML 등)을 추출
+#   parse      : 원본 조각 하나를 {"meal", "corner", "items"} 메뉴로 변환
+# 새 식당이나 대체 소스를 추가할 때는 MenuSource를 상속해 @register만 붙이면 되고,
+# run_sources()가 등록된 소스들을 각자의 페이지에서 동시에 실행합니다.
+#
+# 브라우저 없이 HTTP 요청만으로 원본을 가져올 수 있는 소스는 direct = True로 두고 fetch_direct를 구현합니다.
+# run_direct()가 이런 소스를 먼저 실행하고, 실패한 소스만 브라우저(run_sources)로 다시 시도합니다.
+
+import asyncio
+from datetime import datetime
+
+from playwright.async_api import BrowserContext, Page
+
+import dorm_board
+from menu_parsers import parse_dodam_corner, parse_dorm_cell, parse_students_corner
+
+SOONGGURI_URL = "https://soongguri.com/m/"
+DORM_URL = dorm_board.DORM_URL
+
+# 키 -> 소스 인스턴스. 등록 순서가 결과 JSON의 식당 순서가 됩니다.
+_REGISTRY = {}
+
+
+def register(cls):
+    """소스 플러그인 클래스를 레지스트리에 등록하는 데코레이터입니다."""
+    source = cls()
+    if source.key in _REGISTRY:
+        raise ValueError(f"이미 등록된 소스 키입니다: {source.key}")
+    _REGISTRY[source.key] = source
+    return cls
+
+
+def get_sources(keys=None) -> list:
+    """등록된 소스를 반환합니다. keys를 주면 그 식당들만 등록 순서대로 반환합니다."""
+    if keys is None:
+        return list(_REGISTRY.values())
+    unknown = set(keys) - set(_REGISTRY)
+    if unknown:
+        raise KeyError(f"등록되지 않은 소스입니다: {', '.join(sorted(unknown))}")
+    return [s for k, s in _REGISTRY.items() if k in keys]
+
+
+async def settle(page: Page, ms: int, fast: bool = False):
+    """
+    페이지가 갱신되길 기다립니다.
+    replay 모드(fast=True)에서는 응답이 즉시 오므로 고정 대기 대신 네트워크가 잠잠해질 때까지만 기다립니다.
+    """
+    if fast:
+        await page.wait_for_timeout(min(ms, 300))
+        await page.wait_for_load_state("networkidle")
+    else:
+        await page.wait_for_timeout(ms)
+
+
+class MenuSource:
+    """식당 하나를 담당하는 소스 플러그인의 기본 클래스입니다."""
+
+    key = None
+    label = None
+    building = None
+    location_detail = None
+    # 브라우저 없이 fetch_direct로 원본을 가져올 수 있는지 여부
+    direct = False
+
+    def place_info(self) -> dict:
+        return {
+            "name": self.label, "building": self.building,
+            "location_detail": self.location_detail, "menus": []
+        }
+
+    async def fetch(self, page: Page, now: datetime, fast: bool):
+        raise NotImplementedError
+
+    async def is_closed(self, page: Page) -> bool | str:
+        """
+        페이지를 보고 오늘 휴무인지 판단합니다.
+        페이지에 명시적인 휴무 안내가 있으면 그 문구를, 휴무로 추정만 될 때는 True를 반환합니다.
+        안내 문구를 반환한 경우에만 휴무 달력에 기록돼 같은 날 다시 스크랩할 때 건너뜁니다.
+        """
+        return False
+
+    async def extract(self, page: Page, now: datetime) -> list:
+        raise NotImplementedError
+
+    def parse(self, raw) -> dict | None:
+        raise NotImplementedError
+
+    async def fetch_direct(self, now: datetime) -> list:
+        """브라우저 없이 원본 조각 목록을 가져옵니다. (direct = True인 소스만 구현) extract와 같은 형식을 반환합니다."""
+        raise NotImplementedError
+
+    def build(self, raw_items: list, verbose: bool = False) -> dict:
+        """추출한 원본 조각들을 파싱해 식당 데이터를 만듭니다. 저장된 원본을 다시 파싱할 때도 씁니다."""
+        place_data = self.place_info()
+        for idx, raw in enumerate(raw_items):
+            menu_info = self.parse(raw)
+            if menu_info:
+                place_data["menus"].append(menu_info)
+                if verbose:
+                    print(f"  ✓ [{self.label} {idx+1}] {menu_info['corner']}: {menu_info['items'][0]['name']}")
+            elif verbose:
+                print(f"  ⚠️  [{self.label} {idx+1}] 파싱 실패")
+        return place_data
+
+    async def scrape(self, page: Page, now: datetime, fast: bool = False) -> tuple[dict, dict]:
+        """
+        fetch → is_closed → extract → parse 순서로 실행해 (식당 데이터, 원본 캡처)를 반환합니다.
+        원본 캡처({"closed", "raw"})는 나중에 고친 파서로 다시 파싱할 수 있도록 보관합니다.
+        """
+        print(f"\n{self.label} 크롤링 중...")
+
+        await self.fetch(page, now, fast)
+        closed = await self.is_closed(page)
+        if closed:
+            print(f"  ⚠️  [{self.label}] 오늘은 휴무입니다.")
+            capture = {"closed": True, "raw": []}
+            if isinstance(closed, str):
+                capture["notice"] = closed
+            return self.place_info(), capture
+
+        raw_items = await self.extract(page, now)
+        print(f"  [{self.label}] 발견된 메뉴 코너 수: {len(raw_items)}")
+        place_data = self.build(raw_items, verbose=True)
+        print(f"  ✅ [{self.label}] 총 {len(place_data['menus'])}개 메뉴 수집 완료")
+        return place_data, {"closed": False, "raw": raw_items}
+
+    async def scrape_direct(self, now: datetime) -> tuple[dict, dict]:
+        """fetch_direct → parse 순서로 실행해 (식당 데이터, 원본 캡처)를 반환합니다. 원본 캡처 형식은 scrape()와 같습니다."""
+        print(f"\n{self.label} 직접 요청 중...")
+        raw_items = await self.fetch_direct(now)
+        print(f"  [{self.label}] 발견된 메뉴 코너 수: {len(raw_items)}")
+        place_data = self.build(raw_items, verbose=True)
+        print(f"  ✅ [{self.label}] 총 {len(place_data['menus'])}개 메뉴 수집 완료 (브라우저 없이)")
+        return place_data, {"closed": False, "raw": raw_items}
+
+
+# --- soongguri.com 소스 ---
+
+class SoongguriSource(MenuSource):
+    """soongguri.com 모바일 페이지의 식당 선택 상자로 메뉴를 읽는 소스입니다."""
+
+    async def fetch(self, page: Page, now: datetime, fast: bool):
+        await page.goto(SOONGGURI_URL, wait_until="networkidle", timeout=30000)
+        await settle(page, 3000, fast)
+        await page.select_option('select[name="rest"]', label=self.label)
+        await settle(page, 2000, fast)
+
+    async def extract(self, page: Page, now: datetime) -> list:
+        try:
+            await page.wait_for_selector("td.menu_list", state="visible", timeout=5000)
+        except Exception:
+            print(f"  ⚠️  [{self.label}] 메뉴를 찾을 수 없습니다.")
+            return []
+        return [await cell.inner_text() for cell in await page.locator("td.menu_list").all()]
+
+
+@register
+class StudentsSource(SoongguriSource):
+    key = "students"
+    label = "학생식당"
+    building = "학생회관"
+    location_detail = "2층"
+
+    def parse(self, raw: str) -> dict | None:
+        return parse_students_corner(raw)
+
+
+@register
+class DodamSource(SoongguriSource):
+    key = "dodam"
+    label = "숭실도담식당"
+    building = "숭실도담"
+    location_detail = "생활관 1층"
+
+    def parse(self, raw: str) -> dict | None:
+        return parse_dodam_corner(raw)
+
+
+@register
+class FoodcourtSource(SoongguriSource):
+    key = "foodcourt"
+    label = "푸드코트"
+    building = "신양관"
+    location_detail = "1층"
+
+    # 식당 선택 결과 대신 나오는 휴무 안내 문구
+    CLOSED_NOTICES = ("오늘은 쉽니다",)
+
+    async def is_closed(self, page: Page) -> bool | str:
+        body_text = await page.locator("body").inner_text()
+        for notice in self.CLOSED_NOTICES:
+            if notice in body_text:
+                return notice
+        # 본문 어딘가의 "휴무"는 공지나 다른 식당 안내일 수도 있어 이번 결과에만 쓰고 기록하지 않습니다.
+        return "휴무" in body_text
+
+    def parse(self, raw: str) -> dict | None:
+        return parse_dodam_corner(raw)
+
+
+# --- 기숙사 식당 소스 ---
+
+@register
+class DormSource(MenuSource):
+    """기숙사 게시판의 주간 식단표에서 오늘 요일 열을 읽는 소스입니다."""
+
+    key = "dorm"
+    label = "기숙사 식당"
+    building = "레지던스 홀"
+    location_detail = "B1층"
+
+    MEALS = dorm_board.MEALS
+    # 식단표가 정적 HTML이라 기본으로 HTTP 요청 한 번으로 읽고, 실패하면 브라우저로 읽습니다.
+    direct = True
+
+    async def fetch_direct(self, now: datetime) -> list:
+        text = await asyncio.to_thread(dorm_board.fetch_board, DORM_URL)
+        return dorm_board.cells_for(dorm_board.parse_week(text), now.weekday())
+
+    async def fetch(self, page: Page, now: datetime, fast: bool):
+        await page.goto(DORM_URL, wait_until="networkidle", timeout=30000)
+        await settle(page, 2000, fast)
+
+    async def extract(self, page: Page, now: datetime) -> list:
+        # CSS nth-child는 1부터 시작. 첫 열이 '구분'이므로 요일(월요일=0)에 +2
+        today_col_index = now.weekday() + 2
+        cells = []
+        for row in await page.locator(".ht_area tbody tr").all():
+            meal_name = (await row.locator("td").first.inner_text()).strip()
+            if meal_name in self.MEALS:
+                cell_html = await row.locator(f"td:nth-child({today_col_index})").inner_html()
+                cells.append([meal_name, cell_html])
+        return cells
+
+    def parse(self, raw: list) -> dict | None:
+        meal_name, cell_html = raw
+        return parse_dorm_cell(meal_name, cell_html)
+
+
+# --- 동시 실행 엔진 ---
+
+async def run_direct(sources: list, now: datetime) -> tuple[dict, dict, list]:
+    """
+    sources 중 브라우저 없이 읽을 수 있는 소스를 동시에 실행하고
+    ({키: 식당 데이터}, {키: 원본 캡처}, 브라우저로 실행해야 할 나머지 소스 목록)을 반환합니다.
+    직접 요청에 실패한 소스는 나머지 목록에 남겨 브라우저로 다시 시도하게 합니다.
+    휴무가 아닌데 메뉴가 하나도 없는 결과도 페이지 구조가 바뀌었을 수 있으므로 실패로 봅니다.
+    """
+    direct = [s for s in sources if s.direct]
+    results = await asyncio.gather(*(s.scrape_direct(now) for s in direct), return_exceptions=True)
+    places, captures = {}, {}
+    for source, outcome in zip(direct, results):
+        if isinstance(outcome, BaseException):
+            print(f"  ⚠️  [{source.label}] 직접 요청 실패, 브라우저로 다시 시도합니다: {outcome}")
+            continue
+        place_data, capture = outcome
+        if not place_data.get("menus") and not capture.get("closed"):
+            print(f"  ⚠️  [{source.label}] 직접 요청으로 메뉴를 찾지 못해 브라우저로 다시 시도합니다.")
+            continue
+        places[source.key], captures[source.key] = place_data, capture
+    return places, captures, [s for s in sources if s.key not in places]
+
+
+async def _run_one(context: BrowserContext, source: MenuSource, now: datetime, fast: bool,
+                   semaphore: asyncio.Semaphore) -> tuple[dict, dict]:
+    async with semaphore:
+        page = await context.new_page()
+        try:
+            return await source.scrape(page, now, fast)
+        except Exception as e:
+            # 한 식당이 실패해도 나머지 식당 결과는 그대로 저장합니다.
+            print(f"  ✗ [{source.label}] 크롤링 에러: {e}")
+            return source.place_info(), {"closed": False, "raw": [], "error": str(e)}
+        finally:
+            await page.close()
+
+
+async def run_sources(context: BrowserContext, sources: list, now: datetime, fast: bool = False,
+                      max_pages: int = 4) -> tuple[dict, dict]:
+    """
+    소스들을 각자의 페이지에서 동시에 실행하고
+    ({키: 식당 데이터}, {키: 원본 캡처})를 등록 순서대로 반환합니다.
+    max_pages로 동시에 열리는 페이지 수를 제한합니다.
+    """
+    semaphore = asyncio.Semaphore(max_pages)
+    results = await asyncio.gather(*(_run_one(context, s, now, fast, semaphore) for s in sources))
+    places = {source.key: place_data for source, (place_data, _) in zip(sources, results)}
+    captures = {source.key: capture for source, (_, capture) in zip(sources, results)}
+    return places, captures
@@ -0,0 +1,70 @@
+# menu_split.py
+#
+# 프론트엔드용 식당별 분할 파일.
+# menus.json 하나를 통째로 받지 않아도 되도록, 같은 내용을 다음 파일들로 나눠 씁니다.
+#   menus/index.json   : 날짜와 식당별 기본 정보, 메뉴 수, 내용 버전(해시)만 담은 작은 목차
+#   menus/<식당키>.json : 식당 하나의 전체 메뉴
+# index.html은 목차를 먼저 받아 카드 틀을 그린 뒤 식당 파일이 도착하는 대로 채우고,
+# 버전이 바뀐 식당만 다시 받아 그립니다.
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import menu_json
+
+SPLIT_DIR = Path(__file__).resolve().parent / "menus"
+
+# 목차에 싣는 식당 기본 정보
+INDEX_FIELDS = ("name", "building", "location_detail")
+
+
+def place_version(place: dict) -> str:
+    """식당 메뉴 내용의 버전입니다. 내용이 같으면 항상 같은 값이 나옵니다."""
+    encoded = json.dumps(place, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:12]
+
+
+def build_index(result: dict) -> dict:
+    """스크랩 결과(menus.json 구조)로 목차를 만듭니다. 식당 순서는 결과의 순서를 따릅니다."""
+    return {
+        "generated_at": result.get("generated_at"),
+        "date": result.get("date"),
+        "places": [
+            {
+                "key": key,
+                **{field: place.get(field) for field in INDEX_FIELDS},
+                "menu_count": len(place.get("menus", [])),
+                "version": place_version(place),
+            }
+            for key, place in result.get("places", {}).items()
+        ],
+    }
+
+
+def _write_json(path: Path, data):
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    menu_json.dump(data, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_split(result: dict, split_dir: Path = SPLIT_DIR) -> Path:
+    """
+    목차와 식당별 파일을 씁니다. 식당 파일을 먼저 쓰고 목차를 마지막에 바꿔,
+    목차가 가리키는 버전의 식당 파일이 항상 먼저 준비되어 있게 합니다.
+    목차에서 빠진 식당의 파일은 지웁니다.
+    """
+    split_dir.mkdir(parents=True, exist_ok=True)
+    index = build_index(result)
+    for key, place in result.get("places", {}).items():
+        _write_json(split_dir / f"{key}.json", place)
+
+    index_path = split_dir / "index.json"
+    _write_json(index_path, index)
+
+    keep = {f"{entry['key']}.json" for entry in index["places"]} | {"index.json"}
+    for path in split_dir.glob("*.json"):
+        if path.name not in keep:
+            path.unlink()
+    return index_path
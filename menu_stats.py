@@ -0,0 +1,249 @@
+# menu_stats.py
+#
+# 메뉴 통계.
+# 날짜별 기록을 메뉴 항목 단위의 NumPy 열 배열로 읽어 들이고
+# (식당/코너/식사/메뉴는 정수 코드로 인코딩), 다음 통계를 벡터 연산으로 계산합니다.
+# 메뉴는 dish_index의 메뉴 ID가 붙어 있으면 그 ID로 묶어 표기가 달라도 같은 메뉴로 셉니다.
+#   - 코너별 대표 메뉴 반복: 제공 횟수, 서로 다른 메뉴 수, 반복률, 자주 나온 메뉴
+#   - 코너별 rating 분포: 개수, 평균, 최소, 최대, 값별 횟수
+#   - 식당별 휴무일 수: 기록은 있지만 메뉴가 하나도 없던 날
+# 결과는 기록 저장소의 세대(menu_store.generation) 단위로 캐시합니다.
+# API가 여러 스레드에서 부르므로 캐시는 잠금으로 보호하고, 같은 키를 동시에 요청하면 한 번만 계산합니다.
+#
+# numpy가 설치되어 있어야 합니다. (pip install numpy)
+
+import threading
+from datetime import date
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 통계 기능을 쓸 수 없습니다.
+    np = None
+
+import menu_store
+
+TOP_DISHES = 5
+MAX_CACHED_RANGES = 64
+
+# (세대, 기간) -> 통계 결과
+_stats_cache = {}
+# (세대, 기간) -> 계산이 끝나면 set되는 Event (계산 중인 키만)
+_inflight = {}
+_stats_lock = threading.Lock()
+
+
+def available() -> bool:
+    return np is not None
+
+
+class _Codes:
+    """문자열을 처음 나온 순서대로 0, 1, 2... 정수 코드로 바꿉니다."""
+
+    def __init__(self):
+        self.index = {}
+        self.values = []
+
+    def __call__(self, value) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class MenuFrame:
+    """메뉴 항목 단위의 열 배열 묶음입니다. 행 하나가 하루의 한 메뉴 항목입니다."""
+
+    def __init__(self, start: date | None = None, end: date | None = None, history_dir: Path | None = None):
+        self.dates = []
+        self.places = _Codes()
+        self.corners = _Codes()
+        self.meals = _Codes()
+        self.dishes = _Codes()
+        self._dish_names = []
+
+        day, place, corner, meal, dish, rating, main = [], [], [], [], [], [], []
+        # 식당별 하루 메뉴(코너) 수. 기록에 식당이 있는데 0이면 휴무로 봅니다.
+        place_day_menus = {}
+
+        for d, snapshot in enumerate(menu_store.iter_snapshots(start, end, history_dir, use_cache=False)):
+            self.dates.append(snapshot["date"])
+            for key, info in snapshot.get("places", {}).items():
+                p = self.places(key)
+                menus = info.get("menus", [])
+                place_day_menus[(d, p)] = len(menus)
+                for menu in menus:
+                    c = self.corners(menu.get("corner"))
+                    m = self.meals(menu.get("meal"))
+                    for i, item in enumerate(menu.get("items", [])):
+                        day.append(d)
+                        place.append(p)
+                        corner.append(c)
+                        meal.append(m)
+                        dish_id = item.get("dish_id")
+                        code = self.dishes(("id", dish_id) if dish_id is not None else item.get("name"))
+                        if code == len(self._dish_names):
+                            self._dish_names.append(item.get("name"))
+                        dish.append(code)
+                        r = item.get("rating")
+                        rating.append(r if r is not None else np.nan)
+                        main.append(i == 0)
+
+        self.day = np.array(day, dtype=np.int32)
+        self.place = np.array(place, dtype=np.int16)
+        self.corner = np.array(corner, dtype=np.int32)
+        self.meal = np.array(meal, dtype=np.int8)
+        self.dish = np.array(dish, dtype=np.int32)
+        self.rating = np.array(rating, dtype=np.float32)
+        self.main = np.array(main, dtype=bool)
+
+        # 날짜 x 식당 메뉴 수 행렬. 기록에 없는 식당은 -1
+        self.menu_counts = np.full((len(self.dates), len(self.places.values)), -1, dtype=np.int32)
+        if place_day_menus:
+            keys = np.array(list(place_day_menus.keys()), dtype=np.int64)
+            self.menu_counts[keys[:, 0], keys[:, 1]] = list(place_day_menus.values())
+
+    def __len__(self):
+        return len(self.day)
+
+    def dish_name(self, code: int) -> str:
+        """메뉴 코드의 표시 이름(처음 나온 표기)을 반환합니다."""
+        return self._dish_names[code]
+
+
+def _group_ids(*codes):
+    """여러 코드 열을 묶어 그룹 번호와 그룹별 대표 코드(각 열의 값)를 반환합니다."""
+    stacked = np.stack([c.astype(np.int64) for c in codes], axis=1)
+    keys, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    return keys, inverse.reshape(-1)
+
+
+def dish_repetition(frame: MenuFrame, top: int = TOP_DISHES) -> list[dict]:
+    """코너별 대표 메뉴(각 코너의 첫 항목)가 얼마나 반복되는지 계산합니다."""
+    mask = frame.main
+    if not mask.any():
+        return []
+    place, corner, dish = frame.place[mask], frame.corner[mask], frame.dish[mask]
+
+    groups, group_of_row = _group_ids(place, corner)
+    servings = np.bincount(group_of_row, minlength=len(groups))
+
+    # (코너, 메뉴) 쌍별 등장 횟수
+    pairs, pair_counts = np.unique(np.stack([group_of_row, dish.astype(np.int64)], axis=1), axis=0, return_counts=True)
+    distinct = np.bincount(pairs[:, 0], minlength=len(groups))
+
+    # 코너 안에서 많이 나온 순으로 정렬 (코너 오름차순, 횟수 내림차순)
+    order = np.lexsort((-pair_counts, pairs[:, 0]))
+    pairs, pair_counts = pairs[order], pair_counts[order]
+    starts = np.searchsorted(pairs[:, 0], np.arange(len(groups)))
+
+    result = []
+    for g, (p, c) in enumerate(groups):
+        top_slice = slice(starts[g], starts[g] + min(top, distinct[g]))
+        result.append({
+            "place": frame.places.values[p],
+            "corner": frame.corners.values[c],
+            "servings": int(servings[g]),
+            "distinct_dishes": int(distinct[g]),
+            "repeat_ratio": round(float(1 - distinct[g] / servings[g]), 3),
+            "top_dishes": [
+                {"name": frame.dish_name(d), "count": int(n)}
+                for d, n in zip(pairs[top_slice, 1], pair_counts[top_slice])
+            ],
+        })
+    return result
+
+
+def rating_distribution(frame: MenuFrame) -> list[dict]:
+    """코너별 rating 개수, 평균, 최소, 최대와 값별 횟수를 계산합니다. rating이 없는 항목은 제외합니다."""
+    mask = ~np.isnan(frame.rating)
+    if not mask.any():
+        return []
+    place, corner, rating = frame.place[mask], frame.corner[mask], frame.rating[mask]
+
+    groups, group_of_row = _group_ids(place, corner)
+    counts = np.bincount(group_of_row, minlength=len(groups))
+    sums = np.bincount(group_of_row, weights=rating, minlength=len(groups))
+    mins = np.full(len(groups), np.inf)
+    maxs = np.full(len(groups), -np.inf)
+    np.minimum.at(mins, group_of_row, rating)
+    np.maximum.at(maxs, group_of_row, rating)
+
+    values, value_counts = np.unique(np.stack([group_of_row, rating], axis=1), axis=0, return_counts=True)
+
+    result = []
+    for g, (p, c) in enumerate(groups):
+        in_group = values[:, 0] == g
+        result.append({
+            "place": frame.places.values[p],
+            "corner": frame.corners.values[c],
+            "count": int(counts[g]),
+            "mean": round(float(sums[g] / counts[g]), 3),
+            "min": float(mins[g]),
+            "max": float(maxs[g]),
+            "histogram": {f"{v:g}": int(n) for v, n in zip(values[in_group, 1], value_counts[in_group])},
+        })
+    return result
+
+
+def closed_days(frame: MenuFrame) -> list[dict]:
+    """식당별로 기록된 날 수와 메뉴가 하나도 없던(휴무) 날 수를 계산합니다."""
+    recorded = (frame.menu_counts >= 0).sum(axis=0)
+    closed = (frame.menu_counts == 0).sum(axis=0)
+    return [
+        {"place": key, "recorded_days": int(recorded[p]), "closed_days": int(closed[p])}
+        for p, key in enumerate(frame.places.values)
+    ]
+
+
+def compute(start: date | None = None, end: date | None = None, history_dir: Path | None = None) -> dict:
+    """기간 내 기록으로 모든 통계를 계산합니다."""
+    if np is None:
+        raise RuntimeError("numpy가 설치되어 있지 않습니다. pip install numpy 후 다시 실행해주세요.")
+    frame = MenuFrame(start, end, history_dir)
+    return {
+        "from": frame.dates[0] if frame.dates else None,
+        "to": frame.dates[-1] if frame.dates else None,
+        "days": len(frame.dates),
+        "items": len(frame),
+        "dish_repetition": dish_repetition(frame),
+        "rating_distribution": rating_distribution(frame),
+        "closed_days": closed_days(frame),
+    }
+
+
+def get_stats(start: date | None = None, end: date | None = None, history_dir: Path | None = None) -> dict:
+    """
+    통계를 반환합니다. 기록 저장소 세대가 바뀌지 않았으면 이전에 계산한 결과를 그대로 씁니다.
+    세대가 바뀌면 이전 세대의 결과는 모두 버립니다.
+    같은 키를 이미 다른 스레드가 계산 중이면 그 계산이 끝나기를 기다렸다가 결과를 같이 씁니다.
+    (먼저 계산하던 스레드가 실패하면 기다리던 스레드 중 하나가 다시 계산합니다)
+    """
+    generation = menu_store.generation(history_dir)
+    key = (generation, start, end, history_dir)
+    while True:
+        with _stats_lock:
+            cached = _stats_cache.get(key)
+            if cached is not None:
+                return cached
+            event = _inflight.get(key)
+            if event is None:
+                event = _inflight[key] = threading.Event()
+                break
+        event.wait()
+
+    try:
+        stats = {"generation": generation, **compute(start, end, history_dir)}
+        with _stats_lock:
+            stale = [k for k in _stats_cache if k[0] != generation]
+            for k in stale:
+                del _stats_cache[k]
+            if len(_stats_cache) >= MAX_CACHED_RANGES:
+                _stats_cache.clear()
+            _stats_cache[key] = stats
+    finally:
+        with _stats_lock:
+            del _inflight[key]
+        event.set()
+    return stats
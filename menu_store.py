@@ -0,0 +1,220 @@
+# menu_store.py
+#
+# 날짜별 메뉴 기록 저장소.
+# 스크래퍼가 하루치 결과(menus.json과 같은 구조)를 history/YYYY-MM-DD.json으로 남기고,
+# API는 여기서 여러 날짜의 메뉴를 읽어 주간/기간 조회에 사용합니다.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator
+
+import menu_json
+
+try:
+    import fcntl
+except ImportError:  # fcntl이 없는 환경(Windows)에서는 같은 프로세스 안의 스레드끼리만 잠급니다.
+    fcntl = None
+
+HISTORY_DIR = Path(os.environ.get("SSU_DINING_HISTORY_DIR", Path(__file__).resolve().parent / "history"))
+
+MEALS = ("조식", "중식", "석식")
+
+# 하루치 기록이 바뀔 때마다 mtime을 갱신하는 표시 파일. 같은 디렉터리의 다른 파일(메뉴 ID, 변경 기록 등)이
+# 바뀌어도 세대가 바뀌지 않도록 디렉터리 대신 이 파일의 mtime을 세대로 씁니다.
+GENERATION_FILE = ".generation"
+
+# 파일 경로 -> (mtime, 데이터). 같은 파일을 여러 번 디코딩하지 않도록 합니다.
+# 가장 오래 안 쓴 것부터 버려 SNAPSHOT_CACHE_SIZE일치(약 1년)만 들고 있습니다.
+SNAPSHOT_CACHE_SIZE = 400
+_snapshot_cache = OrderedDict()
+_snapshot_lock = threading.Lock()
+
+# 파일 경로 -> 프로세스 안의 잠금 (file_lock용)
+_file_locks = {}
+_file_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: Path):
+    """
+    읽고 고쳐 다시 쓰는 동안 다른 프로세스(스크래퍼 CLI, API 서버)와 스레드가 path를 함께 고치지 못하게 잠급니다.
+    path 옆의 <이름>.lock 파일에 flock을 겁니다. 같은 스레드에서 겹쳐 잡으면 멈추므로 중첩해서 쓰지 않습니다.
+    """
+    with _file_locks_guard:
+        local = _file_locks.setdefault(str(path), threading.Lock())
+    with local:
+        if fcntl is None:
+            yield
+            return
+        lock_path = path.with_name(path.name + ".lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def snapshot_path(day: str, history_dir: Path | None = None) -> Path:
+    return (history_dir or HISTORY_DIR) / f"{day}.json"
+
+
+def save_snapshot(result: dict, history_dir: Path | None = None) -> Path:
+    """스크랩 결과를 result["date"] 날짜의 기록 파일로 저장합니다. 같은 날짜는 덮어씁니다."""
+    path = snapshot_path(result["date"], history_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 쓰는 도중 API가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+    tmp_path = path.with_suffix(".json.tmp")
+    menu_json.dump(result, tmp_path, pretty=True)
+    os.replace(tmp_path, path)
+    (path.parent / GENERATION_FILE).touch()
+    return path
+
+
+def save_raw_capture(result: dict, captures: dict, history_dir: Path | None = None) -> Path:
+    """
+    스크랩 한 번에서 추출한 원본(코너 텍스트, 기숙사 칸 HTML)을 보관합니다.
+    history/raw/YYYY-MM-DD/HHMMSS-<나노초>.json 형식으로 실행마다 파일 하나씩 남깁니다.
+    같은 초에 여러 번 실행해도 겹치지 않도록 저장 시각(나노초)을 붙이며, 이름순이 곧 실행 순서입니다.
+    """
+    generated_at = result["generated_at"]
+    name = f"{generated_at[11:19].replace(':', '')}-{time.time_ns():019d}.json"
+    path = (history_dir or HISTORY_DIR) / "raw" / result["date"] / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    menu_json.dump({"date": result["date"], "generated_at": generated_at, "sources": captures}, path, pretty=True)
+    return path
+
+
+def raw_capture_runs(start: date | None = None, end: date | None = None,
+                     history_dir: Path | None = None) -> list[tuple[str, list[Path]]]:
+    """(날짜, 그날의 원본 캡처 파일들을 실행 순서대로) 목록을 날짜순으로 반환합니다."""
+    raw_dir = (history_dir or HISTORY_DIR) / "raw"
+    if not raw_dir.exists():
+        return []
+    lo = start.isoformat() if start else ""
+    hi = end.isoformat() if end else "9999-99-99"
+    runs = []
+    for day_dir in sorted(raw_dir.glob("????-??-??")):
+        if lo <= day_dir.name <= hi:
+            paths = sorted(day_dir.glob("*.json"))
+            if paths:
+                runs.append((day_dir.name, paths))
+    return runs
+
+
+def load_snapshot(day: str, history_dir: Path | None = None, use_cache: bool = True) -> dict | None:
+    """
+    해당 날짜의 기록을 반환합니다. 기록이 없으면 None을 반환합니다.
+    긴 기간을 한 번 훑기만 하는 경우(내보내기 등)에는 use_cache=False로 캐시에 쌓이지 않게 합니다.
+    """
+    path = snapshot_path(day, history_dir)
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+    with _snapshot_lock:
+        cached = _snapshot_cache.get(path)
+        if cached and cached[0] == mtime:
+            _snapshot_cache.move_to_end(path)
+            return cached[1]
+
+    data = menu_json.load_snapshot(path)
+    if use_cache:
+        with _snapshot_lock:
+            _snapshot_cache[path] = (mtime, data)
+            _snapshot_cache.move_to_end(path)
+            while len(_snapshot_cache) > SNAPSHOT_CACHE_SIZE:
+                _snapshot_cache.popitem(last=False)
+    return data
+
+
+def available_dates(start: date | None = None, end: date | None = None, history_dir: Path | None = None) -> list[str]:
+    """기록이 있는 날짜(YYYY-MM-DD)를 오름차순으로 반환합니다. start/end는 양 끝을 포함합니다."""
+    directory = history_dir or HISTORY_DIR
+    if not directory.exists():
+        return []
+    lo = start.isoformat() if start else ""
+    hi = end.isoformat() if end else "9999-99-99"
+    # 파일 이름이 ISO 날짜이므로 문자열 비교만으로 범위를 거를 수 있습니다.
+    return sorted(p.stem for p in directory.glob("????-??-??.json") if lo <= p.stem <= hi)
+
+
+def iter_snapshots(start: date | None, end: date | None, history_dir: Path | None = None,
+                   use_cache: bool = True) -> Iterator[dict]:
+    """start~end 사이의 기록을 날짜순으로 하나씩 돌려줍니다. 기록이 없는 날은 건너뜁니다."""
+    for day in available_dates(start, end, history_dir):
+        data = load_snapshot(day, history_dir, use_cache)
+        if data is not None:
+            yield data
+
+
+def generation(history_dir: Path | None = None) -> int:
+    """
+    기록 저장소의 세대 값을 반환합니다. 하루치 기록이 추가되거나 교체될 때마다 값이 바뀝니다.
+    save_snapshot()이 기록을 쓸 때마다 GENERATION_FILE을 갱신하므로 파일 목록을 훑지 않고 stat 한 번으로 판단합니다.
+    (표시 파일이 없는 예전 저장소는 디렉터리의 mtime을 씁니다)
+    """
+    directory = history_dir or HISTORY_DIR
+    try:
+        return (directory / GENERATION_FILE).stat().st_mtime_ns
+    except FileNotFoundError:
+        pass
+    try:
+        return directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def week_bounds(day: date) -> tuple[date, date]:
+    """day가 속한 주의 월요일과 일요일을 반환합니다."""
+    monday = day - timedelta(days=day.weekday())
+    return monday, monday + timedelta(days=6)
+
+
+def query_range(start: date, end: date, places: set | None = None, meals: set | None = None,
+                corners: set | None = None, history_dir: Path | None = None) -> dict:
+    """
+    기간 내 메뉴를 식당/식사/코너로 걸러 열(column) 단위로 묶어 반환합니다.
+    한 행은 하루의 한 코너 식단이며, 같은 키를 행마다 반복하지 않아 응답이 작습니다.
+    """
+    columns = {"date": [], "place": [], "meal": [], "corner": [], "items": []}
+    place_info = {}
+    dates = []
+
+    for snapshot in iter_snapshots(start, end, history_dir):
+        dates.append(snapshot["date"])
+        for key, place in snapshot.get("places", {}).items():
+            if places and key not in places:
+                continue
+            if key not in place_info:
+                place_info[key] = {
+                    "name": place.get("name"),
+                    "building": place.get("building"),
+                    "location_detail": place.get("location_detail"),
+                }
+            for menu in place.get("menus", []):
+                if meals and menu.get("meal") not in meals:
+                    continue
+                if corners and menu.get("corner") not in corners:
+                    continue
+                columns["date"].append(snapshot["date"])
+                columns["place"].append(key)
+                columns["meal"].append(menu.get("meal"))
+                columns["corner"].append(menu.get("corner"))
+                columns["items"].append(menu.get("items", []))
+
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "dates": dates,
+        "places": place_info,
+        "count": len(columns["date"]),
+        "columns": columns,
+    }
@@ -0,0 +1,597 @@
+# menu_subscriptions.py
+#
+# 메뉴 알림 구독.
+# "학생식당 중식에 돈까스가 들어간 메뉴가 나오면 알려줘" 같은 구독(키워드 + 식당/식사 조건 + 받을 곳)을 저장하고,
+# 새로 게시된 메뉴가 있을 때 맞는 구독자에게 알림을 보냅니다.
+#   - 키워드는 dish_index.normalize()로 정규화해 비교합니다. (띄어쓰기, 기호, 대소문자 무시)
+#   - 모든 키워드를 Aho-Corasick 자동자 하나로 묶어 메뉴 이름마다 한 번만 훑습니다.
+#     구독이 수만 개여도 구독을 하나씩 검사하지 않고, 걸린 키워드의 구독만 (식당, 식사) 칸에서 꺼냅니다.
+#   - 알림은 구독의 channel에 맞는 전달 방식(webhook, email)으로 보냅니다. DELIVERIES에 추가해 늘릴 수 있습니다.
+#   - webhook은 https 주소만 받고, 내부망/루프백/링크 로컬(메타데이터 서버 등) 주소로 풀리는 호스트는 거절합니다.
+#     보낼 때 다시 확인한 주소로 바로 연결하며 리다이렉트는 따라가지 않습니다.
+#   - 구독을 만들면 토큰을 한 번만 돌려주고(저장은 해시만), API로 지울 때 그 토큰이 있어야 합니다.
+# 스크랩 결과를 저장할 때마다 그날의 모든 코너를 구독과 맞춰 보고, 같은 메뉴로 두 번 알리지 않도록
+# (구독, 날짜, 식당, 식사, 메뉴) 단위로 이미 알린 것을 history/outbox/notified/<날짜>.json에 기록해 뺍니다.
+# 그래서 어제 나온 메뉴가 오늘 다시 나오면 오늘 다시 알리고, 같은 날 다시 스크랩하면 새로 걸린 것만 알립니다.
+#
+# 스크랩/새로고침은 알림을 보내지 않고 history/outbox/pending/에 한 건씩 넣기만 합니다. (느린 webhook이 저장을 붙잡지 않음)
+# 실제 전달은 deliver()가 합니다. API 서버가 SSU_DINING_DELIVERY_INTERVAL초마다 돌리고, API 없이 쓸 때는
+# cron 등으로 `python menu_subscriptions.py deliver`를 돌립니다. 실패한 알림은 간격을 늘려 가며 다시 보내고,
+# MAX_ATTEMPTS번 실패하면 outbox/failed/로 옮깁니다.
+#
+# 사용 예:
+#   python menu_subscriptions.py add 돈까스 --places students,dodam --meals 중식 --webhook https://example.com/hook
+#   python menu_subscriptions.py add 마라 --email me@example.com
+#   python menu_subscriptions.py list
+#   python menu_subscriptions.py match --date 2025-10-16     # 그날 기록에 맞는 구독 확인 (보내지는 않음)
+#   python menu_subscriptions.py deliver                     # 쌓인 알림 보내기
+
+import argparse
+import hashlib
+import hmac
+import http.client
+import ipaddress
+import json
+import os
+import re
+import secrets
+import socket
+import ssl
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import dish_index
+import menu_json
+import menu_store
+
+SUBSCRIPTIONS_PATH = Path(os.environ.get("SSU_DINING_SUBSCRIPTIONS_PATH", menu_store.HISTORY_DIR / "subscriptions.json"))
+# 보낼 알림 대기열과 전달 기록을 두는 곳
+OUTBOX_DIR = menu_store.HISTORY_DIR / "outbox"
+# 이메일 전달은 실제로 보내지 않고 여기에 메일 파일로 남깁니다. (메일 서버 연동 전 임시)
+MAIL_DIR = OUTBOX_DIR / "mail"
+# 날짜별로 이미 알린 (구독, 식당, 식사, 메뉴) 기록. NOTIFIED_KEEP_DAYS일보다 오래된 기록은 지웁니다.
+NOTIFIED_DIR = OUTBOX_DIR / "notified"
+NOTIFIED_KEEP_DAYS = 14
+
+CHANNELS = ("webhook", "email")
+
+# 구독 수 상한 (전체, 받을 곳 하나당)과 키워드 길이 상한
+MAX_SUBSCRIPTIONS = int(os.environ.get("SSU_DINING_MAX_SUBSCRIPTIONS", 50000))
+MAX_PER_TARGET = 20
+MAX_KEYWORD_LENGTH = 40
+
+_EMAIL_RE = re.compile(r"^[^@\s<>]+@[^@\s<>]+\.[^@\s<>]+$")
+
+# 알림을 동시에 보내는 최대 수. 느린 webhook 하나가 나머지 알림을 붙잡지 않게 합니다.
+DELIVERY_WORKERS = 8
+# 전달 실패 시 최대 시도 횟수와 첫 재시도까지의 간격(초, 시도마다 두 배)
+MAX_ATTEMPTS = 5
+RETRY_BASE_S = 60
+# 보내는 중인 알림이 이보다 오래 남아 있으면(보내던 프로세스가 죽음) 다시 대기열로 돌립니다.
+SENDING_TIMEOUT_S = 600
+
+
+# --- Aho-Corasick 키워드 자동자 ---
+
+class KeywordAutomaton:
+    """
+    여러 키워드를 한 번에 찾는 Aho-Corasick 자동자입니다.
+    find(text)는 text를 한 번 훑어 text에 들어 있는 키워드의 번호(추가한 순서) 집합을 반환합니다.
+    """
+
+    def __init__(self, keywords: list):
+        # 노드별 다음 글자 -> 노드, 실패 링크, 그 노드에서 끝나는 키워드 번호들
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for number, keyword in enumerate(keywords):
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            if keyword:
+                self._out[node] += (number,)
+
+        # 너비 우선으로 실패 링크를 잇고, 실패 링크 쪽에서 끝나는 키워드도 출력에 합칩니다.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def find(self, text: str) -> set:
+        found = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+# --- 구독 색인 ---
+
+class SubscriptionIndex:
+    """
+    구독 목록을 키워드 자동자와 (키워드, 식당, 식사) 칸으로 색인합니다.
+    식당/식사 조건이 없는 구독은 None 칸에 들어가므로, 걸린 키워드마다 칸 네 개만 보면 됩니다.
+    """
+
+    def __init__(self, subscriptions: list):
+        self.subscriptions = {sub["id"]: sub for sub in subscriptions}
+        keywords = []
+        keyword_numbers = {}
+        # 키워드 번호 -> {(식당 또는 None, 식사 또는 None): [구독 ID]}
+        self._buckets = []
+        for sub in subscriptions:
+            keyword = dish_index.normalize(sub["keyword"])
+            if not keyword:
+                continue
+            number = keyword_numbers.get(keyword)
+            if number is None:
+                number = keyword_numbers[keyword] = len(keywords)
+                keywords.append(keyword)
+                self._buckets.append({})
+            for place in sub.get("places") or (None,):
+                for meal in sub.get("meals") or (None,):
+                    self._buckets[number].setdefault((place, meal), []).append(sub["id"])
+        self.keywords = keywords
+        self._automaton = KeywordAutomaton(keywords)
+
+    def match(self, menus: list) -> dict:
+        """
+        menus([(식당 키, 메뉴)])에서 구독에 맞는 메뉴 항목을 찾아 {구독 ID: [걸린 항목]}을 반환합니다.
+        걸린 항목은 {"place", "meal", "corner", "item", "keyword"}입니다.
+        """
+        matches = {}
+        for place, menu in menus:
+            meal = menu.get("meal")
+            for item in menu.get("items", []):
+                name = item.get("name")
+                if not name:
+                    continue
+                for number in self._automaton.find(dish_index.normalize(name)):
+                    buckets = self._buckets[number]
+                    for cell in ((place, meal), (place, None), (None, meal), (None, None)):
+                        for sub_id in buckets.get(cell, ()):
+                            matches.setdefault(sub_id, []).append({
+                                "place": place, "meal": meal, "corner": menu.get("corner"),
+                                "item": name, "keyword": self.subscriptions[sub_id]["keyword"],
+                            })
+        return matches
+
+
+def published_menus(result: dict) -> list:
+    """result(menus.json 구조)의 모든 코너를 [(식당 키, 메뉴)]로 반환합니다."""
+    return [(key, menu) for key, place in result.get("places", {}).items() for menu in place.get("menus", [])]
+
+
+def _notified_key(sub_id: int, day: str, found: dict) -> str:
+    return f"{sub_id}|{day}|{found['place']}|{found['meal']}|{found['item']}"
+
+
+def claim_new(matches: dict, day: str, notified_dir: Path | None = None) -> dict:
+    """
+    matches({구독 ID: [걸린 항목]}) 중 day에 아직 알리지 않은 항목만 남겨 반환하고, 남긴 항목은 알린 것으로 기록합니다.
+    스크래퍼 CLI와 API가 함께 부를 수 있으므로 기록을 읽고 쓰는 동안 잠급니다.
+    """
+    notified_dir = notified_dir or NOTIFIED_DIR
+    path = notified_dir / f"{day}.json"
+    with menu_store.file_lock(path):
+        seen = set(menu_json.load(path)) if path.exists() else set()
+        fresh = {}
+        for sub_id, found in matches.items():
+            new = []
+            for m in found:
+                key = _notified_key(sub_id, day, m)
+                if key not in seen:
+                    seen.add(key)
+                    new.append(m)
+            if new:
+                fresh[sub_id] = new
+        if fresh:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".json.tmp")
+            menu_json.dump(sorted(seen), tmp_path)
+            os.replace(tmp_path, path)
+            _prune_notified(notified_dir, day)
+    return fresh
+
+
+def _prune_notified(notified_dir: Path, day: str):
+    try:
+        oldest = (date.fromisoformat(day) - timedelta(days=NOTIFIED_KEEP_DAYS)).isoformat()
+    except ValueError:
+        return
+    for old in notified_dir.glob("????-??-??.json*"):
+        if old.name[:10] < oldest:
+            old.unlink(missing_ok=True)
+
+
+# --- 저장소 ---
+
+def load_subscriptions(path: Path | None = None) -> list:
+    path = path or SUBSCRIPTIONS_PATH
+    if not path.exists():
+        return []
+    return menu_json.load(path).get("subscriptions", [])
+
+
+def _save(subscriptions: list, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    menu_json.dump({"subscriptions": subscriptions}, tmp_path, pretty=True)
+    os.replace(tmp_path, path)
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def public_view(sub: dict) -> dict:
+    """구독에서 토큰 해시를 뺀 사본 (목록 출력, API 응답용)"""
+    return {k: v for k, v in sub.items() if k != "token_hash"}
+
+
+def resolve_public(host: str, port: int) -> str:
+    """
+    host를 풀어 연결할 IP를 반환합니다. 풀린 주소 중 하나라도 공인 주소가 아니면(사설망, 루프백,
+    링크 로컬, 예약 대역 등) ValueError가 납니다. 서버 안쪽 주소로 요청을 보내게 만드는 일(SSRF)을 막습니다.
+    """
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise ValueError(f"주소를 찾을 수 없습니다: {host} ({e})")
+    addresses = []
+    for info in infos:
+        ip = ipaddress.ip_address(info[4][0].split("%")[0])
+        if ip.version == 6 and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"내부 주소로는 알림을 보낼 수 없습니다: {host} ({ip})")
+        addresses.append(str(ip))
+    if not addresses:
+        raise ValueError(f"주소를 찾을 수 없습니다: {host}")
+    return addresses[0]
+
+
+def _webhook_endpoint(url: str) -> tuple[str, int, str]:
+    """webhook 주소를 (호스트, 포트, 경로)로 나눕니다. https가 아니거나 호스트가 없으면 ValueError가 납니다."""
+    parts = urlsplit(url)
+    if parts.scheme != "https" or not parts.hostname:
+        raise ValueError(f"webhook 주소는 https://로 시작해야 합니다: {url}")
+    if parts.username or parts.password:
+        raise ValueError("webhook 주소에 사용자 정보를 넣을 수 없습니다.")
+    try:
+        port = parts.port or 443
+    except ValueError:
+        raise ValueError(f"webhook 주소의 포트가 잘못되었습니다: {url}")
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return parts.hostname, port, path
+
+
+def validate_target(channel: str, target: str) -> str:
+    """받을 곳을 확인하고 앞뒤 공백을 뗀 값을 반환합니다. 쓸 수 없으면 ValueError가 납니다. (webhook은 DNS를 조회함)"""
+    target = target.strip()
+    if channel == "webhook":
+        host, port, _ = _webhook_endpoint(target)
+        resolve_public(host, port)
+    elif not _EMAIL_RE.match(target):
+        raise ValueError(f"메일 주소가 잘못되었습니다: {target}")
+    return target
+
+
+def add_subscription(keyword: str, channel: str, target: str, places: list | None = None,
+                     meals: list | None = None, path: Path | None = None) -> dict:
+    """
+    구독을 추가하고 반환합니다. 반환값의 token은 구독을 지울 때 필요하며 이때 한 번만 알려 줍니다.
+    키워드나 받을 곳이 잘못됐거나, 전달 방식을 모르거나, 구독 수 상한에 걸리면 ValueError가 납니다.
+    """
+    keyword = keyword.strip()
+    if not dish_index.normalize(keyword):
+        raise ValueError("키워드가 비어 있습니다.")
+    if len(keyword) > MAX_KEYWORD_LENGTH:
+        raise ValueError(f"키워드는 {MAX_KEYWORD_LENGTH}자까지 쓸 수 있습니다.")
+    if channel not in CHANNELS:
+        raise ValueError(f"channel은 {'/'.join(CHANNELS)} 중 하나여야 합니다: {channel}")
+    if meals and not set(meals) <= set(menu_store.MEALS):
+        raise ValueError(f"meal은 {'/'.join(menu_store.MEALS)} 중 하나여야 합니다: {', '.join(meals)}")
+    if places and (len(places) > 20 or not all(isinstance(p, str) and p for p in places)):
+        raise ValueError("places는 식당 키 목록이어야 합니다.")
+    target = validate_target(channel, target)
+
+    path = path or SUBSCRIPTIONS_PATH
+    token = secrets.token_urlsafe(24)
+    # API와 CLI가 동시에 고쳐도 서로의 변경을 덮어쓰거나 같은 ID를 주지 않도록 읽기부터 쓰기까지 잠급니다.
+    with menu_store.file_lock(path):
+        subscriptions = load_subscriptions(path)
+        if len(subscriptions) >= MAX_SUBSCRIPTIONS:
+            raise ValueError("구독 수가 상한에 도달했습니다.")
+        if sum(1 for s in subscriptions if s["target"] == target) >= MAX_PER_TARGET:
+            raise ValueError(f"받을 곳 하나에는 구독을 {MAX_PER_TARGET}개까지 만들 수 있습니다.")
+        sub = {
+            "id": max((s["id"] for s in subscriptions), default=0) + 1,
+            "keyword": keyword,
+            "places": sorted(places) if places else None,
+            "meals": sorted(meals) if meals else None,
+            "channel": channel,
+            "target": target,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "token_hash": _hash_token(token),
+        }
+        subscriptions.append(sub)
+        _save(subscriptions, path)
+    return {**public_view(sub), "token": token}
+
+
+def remove_subscription(sub_id: int, token: str | None = None, path: Path | None = None) -> bool:
+    """
+    구독을 지웁니다. token을 주면 구독을 만들 때 받은 토큰과 맞아야 지웁니다. (None은 관리자용 CLI에서만 씀)
+    없는 ID이거나 토큰이 맞지 않으면 False를 반환합니다.
+    """
+    path = path or SUBSCRIPTIONS_PATH
+    with menu_store.file_lock(path):
+        subscriptions = load_subscriptions(path)
+        target = next((s for s in subscriptions if s["id"] == sub_id), None)
+        if target is None:
+            return False
+        if token is not None and not hmac.compare_digest(target.get("token_hash", ""), _hash_token(token)):
+            return False
+        _save([s for s in subscriptions if s["id"] != sub_id], path)
+    return True
+
+
+# --- 전달 ---
+
+class _PinnedHTTPSConnection(http.client.HTTPSConnection):
+    """미리 확인한 IP로 연결하면서 인증서 확인과 SNI는 원래 호스트 이름으로 하는 HTTPS 연결입니다."""
+
+    def __init__(self, host: str, port: int, address: str, timeout: float):
+        self._ssl_context = ssl.create_default_context()
+        super().__init__(host, port, timeout=timeout, context=self._ssl_context)
+        self._address = address
+
+    def connect(self):
+        sock = socket.create_connection((self._address, self.port), self.timeout)
+        self.sock = self._ssl_context.wrap_socket(sock, server_hostname=self.host)
+
+
+class WebhookDelivery:
+    """
+    구독의 target URL로 알림 JSON을 POST합니다.
+    보낼 때마다 주소를 다시 풀어 공인 주소인지 확인하고 그 IP로 바로 연결하므로(DNS 재바인딩 방지),
+    리다이렉트는 따라가지 않고 2xx가 아니면 실패로 봅니다.
+    """
+
+    def __init__(self, timeout: float = 5.0):
+        self.timeout = timeout
+
+    def send(self, sub: dict, payload: dict):
+        host, port, path = _webhook_endpoint(sub["target"])
+        connection = _PinnedHTTPSConnection(host, port, resolve_public(host, port), self.timeout)
+        try:
+            connection.request("POST", path, body=menu_json.dumps(payload),
+                               headers={"Content-Type": "application/json; charset=utf-8"})
+            response = connection.getresponse()
+            response.read()
+            if not 200 <= response.status < 300:
+                raise RuntimeError(f"HTTP {response.status}")
+        finally:
+            connection.close()
+
+
+class EmailDelivery:
+    """메일을 보내는 대신 outbox 디렉터리에 받는 사람별 메일 파일(.eml 형식의 본문)을 남기는 임시 구현입니다."""
+
+    def __init__(self, outbox_dir: Path = MAIL_DIR):
+        self.outbox_dir = outbox_dir
+
+    def send(self, sub: dict, payload: dict):
+        lines = [f"To: {sub['target']}", f"Subject: [숭실대 학식] '{sub['keyword']}' 메뉴가 나왔습니다 ({payload['date']})", ""]
+        for m in payload["matches"]:
+            lines.append(f"- {m['place']} {m['meal']} {m['corner']}: {m['item']}")
+        self.outbox_dir.mkdir(parents=True, exist_ok=True)
+        path = self.outbox_dir / f"{payload['date']}-{sub['id']}-{datetime.now().strftime('%H%M%S%f')}.eml"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+DELIVERIES = {"webhook": WebhookDelivery(), "email": EmailDelivery()}
+
+
+def notify(result: dict, path: Path | None = None, outbox_dir: Path | None = None) -> dict:
+    """
+    result 날짜의 모든 코너를 구독과 맞춰 보고, 그날 아직 알리지 않은 메뉴가 걸린 구독의 알림을 대기열에 넣습니다.
+    보내지는 않습니다. (deliver) {"subscriptions", "matched", "queued"} 통계를 반환합니다.
+    """
+    subscriptions = load_subscriptions(path)
+    stats = {"subscriptions": len(subscriptions), "matched": 0, "queued": 0}
+    menus = published_menus(result)
+    if not subscriptions or not menus:
+        return stats
+
+    index = SubscriptionIndex(subscriptions)
+    matches = claim_new(index.match(menus), result["date"])
+    stats["matched"] = len(matches)
+    for sub_id, found in matches.items():
+        sub = index.subscriptions[sub_id]
+        payload = {"subscription_id": sub_id, "keyword": sub["keyword"], "date": result.get("date"),
+                   "generated_at": result.get("generated_at"), "matches": found}
+        enqueue(sub, payload, outbox_dir)
+        stats["queued"] += 1
+    return stats
+
+
+# --- 대기열 ---
+
+def enqueue(sub: dict, payload: dict, outbox_dir: Path | None = None) -> Path:
+    """알림 한 건을 outbox/pending/에 넣습니다. 보낼 곳은 넣을 때의 구독 정보를 함께 남깁니다."""
+    pending = (outbox_dir or OUTBOX_DIR) / "pending"
+    pending.mkdir(parents=True, exist_ok=True)
+    job = {"subscription": public_view(sub), "payload": payload, "attempts": 0, "not_before": 0}
+    path = pending / f"{time.time_ns()}-{sub['id']}.json"
+    # deliver()가 반쯤 쓰인 파일을 집어 가지 않도록 .tmp로 쓴 뒤 이름을 바꿉니다.
+    tmp_path = path.with_suffix(".json.tmp")
+    menu_json.dump(job, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _recover_stale(outbox_dir: Path):
+    """보내는 도중 멈춘(프로세스가 죽은) 알림을 다시 대기열로 돌립니다."""
+    deadline = time.time() - SENDING_TIMEOUT_S
+    for path in (outbox_dir / "sending").glob("*.json"):
+        try:
+            if path.stat().st_mtime < deadline:
+                os.replace(path, outbox_dir / "pending" / path.name)
+        except FileNotFoundError:
+            pass
+
+
+def _claim_jobs(outbox_dir: Path, max_jobs: int | None) -> list:
+    """
+    보낼 때가 된 알림을 pending/에서 sending/으로 옮기고 [(경로, 알림)]을 반환합니다.
+    이름 바꾸기는 한 프로세스만 성공하므로 API 워커 여러 개가 함께 돌아도 같은 알림을 두 번 보내지 않습니다.
+    """
+    sending = outbox_dir / "sending"
+    sending.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+    jobs = []
+    for path in sorted((outbox_dir / "pending").glob("*.json")):
+        if max_jobs is not None and len(jobs) >= max_jobs:
+            break
+        try:
+            job = menu_json.load(path)
+        except (FileNotFoundError, ValueError):
+            continue
+        if job.get("not_before", 0) > now:
+            continue
+        claimed = sending / path.name
+        try:
+            os.replace(path, claimed)
+        except FileNotFoundError:
+            continue
+        # 오래 멈춘 알림을 가려낼 수 있도록 집어 간 시각을 mtime에 남깁니다.
+        os.utime(claimed)
+        jobs.append((claimed, job))
+    return jobs
+
+
+def deliver(outbox_dir: Path | None = None, path: Path | None = None, max_jobs: int | None = None) -> dict:
+    """
+    대기열의 알림을 보냅니다. 그 사이 지워졌거나 받을 곳이 바뀐 구독의 알림은 버리고,
+    실패한 알림은 간격을 늘려 다시 넣으며 MAX_ATTEMPTS번 실패하면 failed/로 옮깁니다.
+    {"sent", "retry", "failed", "dropped"} 통계를 반환합니다.
+    """
+    outbox_dir = outbox_dir or OUTBOX_DIR
+    stats = {"sent": 0, "retry": 0, "failed": 0, "dropped": 0}
+    if not (outbox_dir / "pending").exists():
+        return stats
+    _recover_stale(outbox_dir)
+    jobs = _claim_jobs(outbox_dir, max_jobs)
+    if not jobs:
+        return stats
+    current = {s["id"]: s for s in load_subscriptions(path)}
+
+    def send(item: tuple) -> str:
+        claimed, job = item
+        sub = job["subscription"]
+        live = current.get(sub["id"])
+        if live is None or (live["channel"], live["target"]) != (sub["channel"], sub["target"]):
+            claimed.unlink(missing_ok=True)
+            return "dropped"
+        try:
+            DELIVERIES[sub["channel"]].send(sub, job["payload"])
+        except Exception as e:
+            job["attempts"] += 1
+            job["error"] = str(e)
+            if job["attempts"] >= MAX_ATTEMPTS:
+                print(f"  ⚠️  알림 전달 포기 (구독 {sub['id']}, {sub['channel']}): {e}")
+                (outbox_dir / "failed").mkdir(parents=True, exist_ok=True)
+                menu_json.dump(job, outbox_dir / "failed" / claimed.name)
+                claimed.unlink(missing_ok=True)
+                return "failed"
+            job["not_before"] = time.time() + RETRY_BASE_S * 2 ** (job["attempts"] - 1)
+            tmp_path = claimed.with_suffix(".json.tmp")
+            menu_json.dump(job, tmp_path)
+            os.replace(tmp_path, outbox_dir / "pending" / claimed.name)
+            claimed.unlink(missing_ok=True)
+            return "retry"
+        claimed.unlink(missing_ok=True)
+        return "sent"
+
+    with ThreadPoolExecutor(max_workers=DELIVERY_WORKERS) as executor:
+        for outcome in executor.map(send, jobs):
+            stats[outcome] += 1
+    return stats
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="메뉴 알림 구독 관리")
+    sub = arg_parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="구독 추가")
+    add.add_argument("keyword", help="메뉴 이름에 들어갈 단어 (예: 돈까스)")
+    add.add_argument("--places", default=None, help="쉼표로 구분한 식당 키 (생략하면 전체)")
+    add.add_argument("--meals", default=None, help="쉼표로 구분한 식사 (생략하면 전체)")
+    target = add.add_mutually_exclusive_group(required=True)
+    target.add_argument("--webhook", metavar="URL")
+    target.add_argument("--email", metavar="ADDRESS")
+    remove = sub.add_parser("remove", help="구독 삭제")
+    remove.add_argument("id", type=int)
+    sub.add_parser("list", help="구독 목록")
+    match = sub.add_parser("match", help="기록된 날짜의 메뉴에 맞는 구독 확인 (보내지 않음)")
+    match.add_argument("--date", required=True)
+    sub.add_parser("deliver", help="대기열에 쌓인 알림 보내기")
+    args = arg_parser.parse_args()
+
+    def split(value):
+        return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+    if args.command == "add":
+        channel, target = ("webhook", args.webhook) if args.webhook else ("email", args.email)
+        try:
+            created = add_subscription(args.keyword, channel, target, split(args.places), split(args.meals))
+        except ValueError as e:
+            arg_parser.error(str(e))
+        print(f"✅ 구독 {created['id']} 추가: {json.dumps(created, ensure_ascii=False)}")
+    elif args.command == "remove":
+        print("✅ 삭제했습니다." if remove_subscription(args.id) else f"구독 {args.id}이 없습니다.")
+    elif args.command == "list":
+        for s in load_subscriptions():
+            print(f"{s['id']}: '{s['keyword']}' 식당={s['places'] or '전체'} 식사={s['meals'] or '전체'} → {s['channel']} {s['target']}")
+    elif args.command == "deliver":
+        stats = deliver()
+        print(f"✅ 보냄 {stats['sent']}, 다시 시도 {stats['retry']}, 실패 {stats['failed']}, 버림 {stats['dropped']}")
+    else:
+        snapshot = menu_store.load_snapshot(args.date)
+        if not snapshot:
+            print(f"{args.date} 기록이 없습니다.")
+            return
+        index = SubscriptionIndex(load_subscriptions())
+        for sub_id, found in index.match(published_menus(snapshot)).items():
+            print(f"구독 {sub_id} ('{index.subscriptions[sub_id]['keyword']}'): "
+                  + ", ".join(f"{m['place']} {m['meal']} {m['item']}" for m in found))
+
+
+if __name__ == "__main__":
+    main()
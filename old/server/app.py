@@ -1,29 +1,164 @@
 # app.py
 
-from fastapi import FastAPI, HTTPException
+import time
+
+# 시작 시간 측정의 기준점. 무거운 import보다 먼저 잽니다.
+_T0 = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
 from pathlib import Path
-import json
-from datetime import datetime
-import uvicorn  # uvicorn 실행을 위해 추가
+import asyncio
+import hashlib
+import hmac
+import importlib
+import math
+import os
+import sys
+from datetime import date, datetime
+
+# 스크래퍼와 같은 기록 저장소(menu_store.py)를 쓰기 위해 저장소 루트를 import 경로에 추가합니다.
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import menu_cache  # noqa: E402
+import menu_calendar  # noqa: E402
+import menu_changes  # noqa: E402
+import menu_compact  # noqa: E402
+import menu_export  # noqa: E402
+import menu_json  # noqa: E402
+import menu_store  # noqa: E402
+import menu_subscriptions  # noqa: E402
+import request_guard  # noqa: E402
+
+# 통계(numpy), 요청 시점 스크랩(playwright)처럼 무거운 모듈은 처음 쓰는 요청에서 가져옵니다. (_lazy_import)
 
 # Pydantic 모델을 사용하면 API의 입출력을 더 명확하게 정의할 수 있습니다.
 # from pydantic import BaseModel, Field
 # from typing import List, Optional
 
-DATA_PATH = Path(__file__).parent / "data" / "menus.json"
+# 벤치마크/테스트에서 픽스처 데이터를 쓰기 위해 환경 변수로 경로를 바꿀 수 있습니다.
+DATA_PATH = Path(os.environ.get("SSU_DINING_DATA_PATH", Path(__file__).parent / "data" / "menus.json"))
+
+# 한 번에 조회할 수 있는 최대 기간(일). 너무 긴 요청이 서버를 오래 붙잡지 않도록 제한합니다.
+MAX_RANGE_DAYS = 93
+
+# /api/refresh로 같은 식당을 다시 스크랩할 수 있는 최소 간격(초)
+REFRESH_MIN_INTERVAL = float(os.environ.get("SSU_DINING_REFRESH_INTERVAL", 60))
+# /api/refresh를 부를 때 X-Admin-Token 헤더로 보내야 하는 관리자 토큰. 비워 두면 /api/refresh를 쓸 수 없습니다.
+ADMIN_TOKEN = os.environ.get("SSU_DINING_ADMIN_TOKEN", "")
+
+# 클라이언트 IP별 요청 제한 "초당 개수/최대 몰림" (예: 10/40). 기본값 0은 제한하지 않습니다.
+RATE_LIMIT = os.environ.get("SSU_DINING_RATE_LIMIT", "0")
+# 리버스 프록시 주소/대역 (예: 127.0.0.1,10.0.0.0/8). 이 주소에서 온 요청은 X-Forwarded-For의 클라이언트 IP로 제한합니다.
+TRUSTED_PROXIES = os.environ.get("SSU_DINING_TRUSTED_PROXIES", "")
+
+# 구독 알림 대기열(menu_subscriptions.py)을 보내는 간격(초). 0이면 이 서버에서는 보내지 않습니다.
+DELIVERY_INTERVAL = float(os.environ.get("SSU_DINING_DELIVERY_INTERVAL", 30))
+
+class FastJSONResponse(Response):
+    """
+    menu_json(orjson/msgspec, 없으면 표준 json)으로 인코딩하는 JSON 응답입니다.
+    이미 인코딩된 bytes를 주면 그대로 보냅니다.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return menu_json.dumps(content)
+
+
+def _respond(payload, response: Response | None = None) -> FastJSONResponse:
+    """
+    payload를 FastJSONResponse로 바로 돌려줍니다. (FastAPI의 jsonable_encoder를 거치지 않음)
+    response에 붙여 둔 캐시 헤더(ETag, Cache-Control)는 옮겨 붙입니다.
+    """
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k in ("etag", "cache-control", "vary")}
+    return FastJSONResponse(payload, headers=headers)
+
+
+def _respond_msgpack(body: bytes, response: Response) -> Response:
+    """이미 인코딩한 MessagePack 본문을 캐시 헤더와 함께 돌려줍니다."""
+    headers = {k: v for k, v in response.headers.items() if k in ("etag", "cache-control", "vary")}
+    return Response(body, media_type=menu_compact.MEDIA_TYPE, headers=headers)
+
+
+# 시작할 때 menus.json을 미리 읽고 응답 본문까지 만들어 둘지 여부 (SSU_DINING_PRELOAD=0이면 끔)
+PRELOAD = os.environ.get("SSU_DINING_PRELOAD", "1") != "0"
+
+# 인코딩한 응답 본문 캐시. 프로세스 안의 LRU와, SSU_DINING_CACHE_URL이 있으면 노드들이 함께 쓰는 공유 캐시를 씁니다.
+_responses = menu_cache.TieredCache(menu_cache.open_shared_tier())
+# 캐시에 없는 같은 응답을 여러 요청이 동시에 찾으면 한 번만 만듭니다.
+_coalescer = request_guard.Coalescer()
+
+# /api/refresh용 스크랩 서비스. 브라우저를 띄우는 일이 무거우므로 처음 요청이 올 때 만듭니다.
+_refresher = None
+
+# 시작 단계별 소요 시간(초)과 지연 import 소요 시간(초). /api/health로 확인할 수 있습니다.
+_timings = {"import_s": round(time.perf_counter() - _T0, 4)}
+_lazy_imports = {}
+
+
+def _lazy_import(name: str):
+    """모듈을 처음 쓸 때 가져오고 걸린 시간을 기록합니다."""
+    module = sys.modules.get(name)
+    if module is None:
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        _lazy_imports[name] = round(time.perf_counter() - started, 4)
+    return module
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    if PRELOAD and DATA_PATH.exists():
+        # 첫 요청이 파일 읽기와 JSON 인코딩을 떠안지 않도록 미리 해 둡니다.
+        load_data(force_reload=True)
+        _timings["preload_s"] = round(time.perf_counter() - started, 4)
+    # 스크래퍼가 다른 곳에서 새 메뉴를 저장하면 알림을 받아 캐시를 비우고 다시 읽습니다.
+    _responses.listen(_on_invalidate)
+    delivery = asyncio.create_task(_deliver_loop()) if DELIVERY_INTERVAL > 0 else None
+    _timings["ready_s"] = round(time.perf_counter() - _T0, 4)
+    print(f"🚀 준비 완료: import {_timings['import_s'] * 1000:.0f}ms, "
+          f"미리 읽기 {_timings.get('preload_s', 0) * 1000:.0f}ms, 전체 {_timings['ready_s'] * 1000:.0f}ms")
+    yield
+    if delivery is not None:
+        delivery.cancel()
+    _responses.close()
+    # 서버가 내려갈 때 떠 있는 브라우저를 닫습니다.
+    if _refresher is not None:
+        await _refresher.close()
+
 
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     title="SSU Dining API",
     version="1.0.0",  # 버전 업데이트
     description="숭실대학교 학생식당 메뉴 정보 제공 API (개선 버전)"
 )
 
+_limiter = None
+if RATE_LIMIT != "0":
+    rate, _, burst = RATE_LIMIT.partition("/")
+    _limiter = request_guard.TokenBucketLimiter(float(rate), float(burst or rate))
+    # CORS 미들웨어보다 먼저 추가해 안쪽에 두어야 429 응답에도 CORS 헤더가 붙습니다.
+    app.add_middleware(request_guard.RateLimitMiddleware, limiter=_limiter,
+                       trusted_proxies=request_guard.parse_networks(TRUSTED_PROXIES))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # 실제 프로덕션에서는 특정 도메인만 허용하는 것이 안전합니다.
     allow_credentials=True,
     allow_methods=["GET"],  # POST는 reload 용도이므로 GET만 허용해도 무방
+    expose_headers=["ETag"],  # 다른 출처에서 띄운 웹 페이지의 서비스 워커도 버전을 비교할 수 있게 합니다.
 )
 
 # 데이터 캐싱을 위한 간단한 전역 변수
@@ -35,6 +170,7 @@ def load_data(force_reload: bool = False):
     """
     menus.json 파일을 읽어와 캐시에 저장하고 반환합니다.
     force_reload가 True이면 캐시를 무시하고 다시 파일을 읽습니다.
+    캐시가 60초보다 오래됐어도 파일이 바뀌지 않았으면(mtime) 다시 읽지 않습니다.
     """
     now = datetime.now()
     if not force_reload and "data" in _cache and (now - _cache.get("loaded_at", now)).total_seconds() < 60:
@@ -43,11 +179,93 @@ def load_data(force_reload: bool = False):
     if not DATA_PATH.exists():
         raise HTTPException(status_code=503, detail="menus.json 파일을 찾을 수 없습니다. 스크래퍼를 먼저 실행해주세요.")
 
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        _cache["data"] = data
+    mtime = DATA_PATH.stat().st_mtime_ns
+    if not force_reload and _cache.get("mtime") == mtime:
         _cache["loaded_at"] = now
-        return data
+        return _cache["data"]
+
+    data = menu_json.load_snapshot(DATA_PATH)
+    _cache["data"] = data
+    # 필터 없는 /api/today 응답 본문은 데이터를 읽을 때 한 번만 인코딩해 둡니다.
+    _cache["body"] = menu_json.dumps(data)
+    _cache["mtime"] = mtime
+    _cache["loaded_at"] = now
+    return data
+
+
+async def _deliver_loop():
+    """스크랩/새로고침이 대기열에 넣은 구독 알림을 요청 처리와 따로 DELIVERY_INTERVAL초마다 보냅니다."""
+    while True:
+        await asyncio.sleep(DELIVERY_INTERVAL)
+        try:
+            stats = await asyncio.to_thread(menu_subscriptions.deliver)
+        except Exception as e:
+            print(f"⚠️ 구독 알림 전달 실패: {e}")
+            continue
+        if any(stats.values()):
+            print(f"🔔 구독 알림: 보냄 {stats['sent']}, 다시 시도 {stats['retry']}, 실패 {stats['failed']}, 버림 {stats['dropped']}")
+
+
+def _on_invalidate(message: dict):
+    """무효화 알림을 받으면 다음 요청에서 menus.json을 다시 읽도록 합니다. (1단계 캐시는 TieredCache가 비움)"""
+    _cache.pop("data", None)
+    _cache.pop("mtime", None)
+    print(f"♻️ 캐시 무효화 알림: {message.get('generated_at')}")
+
+
+def _split_param(value: str | None) -> set | None:
+    """쉼표로 구분된 쿼리 파라미터를 set으로 바꿉니다. 비어 있으면 None을 반환합니다."""
+    if not value:
+        return None
+    return {v.strip() for v in value.split(",") if v.strip()} or None
+
+
+def _normalize_param(value: str | None) -> str:
+    """쉼표로 구분된 쿼리 파라미터를 정렬된 문자열로 바꿉니다. (students,dodam과 dodam,students는 같은 값)"""
+    return ",".join(sorted(_split_param(value) or ()))
+
+
+async def _cached(key: str, build) -> bytes:
+    """
+    key의 응답 본문을 캐시에서 찾고, 없으면 build()로 만듭니다.
+    같은 key를 동시에 찾는 요청들은 한 번의 build() 결과를 함께 씁니다. (build는 스레드에서 돕니다)
+    """
+    body = _responses.get(key)
+    if body is not None:
+        return body
+    return await _coalescer.run(key, lambda: _responses.get_or_build(key, build))
+
+
+def _parse_date(value: str, name: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name}는 YYYY-MM-DD 형식이어야 합니다: {value}")
+
+
+def _parse_meals(meal: str | None) -> set | None:
+    meals = _split_param(meal)
+    if meals and not meals <= set(menu_store.MEALS):
+        invalid = ", ".join(sorted(meals - set(menu_store.MEALS)))
+        raise HTTPException(status_code=400, detail=f"meal은 {'/'.join(menu_store.MEALS)} 중 하나여야 합니다: {invalid}")
+    return meals
+
+
+def _check_etag(request: Request, response: Response, *parts) -> Response | None:
+    """
+    parts로 만든 ETag를 응답 헤더에 붙입니다.
+    클라이언트가 같은 ETag를 If-None-Match로 보냈다면 본문 없는 304 응답을 반환하고, 아니면 None을 반환합니다.
+    """
+    tag = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:16]
+    etag = f'W/"{tag}"'
+    # 캐시는 하되 쓰기 전에 항상 재검증하도록 합니다. 바뀌지 않았으면 304라 전송량이 거의 없습니다.
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    response.headers.update(headers)
+    if etag in request.headers.get("if-none-match", ""):
+        if "vary" in response.headers:
+            headers["Vary"] = response.headers["vary"]
+        return Response(status_code=304, headers=headers)
+    return None
 
 
 @app.get("/")
@@ -55,29 +273,289 @@ async def read_root():
     return {"message": "SSU Dining API에 오신 것을 환영합니다. /docs 로 API 문서를 확인하세요."}
 
 
+@app.get("/api/health")
+async def health():
+    """프로세스 준비 상태와 시작 단계별 소요 시간, 지연 import 소요 시간을 반환합니다."""
+    return {
+        "ready": "ready_s" in _timings,
+        "preloaded": "body" in _cache,
+        "timings": _timings,
+        "lazy_imports": _lazy_imports,
+        "cache": {**_responses.stats, "local_entries": len(_responses.local), "shared": _responses.shared is not None},
+        "coalescing": {**_coalescer.stats, "inflight": len(_coalescer)},
+        "rate_limit": {**_limiter.stats, "clients": len(_limiter)} if _limiter else None,
+    }
+
+
 @app.get("/api/places")
 async def get_places():
     """등록된 모든 식당의 기본 정보를 반환합니다."""
     data = load_data()
     # places의 value 전체를 반환하도록 변경하여 더 많은 정보 제공
-    return list(data.get("places", {}).values())
+    return _respond(list(data.get("places", {}).values()))
+
+
+def _parse_fields(fields: str | None) -> tuple | None:
+    try:
+        return menu_compact.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/api/today")
-async def get_today(places: str | None = None):
+async def get_today(request: Request, response: Response, places: str | None = None, fields: str | None = None):
     """
     오늘의 전체 식단 정보를 반환합니다. places 파라미터로 특정 식당만 필터링할 수 있습니다.
     (예: /api/today?places=students,foodcourt)
+    fields로 메뉴 항목에서 남길 키를 고를 수 있습니다. (예: fields=name)
+    Accept: application/msgpack으로 요청하면 문자열 표를 쓰는 MessagePack 압축 형식(menu_compact.py)으로 보냅니다.
     """
     data = load_data()
-    if places:
-        # 쉼표로 구분된 문자열을 set으로 만들어 필터링
-        keys_to_filter = {p.strip() for p in places.split(",") if p.strip()}
-        # data["places"]의 복사본을 만들어 필터링
-        filtered_places = {k: v for k, v in data.get("places", {}).items() if k in keys_to_filter}
-        # 원본 데이터 구조를 유지하며 places만 교체
-        return {**data, "places": filtered_places}
-    return data
+    item_fields = _parse_fields(fields)
+    binary = menu_compact.wants_msgpack(request.headers.get("accept"))
+    response.headers["Vary"] = "Accept"
+    keys_to_filter = sorted(_split_param(places) or ())
+    not_modified = _check_etag(request, response, data.get("generated_at"), keys_to_filter, item_fields, binary)
+    if not_modified:
+        return not_modified
+    if not keys_to_filter and not item_fields and not binary:
+        # 미리 인코딩해 둔 본문을 그대로 보내 요청마다 JSON으로 다시 바꾸지 않습니다.
+        return _respond(_cache["body"], response)
+
+    def build() -> bytes:
+        filtered = data
+        if keys_to_filter:
+            # 원본 데이터 구조를 유지하며 places만 교체
+            filtered = {**data, "places": {k: v for k, v in data.get("places", {}).items() if k in keys_to_filter}}
+        if binary:
+            return menu_compact.packb(menu_compact.compact(filtered, item_fields))
+        return menu_json.dumps(menu_compact.project(filtered, item_fields))
+
+    # 같은 데이터 버전/식당/fields/형식이면 한 번 인코딩한 본문을 다시 씁니다.
+    key = (f"today:{data.get('generated_at')}:{','.join(keys_to_filter)}:{','.join(item_fields or ())}:"
+           f"{'msgpack' if binary else 'json'}")
+    body = await _cached(key, build)
+    if binary:
+        return _respond_msgpack(body, response)
+    return _respond(body, response)
+
+
+@app.get("/api/week")
+async def get_week(request: Request, response: Response, date: str | None = None, places: str | None = None,
+                   meal: str | None = None, corner: str | None = None):
+    """
+    date가 속한 주(월~일)의 식단을 한 번에 반환합니다. date를 생략하면 이번 주입니다.
+    places/meal/corner로 서버에서 미리 걸러낼 수 있습니다.
+    (예: /api/week?places=students,dodam&meal=중식)
+    """
+    day = _parse_date(date, "date") if date else menu_calendar.today()
+    start, end = menu_store.week_bounds(day)
+    # 기록 저장소 세대가 그대로면 응답도 같으므로 세대와 조건으로 ETag를 만듭니다.
+    meals = _parse_meals(meal)
+    # 순서만 다른 같은 조건이 같은 ETag와 캐시 키를 쓰도록 정규화합니다.
+    query = f"{_normalize_param(places)}:{_normalize_param(meal)}:{_normalize_param(corner)}"
+    generation = menu_store.generation()
+    not_modified = _check_etag(request, response, generation, query, start)
+    if not_modified:
+        return not_modified
+    body = await _cached(
+        f"week:{generation}:{start}:{query}",
+        lambda: menu_json.dumps(menu_store.query_range(start, end, _split_param(places), meals, _split_param(corner))))
+    return _respond(body, response)
+
+
+@app.get("/api/range")
+async def get_range(request: Request, response: Response,
+                    from_: str = Query(..., alias="from"), to: str = Query(...),
+                    places: str | None = None, meal: str | None = None, corner: str | None = None):
+    """
+    from~to 기간(양 끝 포함)의 식단을 열(column) 단위로 반환합니다.
+    (예: /api/range?from=2025-10-13&to=2025-10-17&meal=조식,중식)
+    """
+    start = _parse_date(from_, "from")
+    end = _parse_date(to, "to")
+    if start > end:
+        raise HTTPException(status_code=400, detail="from은 to보다 늦을 수 없습니다.")
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_RANGE_DAYS}일까지 조회할 수 있습니다.")
+    meals = _parse_meals(meal)
+    query = f"{start}:{end}:{_normalize_param(places)}:{_normalize_param(meal)}:{_normalize_param(corner)}"
+    generation = menu_store.generation()
+    not_modified = _check_etag(request, response, generation, query)
+    if not_modified:
+        return not_modified
+    body = await _cached(
+        f"range:{generation}:{query}",
+        lambda: menu_json.dumps(menu_store.query_range(start, end, _split_param(places), meals, _split_param(corner))))
+    return _respond(body, response)
+
+
+@app.get("/api/changes")
+async def get_changes(request: Request, response: Response, since: int | None = None):
+    """
+    since 버전 뒤의 메뉴 변경을 JSON Patch(RFC 6902) 목록으로 반환합니다. 차례로 적용하면 최신 menus.json이 됩니다.
+    since를 생략했거나 변경 기록에서 이어 붙일 수 없는 버전이면 reset과 함께 현재 전체 기록을 돌려주므로,
+    그 snapshot과 version을 기준으로 삼으면 됩니다.
+    (예: /api/changes?since=41)
+    """
+    version = menu_changes.latest_version()
+    not_modified = _check_etag(request, response, version, since)
+    if not_modified:
+        return not_modified
+    changes = menu_changes.changes_since(since) if since is not None else None
+    if changes is None:
+        # 버전과 스냅샷을 같은 파일(기준 스냅샷)에서 꺼내야 서로 다른 버전이 짝지어지지 않습니다.
+        snapshot = menu_changes.load_base()
+        if snapshot is None:
+            raise HTTPException(status_code=503, detail="아직 변경 기록이 없습니다. 스크래퍼를 먼저 실행해주세요.")
+        return _respond({"version": snapshot["version"], "reset": True, "snapshot": snapshot}, response)
+    return _respond({"version": version, "reset": False, "changes": changes}, response)
+
+
+@app.get("/api/calendar")
+async def get_calendar(date: str | None = None, places: str | None = None):
+    """
+    date(생략하면 오늘)의 식당별 운영 여부와 휴무 이유, 식사별 운영 시간을 반환합니다.
+    스크랩 없이 휴무 달력(공휴일, 학사 일정, 운영 요일, 관측된 휴무)만으로 답합니다.
+    오늘이면 지금 식사를 내고 있는지(open_now)도 함께 줍니다. 날짜는 한국 시간 기준입니다.
+    (예: /api/calendar?date=2025-10-03&places=students,dorm)
+    """
+    now = menu_calendar.now()
+    day = _parse_date(date, "date") if date else now.date()
+    keys = sorted(_split_param(places)) if places else None
+    return _respond(menu_calendar.day_status(day, keys, now))
+
+
+@app.get("/api/stats")
+async def get_stats(from_: str | None = Query(None, alias="from"), to: str | None = None):
+    """
+    기록 전체(또는 from~to 기간)의 메뉴 통계를 반환합니다.
+    코너별 대표 메뉴 반복률, rating 분포, 식당별 휴무일 수를 포함하며,
+    새 기록이 저장되기 전까지는 계산해 둔 결과를 그대로 돌려줍니다.
+    """
+    menu_stats = _lazy_import("menu_stats")
+    if not menu_stats.available():
+        raise HTTPException(status_code=503, detail="numpy가 설치되어 있지 않아 통계를 계산할 수 없습니다.")
+    start = _parse_date(from_, "from") if from_ else None
+    end = _parse_date(to, "to") if to else None
+    # 캐시가 없으면 기록 전체를 훑어 계산하므로 이벤트 루프를 막지 않도록 스레드에서 돌립니다.
+    return _respond(await asyncio.to_thread(menu_stats.get_stats, start, end))
+
+
+@app.get("/api/export")
+async def export_history(from_: str | None = Query(None, alias="from"), to: str | None = None,
+                         format: str = "ndjson", places: str | None = None, meal: str | None = None):
+    """
+    메뉴 기록을 항목당 한 줄(NDJSON) 또는 한 행(CSV)으로 스트리밍합니다.
+    하루치씩 읽어 바로 내보내므로(chunked 전송) 기간이 길어도 서버 메모리가 늘지 않습니다.
+    (예: /api/export?from=2025-09-01&to=2025-12-31&format=csv)
+    """
+    if format not in menu_export.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format은 {'/'.join(menu_export.FORMATS)} 중 하나여야 합니다.")
+    start = _parse_date(from_, "from") if from_ else None
+    end = _parse_date(to, "to") if to else None
+
+    filename = f"menus-{from_ or 'all'}-{to or 'latest'}.{format}"
+    # 동기 제너레이터는 스레드풀에서 돌아가므로 파일 읽기가 이벤트 루프를 막지 않습니다.
+    return StreamingResponse(
+        menu_export.iter_chunks(format, start, end, _split_param(places), _parse_meals(meal)),
+        media_type=menu_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _require_admin(request: Request):
+    """X-Admin-Token 헤더가 ADMIN_TOKEN과 같은지 확인합니다. 토큰이 설정되지 않았으면 관리 기능을 막습니다."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="SSU_DINING_ADMIN_TOKEN이 설정되지 않아 사용할 수 없습니다.")
+    token = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="X-Admin-Token 헤더가 없거나 맞지 않습니다.")
+
+
+@app.post("/api/refresh")
+async def refresh_places(request: Request, places: str | None = None, force: bool = False):
+    """
+    지정한 식당(생략하면 전체)을 지금 바로 다시 스크랩해 저장하고, 스크랩이 끝나면 새 메뉴를 반환합니다.
+    같은 식당을 스크랩하는 중에 들어온 요청은 그 결과를 함께 기다리며,
+    한 식당은 REFRESH_MIN_INTERVAL초에 한 번만 새로 스크랩합니다. (그보다 잦으면 429)
+    휴무 달력에서 오늘(한국 시간) 쉬는 식당은 스크랩하지 않고 closed에 이유와 함께 돌려줍니다.
+    force=true면 휴무 달력을 무시하고 페이지를 열어 보며, 메뉴를 읽으면 잘못 기록된 휴무도 지워집니다.
+    (예: POST /api/refresh?places=students,dorm, POST /api/refresh?places=foodcourt&force=true)
+    관리자만 쓸 수 있도록 X-Admin-Token 헤더에 SSU_DINING_ADMIN_TOKEN 값을 보내야 합니다.
+    """
+    global _refresher
+    _require_admin(request)
+    keys = sorted(_split_param(places)) if places else None
+    closed = {} if force else menu_calendar.closed_places(keys or list(menu_calendar.PLACE_RULES),
+                                                          menu_calendar.today())
+    if closed and keys is None:
+        keys = [k for k in menu_calendar.PLACE_RULES if k not in closed]
+    elif closed:
+        keys = [k for k in keys if k not in closed]
+    if keys == []:
+        # 모두 쉬는 식당이면 브라우저를 띄우지 않고 바로 답합니다.
+        data = load_data()
+        return {"refreshed": [], "joined": [], "failed": [], "closed": closed,
+                "generated_at": data.get("generated_at"), "date": data.get("date"), "places": {}}
+
+    menu_refresh = _lazy_import("menu_refresh")  # playwright까지 불러오므로 처음 쓸 때 가져옵니다.
+    if _refresher is None:
+        _refresher = menu_refresh.RefreshService(DATA_PATH, REFRESH_MIN_INTERVAL)
+    try:
+        outcome = await _refresher.refresh(keys, force)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+    except menu_refresh.RateLimited as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"스크랩에 실패했습니다: {e}")
+
+    data = load_data(force_reload=True)
+    keys = set(keys or data.get("places", {}))
+    return {
+        **outcome,
+        "closed": closed,
+        "generated_at": data.get("generated_at"),
+        "date": data.get("date"),
+        "places": {k: v for k, v in data.get("places", {}).items() if k in keys},
+    }
+
+
+@app.post("/api/subscriptions")
+async def create_subscription(request: Request):
+    """
+    메뉴 알림 구독을 추가합니다. 본문은 JSON입니다.
+    {"keyword": "돈까스", "places": ["students"], "meals": ["중식"], "channel": "webhook", "target": "https://..."}
+    places/meals를 생략하면 모든 식당/식사가 대상입니다. webhook은 공인 주소의 https URL만 받습니다.
+    응답의 token은 구독을 지울 때 필요하며 다시 알려 주지 않습니다.
+    """
+    try:
+        body = await request.json()
+        if not isinstance(body, dict):
+            raise ValueError("본문은 JSON 객체여야 합니다.")
+        # webhook 주소 확인에 DNS 조회가 들어가므로 스레드에서 합니다.
+        sub = await asyncio.to_thread(
+            menu_subscriptions.add_subscription,
+            str(body["keyword"]), str(body.get("channel", "webhook")), str(body["target"]),
+            body.get("places"), body.get("meals"))
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"{e.args[0]} 값이 필요합니다.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return sub
+
+
+@app.delete("/api/subscriptions/{sub_id}")
+async def delete_subscription(sub_id: int, request: Request):
+    """구독을 만들 때 받은 토큰(X-Subscription-Token 헤더)으로 메뉴 알림 구독을 지웁니다."""
+    token = request.headers.get("x-subscription-token")
+    if not token:
+        raise HTTPException(status_code=401, detail="X-Subscription-Token 헤더가 필요합니다.")
+    # 다른 사람의 구독이 있는지 알 수 없도록 없는 구독과 토큰이 틀린 경우를 구분하지 않습니다.
+    if not menu_subscriptions.remove_subscription(sub_id, token):
+        raise HTTPException(status_code=404, detail=f"구독 {sub_id}이 없거나 토큰이 맞지 않습니다.")
+    return {"ok": True, "id": sub_id}
 
 
 @app.post("/api/reload")
@@ -87,6 +565,7 @@ async def reload_from_disk():
     스크래퍼 실행 직후 호출하면 좋습니다.
     """
     load_data(force_reload=True)
+    _responses.invalidate()
     return {
         "ok": True,
         "message": "데이터를 새로고침했습니다.",
@@ -96,4 +575,6 @@ async def reload_from_disk():
 
 # 이 파일이 직접 실행될 때 uvicorn 서버를 구동
 if __name__ == "__main__":
+    import uvicorn  # 서버를 직접 띄울 때만 필요합니다.
+
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
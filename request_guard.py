@@ -0,0 +1,155 @@
+# request_guard.py
+#
+# API 앞단의 요청 보호 장치.
+#   - Coalescer: 같은 키의 계산이 이미 진행 중이면 새로 계산하지 않고 그 결과를 같이 기다립니다.
+#     점심시간처럼 같은 조회가 한꺼번에 몰려 캐시가 비어 있을 때 한 번만 계산하게 합니다.
+#   - TokenBucketLimiter: 클라이언트(IP)마다 초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰으로 요청을 제한합니다.
+#   - RateLimitMiddleware: 라우팅 전에 토큰을 확인하고, 모자라면 바로 429를 보내는 ASGI 미들웨어입니다.
+#     리버스 프록시 뒤에서는 trusted_proxies로 프록시 주소를 알려 주면 X-Forwarded-For의 클라이언트 IP로 셉니다.
+# 모든 상태는 메모리에만 두고 크기에 상한이 있어, 요청이 폭주하거나 IP가 많아도 메모리가 계속 늘지 않습니다.
+
+import asyncio
+import ipaddress
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+class Coalescer:
+    """키별로 진행 중인 계산을 하나만 두는 single-flight입니다. 계산(fn)은 이벤트 루프를 막지 않도록 스레드에서 돌립니다."""
+
+    def __init__(self, max_keys: int = 1024):
+        # 동시에 진행 중인 서로 다른 키의 최대 수. 넘으면 합치지 않고 바로 계산합니다.
+        self.max_keys = max_keys
+        self._inflight = {}
+        self.stats = {"leaders": 0, "followers": 0, "overflow": 0}
+
+    async def run(self, key: str, fn):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["followers"] += 1
+            # 먼저 온 요청의 클라이언트가 연결을 끊어도 같이 기다리는 요청들의 계산은 취소되지 않게 합니다.
+            return await asyncio.shield(future)
+        if len(self._inflight) >= self.max_keys:
+            self.stats["overflow"] += 1
+            return await asyncio.to_thread(fn)
+
+        future = asyncio.ensure_future(asyncio.to_thread(fn))
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._finish(key, done))
+        self.stats["leaders"] += 1
+        return await asyncio.shield(future)
+
+    def _finish(self, key: str, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # 기다리던 요청이 모두 끊겼더라도 "결과를 확인하지 않은 예외" 경고가 나지 않게 합니다.
+        if not future.cancelled():
+            future.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+class TokenBucketLimiter:
+    """
+    클라이언트별 토큰 버킷. 클라이언트 수가 max_clients를 넘으면 가장 오래 안 온 클라이언트부터 잊습니다.
+    (잊힌 클라이언트는 다음 요청 때 가득 찬 버킷으로 다시 시작합니다)
+    """
+
+    def __init__(self, rate: float = 10.0, burst: float = 40.0, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        # 클라이언트 -> [남은 토큰, 마지막 갱신 시각(time.monotonic)]
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"allowed": 0, "limited": 0}
+
+    def acquire(self, client: str) -> float | None:
+        """토큰 하나를 씁니다. 허용하면 None을, 거절하면 토큰이 다시 생길 때까지 기다릴 시간(초)을 반환합니다."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = [self.burst, now]
+                while len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.stats["allowed"] += 1
+                return None
+            self.stats["limited"] += 1
+            return (1 - bucket[0]) / self.rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def parse_networks(value: str | None) -> tuple:
+    """쉼표로 구분된 IP/대역(예: "127.0.0.1,10.0.0.0/8")을 ip_network 튜플로 바꿉니다."""
+    return tuple(ipaddress.ip_network(part.strip(), strict=False) for part in (value or "").split(",") if part.strip())
+
+
+def _in_networks(address: str, networks: tuple) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_address(scope, trusted_proxies: tuple = ()) -> str:
+    """
+    요청을 보낸 클라이언트의 IP를 반환합니다.
+    직접 연결한 쪽이 믿는 프록시(trusted_proxies)이면 X-Forwarded-For를 오른쪽부터 읽어
+    믿는 프록시가 아닌 첫 주소를 씁니다. (그보다 왼쪽은 클라이언트가 마음대로 넣을 수 있으므로 보지 않습니다)
+    """
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+    if not trusted_proxies or not _in_networks(peer, trusted_proxies):
+        return peer
+    forwarded = [value.decode("latin-1") for name, value in scope.get("headers", ()) if name == b"x-forwarded-for"]
+    hops = [hop.strip() for hop in ",".join(forwarded).split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _in_networks(hop, trusted_proxies):
+            return hop
+    return hops[0] if hops else peer
+
+
+class RateLimitMiddleware:
+    """path_prefix로 시작하는 HTTP 요청에 클라이언트 IP별 토큰 버킷을 적용하는 ASGI 미들웨어입니다."""
+
+    def __init__(self, app, limiter: TokenBucketLimiter, path_prefix: str = "/api/", trusted_proxies: tuple = ()):
+        self.app = app
+        self.limiter = limiter
+        self.path_prefix = path_prefix
+        self.trusted_proxies = trusted_proxies
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+        wait = self.limiter.acquire(client_address(scope, self.trusted_proxies))
+        if wait is None:
+            await self.app(scope, receive, send)
+            return
+
+        # 라우팅/요청 본문 읽기 없이 바로 거절해 몰리는 요청이 다른 클라이언트의 응답을 늦추지 않게 합니다.
+        body = '{"detail":"요청이 너무 많습니다. 잠시 뒤에 다시 시도해주세요."}'.encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(wait)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
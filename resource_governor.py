@@ -0,0 +1,275 @@
+# resource_governor.py
+#
+# 자원 제한 스크랩 모드.
+# 작은 VM에서 API 서버와 같이 돌려도 서버가 굶지 않도록 스크래퍼가 쓰는 자원을 제한하고 기록합니다.
+#   - Chromium을 메모리를 적게 쓰는 옵션(LOW_MEMORY_ARGS)으로 띄우고 동시에 여는 페이지 수를 제한합니다.
+#   - 스크랩하는 동안 이 프로세스의 자식 프로세스 트리(Playwright 드라이버 + Chromium)의 RSS와 CPU 사용률을 주기적으로 잽니다.
+#   - 한도를 넘으면 진행 중인 스크랩을 멈추고, 브라우저를 새로 띄워(recycle) 남은 식당만 다시 시도합니다.
+#     재시도 횟수도 다 쓰면 남은 식당은 에러로 기록하고 중단(abort)합니다.
+#   - 실행마다 자원 사용 보고서를 reports/resources/에 JSON으로 남깁니다.
+#
+# 측정은 Linux의 /proc를 읽어서 하므로 추가 패키지가 필요 없습니다. /proc가 없으면 측정 없이 제한만 적용합니다.
+# RSS는 프로세스별 값을 더한 것이라 공유 메모리가 중복으로 잡혀 실제보다 조금 크게(보수적으로) 나옵니다.
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+import menu_sources
+
+REPORT_DIR = Path(__file__).resolve().parent / "reports" / "resources"
+
+# 메모리를 적게 쓰도록 하는 Chromium 실행 옵션
+LOW_MEMORY_ARGS = [
+    "--disable-dev-shm-usage",          # /dev/shm이 작은 환경에서 공유 메모리 대신 /tmp 사용
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+    "--renderer-process-limit=2",       # 렌더러 프로세스 수 제한
+    "--disable-features=site-per-process,Translate,BackForwardCache,MediaRouter",
+    "--js-flags=--max-old-space-size=128",
+]
+
+
+class ResourceLimits:
+    """
+    자원 한도입니다.
+      max_rss_mb        : 브라우저 프로세스 트리 RSS 합계 한도
+      max_cpu_percent   : 브라우저 프로세스 트리 CPU 사용률 한도 (코어 하나 = 100)
+      cpu_grace_samples : CPU 한도는 이 횟수만큼 연속으로 넘어야 위반으로 봅니다 (시작 직후 순간 사용량 무시)
+      max_seconds       : 한 번 시도(브라우저 하나)의 최대 시간
+      max_pages         : 동시에 여는 페이지 수
+      max_recycles      : 한도를 넘었을 때 브라우저를 새로 띄워 다시 시도하는 횟수
+      interval          : 측정 간격(초)
+    """
+
+    def __init__(self, max_rss_mb: float = 512.0, max_cpu_percent: float = 150.0, cpu_grace_samples: int = 4,
+                 max_seconds: float = 180.0, max_pages: int = 1, max_recycles: int = 1, interval: float = 0.5):
+        self.max_rss_mb = max_rss_mb
+        self.max_cpu_percent = max_cpu_percent
+        self.cpu_grace_samples = cpu_grace_samples
+        self.max_seconds = max_seconds
+        self.max_pages = max_pages
+        self.max_recycles = max_recycles
+        self.interval = interval
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+# --- /proc 측정 ---
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def available() -> bool:
+    return Path("/proc/self/stat").exists()
+
+
+def _read_stat(pid: int) -> tuple[int, int, int] | None:
+    """(ppid, CPU 틱(user+system), RSS 바이트)를 반환합니다. 프로세스가 사라졌으면 None입니다."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # 프로세스 이름(두 번째 필드)에 공백이나 괄호가 있을 수 있으므로 마지막 ')' 뒤부터 나눕니다.
+    fields = data[data.rindex(b")") + 2:].split()
+    return int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21]) * _PAGE_SIZE
+
+
+def process_rss(pid: int) -> int:
+    """프로세스 하나의 RSS(바이트)를 반환합니다. 프로세스가 사라졌으면 0입니다."""
+    stat = _read_stat(pid)
+    return stat[2] if stat else 0
+
+
+def descendants(root: int) -> list[int]:
+    """root의 모든 자손 프로세스 pid를 반환합니다. (root 자신은 빼고)"""
+    children = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        stat = _read_stat(int(entry.name))
+        if stat:
+            children.setdefault(stat[0], []).append(int(entry.name))
+    result, stack = [], [root]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            result.append(child)
+            stack.append(child)
+    return result
+
+
+def sample_tree(root: int) -> tuple[int, int, int]:
+    """root 자손 프로세스들의 (프로세스 수, CPU 틱 합, RSS 합)을 반환합니다."""
+    count = ticks = rss = 0
+    for pid in descendants(root):
+        stat = _read_stat(pid)
+        if stat:
+            count += 1
+            ticks += stat[1]
+            rss += stat[2]
+    return count, ticks, rss
+
+
+class ResourceMonitor:
+    """브라우저 프로세스 트리를 주기적으로 재고, 한도를 넘으면 breached 이벤트를 세웁니다."""
+
+    def __init__(self, limits: ResourceLimits, root: int | None = None, started: float | None = None):
+        self.limits = limits
+        self.root = root or os.getpid()
+        self.started = started or time.monotonic()
+        self.samples = []
+        self.breach = None
+        self.breached = asyncio.Event()
+        self._task = None
+        self._over_cpu = 0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _trip(self, reason: str, value: float):
+        self.breach = {"at_s": round(time.monotonic() - self.started, 2), "reason": reason, "value": value}
+        self.breached.set()
+
+    async def _run(self):
+        attempt_started = time.monotonic()
+        last_ticks, last_time = None, None
+        while True:
+            now = time.monotonic()
+            if available():
+                procs, ticks, rss = await asyncio.to_thread(sample_tree, self.root)
+                cpu = None
+                if last_ticks is not None and now > last_time:
+                    cpu = max(0.0, (ticks - last_ticks) / _CLK_TCK / (now - last_time) * 100)
+                last_ticks, last_time = ticks, now
+                rss_mb = rss / 1024 / 1024
+                self.samples.append({
+                    "t": round(now - self.started, 2), "procs": procs,
+                    "rss_mb": round(rss_mb, 1), "cpu_percent": None if cpu is None else round(cpu, 1),
+                })
+                if rss_mb > self.limits.max_rss_mb:
+                    self._trip("rss", round(rss_mb, 1))
+                    return
+                self._over_cpu = self._over_cpu + 1 if cpu is not None and cpu > self.limits.max_cpu_percent else 0
+                if self._over_cpu >= self.limits.cpu_grace_samples:
+                    self._trip("cpu", round(cpu, 1))
+                    return
+            if now - attempt_started > self.limits.max_seconds:
+                self._trip("time", round(now - attempt_started, 1))
+                return
+            await asyncio.sleep(self.limits.interval)
+
+
+# --- 제한 실행 ---
+
+def summarize(samples: list) -> dict:
+    """측정값들의 최댓값과 평균을 요약합니다."""
+    rss = [s["rss_mb"] for s in samples]
+    cpu = [s["cpu_percent"] for s in samples if s["cpu_percent"] is not None]
+    return {
+        "peak_rss_mb": max(rss, default=None),
+        "peak_cpu_percent": max(cpu, default=None),
+        "mean_cpu_percent": round(sum(cpu) / len(cpu), 1) if cpu else None,
+        "peak_procs": max((s["procs"] for s in samples), default=None),
+    }
+
+
+async def run_governed(pool, open_context, sources: list, now: datetime, fast: bool,
+                       limits: ResourceLimits) -> tuple[dict, dict, dict]:
+    """
+    run_sources()를 자원 한도 안에서 실행해 (식당 데이터, 원본 캡처, 자원 보고서)를 반환합니다.
+    open_context는 HAR 연결까지 마친 브라우저 컨텍스트를 빌려주는 async context manager 함수입니다.
+    한도를 넘으면 pool.restart()로 브라우저를 새로 띄워 아직 끝나지 않은 식당만 다시 시도합니다.
+    """
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "limits": limits.to_dict(),
+        "launch_args": list(pool.launch_args),
+        "measured": available(),
+        "attempts": 0,
+        "recycles": 0,
+        "breaches": [],
+        "aborted": [],
+    }
+    samples = []
+    started = time.monotonic()
+    places, captures = {}, {}
+    pending = list(sources)
+
+    while pending:
+        report["attempts"] += 1
+        monitor = ResourceMonitor(limits, started=started)
+        semaphore = asyncio.Semaphore(limits.max_pages)
+
+        async with open_context() as context:
+            async def run_one(source):
+                async with semaphore:
+                    place, capture = await menu_sources.run_sources(context, [source], now, fast, max_pages=1)
+                places.update(place)
+                captures.update(capture)
+                pending.remove(source)
+
+            monitor.start()
+            work = asyncio.ensure_future(asyncio.gather(*(run_one(s) for s in list(pending))))
+            breached = asyncio.ensure_future(monitor.breached.wait())
+            await asyncio.wait({work, breached}, return_when=asyncio.FIRST_COMPLETED)
+            await monitor.stop()
+            breached.cancel()
+            if not work.done():
+                work.cancel()
+                try:
+                    await work
+                except asyncio.CancelledError:
+                    pass
+        samples.extend(monitor.samples)
+
+        if not monitor.breach or not pending:
+            break
+        report["breaches"].append({**monitor.breach, "pending": [s.key for s in pending]})
+        print(f"  ⚠️  자원 한도 초과 ({monitor.breach['reason']}={monitor.breach['value']}), "
+              f"남은 식당: {', '.join(s.key for s in pending)}")
+        if report["recycles"] >= limits.max_recycles:
+            for source in pending:
+                places[source.key] = source.place_info()
+                captures[source.key] = {"closed": False, "raw": [], "error": f"자원 한도 초과: {monitor.breach['reason']}"}
+            report["aborted"] = [s.key for s in pending]
+            break
+        report["recycles"] += 1
+        await pool.restart()
+
+    report["duration_s"] = round(time.monotonic() - started, 2)
+    report["summary"] = summarize(samples)
+    report["samples"] = samples
+    # 결과 식당 순서는 등록 순서를 따릅니다.
+    order = [s.key for s in sources]
+    return ({k: places[k] for k in order if k in places},
+            {k: captures[k] for k in order if k in captures},
+            report)
+
+
+def save_report(report: dict, report_dir: Path = REPORT_DIR) -> Path:
+    """자원 보고서를 reports/resources/<시작 시각>.json으로 저장합니다."""
+    report_dir.mkdir(parents=True, exist_ok=True)
+    path = report_dir / f"{report['started_at'].replace(':', '').replace('-', '')}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
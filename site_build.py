@@ -0,0 +1,255 @@
+# site_build.py
+#
+# 정적 사이트 생성기.
+# index.html을 페이지 틀로 삼아 메뉴 카드를 서버 쪽에서 미리 그려 넣은 HTML을 만듭니다.
+# 자바스크립트 없이도 메뉴가 보이고, 자바스크립트가 켜져 있으면 미리 그린 카드를 그대로 이어받아
+# 버전이 바뀐 카드만 다시 그립니다. FastAPI 서버 없이 아무 정적 호스트/CDN에서 그대로 서비스할 수 있습니다.
+#
+# 만드는 파일 (기본 출력: site/)
+#   index.html                    : 오늘 메뉴 (menus.json)
+#   days/<날짜>/index.html         : 그날의 모든 식당
+#   days/<날짜>/<식당키>.html       : 그날의 한 식당
+#   sw.js, menus.json, menus/, history/<날짜>.json : 페이지가 다른 날짜/갱신을 받을 때 쓰는 데이터
+# HTML은 공백을 줄여(minify) 쓰고, 옆에 .gz(와 brotli가 있으면 .br)로 미리 압축한 파일도 둡니다.
+#
+# 사용 예:
+#   python site_build.py                       # 기록 전체
+#   python site_build.py --from 2025-10-01 --out public
+
+import argparse
+import gzip
+import html
+import json
+import re
+from datetime import date
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 .gz만 만듭니다.
+    brotli = None
+
+import menu_split
+import menu_store
+
+ROOT_DIR = Path(__file__).resolve().parent
+TEMPLATE_PATH = ROOT_DIR / "index.html"
+SITE_DIR = ROOT_DIR / "site"
+
+# 미리 압축해 둘 파일 확장자
+COMPRESS_SUFFIXES = (".html", ".json", ".js")
+# 이보다 작은 파일은 압축해도 이득이 거의 없습니다.
+MIN_COMPRESS_BYTES = 512
+
+MEAL_CLASSES = {"조식": "breakfast", "중식": "lunch", "석식": "dinner"}
+WEEKDAYS = "월화수목금토일"
+
+
+# --- 카드 렌더링 (index.html의 createRestaurantCard/createMenuSection과 같은 마크업) ---
+
+def _div(class_name: str, content: str) -> str:
+    return f'<div class="{class_name}">{content}</div>'
+
+
+def render_menu_section(menu: dict) -> str:
+    items = menu.get("items", [])
+    main = items[0] if items else {"name": "메뉴 정보 없음"}
+    meal = menu.get("meal") or ""
+
+    details = _div("menu-name", html.escape(main.get("name") or ""))
+    if main.get("name_en"):
+        details += _div("menu-name-en", html.escape(main["name_en"]))
+    main_menu = _div("menu-details", details)
+    # 'rating' 데이터를 가격으로 변환합니다 (예: 5 -> 5,000원)
+    if main.get("rating"):
+        main_menu += _div("price", f"<span>{round(main['rating'] * 1000):,}원</span>")
+
+    section = _div("corner-header",
+                   _div("corner-name", html.escape(menu.get("corner") or ""))
+                   + _div(f"pill meal-badge {MEAL_CLASSES.get(meal, 'lunch')}", html.escape(meal)))
+    section += _div("main-menu", main_menu)
+    if len(items) > 1:
+        pills = "".join(f'<span class="pill">{html.escape(item.get("name") or "")}</span>' for item in items[1:])
+        section += _div("side-items-container", pills)
+    return _div("menu-section", section)
+
+
+def render_card(key: str, place: dict, version: str) -> str:
+    menus = place.get("menus", [])
+    if menus:
+        body = "".join(render_menu_section(menu) for menu in menus)
+    else:
+        body = _div("status-container", "오늘은 운영하지 않습니다.")
+    header = (_div("restaurant-name", html.escape(place.get("name") or ""))
+              + _div("restaurant-location", html.escape(f"{place.get('building')} {place.get('location_detail')}")))
+    return (f'<div class="restaurant-card" data-place="{html.escape(key)}" data-version="{html.escape(version)}">'
+            f'{_div("restaurant-header", header)}{_div("restaurant-body", body)}</div>')
+
+
+def format_date(day: str) -> str:
+    """index.html의 toLocaleDateString('ko-KR')과 같은 형식 (예: 2025년 10월 16일 목요일)"""
+    d = date.fromisoformat(day)
+    return f"{d.year}년 {d.month}월 {d.day}일 {WEEKDAYS[d.weekday()]}요일"
+
+
+# --- 페이지 ---
+
+def _replace_once(page: str, old: str, new: str) -> str:
+    if old not in page:
+        raise ValueError(f"index.html에서 다음 부분을 찾을 수 없습니다: {old}")
+    return page.replace(old, new, 1)
+
+
+def render_page(template: str, snapshot: dict, place_key: str | None = None, depth: int = 0) -> str:
+    """
+    index.html 틀에 snapshot의 카드를 미리 그려 넣은 페이지를 만듭니다.
+    place_key를 주면 그 식당만 그립니다. depth는 사이트 루트로부터의 디렉터리 깊이입니다.
+    카드 버전은 menus/index.json과 같게 매겨, 페이지를 연 뒤 바뀌지 않은 카드는 다시 그리지 않게 합니다.
+    """
+    day = snapshot["date"]
+    places = snapshot.get("places", {})
+    if place_key:
+        places = {place_key: places[place_key]}
+
+    cards = "".join(
+        render_card(key, place, menu_split.place_version(place))
+        for key, place in places.items()
+    )
+
+    meta = f'<meta name="menu-date" content="{day}">'
+    if place_key:
+        meta += f'\n  <meta name="menu-place" content="{html.escape(place_key)}">'
+    if depth:
+        # 하위 디렉터리의 페이지도 ./menus/, ./sw.js 같은 상대 경로가 사이트 루트를 가리키게 합니다.
+        meta += f'\n  <base href="{"../" * depth}">'
+
+    title = format_date(day)
+    if place_key:
+        title = f"{places[place_key].get('name')} · {title}"
+
+    page = _replace_once(template, '<meta name="menu-api" content="">',
+                         f'<meta name="menu-api" content="">\n  {meta}')
+    page = re.sub(r"<title>(.*?)</title>", lambda m: f"<title>{html.escape(title)} - {m.group(1)}</title>", page, count=1)
+    page = _replace_once(page, '<div class="date-info" id="dateInfo"></div>',
+                         f'<div class="date-info" id="dateInfo">{format_date(day)}</div>')
+    page = _replace_once(page, '<div id="statusContainer" class="status-container">',
+                         '<div id="statusContainer" class="status-container" style="display: none;">')
+    page = _replace_once(page, '<div id="restaurantGrid" class="restaurant-grid" style="display: none;"></div>',
+                         f'<div id="restaurantGrid" class="restaurant-grid">{cards}</div>')
+    return page
+
+
+# --- 압축 ---
+
+_RAW_BLOCK_RE = re.compile(r"(<(script|style)\b[^>]*>.*?</\2>)", re.S | re.I)
+
+
+def minify_html(page: str) -> str:
+    """
+    태그 사이 공백과 들여쓰기를 없앱니다.
+    <script>/<style> 안은 줄 구조를 그대로 두고 들여쓰기와 빈 줄만 지워 자동 세미콜론 삽입이 바뀌지 않게 합니다.
+    '//'로 시작하는 줄도 문자열이나 정규식의 일부일 수 있으므로 지우지 않습니다.
+    """
+    parts = _RAW_BLOCK_RE.split(page)
+    out = []
+    # split 결과는 [본문, 블록 전체, 태그 이름, 본문, ...] 순서입니다.
+    for i in range(0, len(parts), 3):
+        text = re.sub(r">\s+<", "><", parts[i])
+        out.append(re.sub(r"\s{2,}", " ", text))
+        if i + 1 < len(parts):
+            lines = (line.strip() for line in parts[i + 1].splitlines())
+            out.append("\n".join(line for line in lines if line))
+    return "".join(out).strip()
+
+
+def write_file(path: Path, data: bytes) -> Path:
+    """
+    파일과 미리 압축한 변형(.gz, .br)을 씁니다. 내용이 같은 파일은 다시 쓰지 않습니다.
+    압축하지 않는 경우에는 예전에 만든 .gz/.br을 지워, 정적 호스트(gzip_static 등)가 옛 내용을 보내지 않게 합니다.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists() and path.read_bytes() == data:
+        return path
+    path.write_bytes(data)
+    gz_path = path.with_name(path.name + ".gz")
+    br_path = path.with_name(path.name + ".br")
+    compress = path.suffix in COMPRESS_SUFFIXES and len(data) >= MIN_COMPRESS_BYTES
+    if compress:
+        # mtime=0으로 두어 내용이 같으면 .gz도 바이트 단위로 같게 합니다.
+        gz_path.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    else:
+        gz_path.unlink(missing_ok=True)
+    if compress and brotli is not None:
+        br_path.write_bytes(brotli.compress(data, quality=11))
+    else:
+        br_path.unlink(missing_ok=True)
+    return path
+
+
+def _write_page(path: Path, page: str, minify: bool):
+    write_file(path, (minify_html(page) if minify else page).encode("utf-8"))
+
+
+def _copy(src: Path, dest: Path):
+    if src.exists():
+        write_file(dest, src.read_bytes())
+
+
+# --- 빌드 ---
+
+def build(site_dir: Path = SITE_DIR, start: date | None = None, end: date | None = None,
+          today_path: Path = ROOT_DIR / "menus.json", minify: bool = True) -> dict:
+    """
+    오늘 페이지와 기간 내 날짜/식당별 페이지, 페이지가 쓰는 데이터 파일을 site_dir에 씁니다.
+    스크래퍼는 매 실행 뒤 그날만 다시 만들도록 start=end=오늘로 부릅니다.
+    """
+    template = TEMPLATE_PATH.read_text(encoding="utf-8")
+    pages = 0
+
+    if today_path.exists():
+        with open(today_path, "r", encoding="utf-8") as f:
+            today = json.load(f)
+        _write_page(site_dir / "index.html", render_page(template, today), minify)
+        pages += 1
+        _copy(today_path, site_dir / "menus.json")
+        split_dir = today_path.parent / "menus"
+        names = {path.name for path in split_dir.glob("*.json")}
+        for name in names:
+            _copy(split_dir / name, site_dir / "menus" / name)
+        # 목차에서 빠진 식당의 파일은 사이트에서도 지웁니다.
+        for path in (site_dir / "menus").glob("*.json*"):
+            if path.name.split(".json")[0] + ".json" not in names:
+                path.unlink()
+    _copy(ROOT_DIR / "sw.js", site_dir / "sw.js")
+
+    days = 0
+    for snapshot in menu_store.iter_snapshots(start, end, use_cache=False):
+        day = snapshot["date"]
+        day_dir = site_dir / "days" / day
+        _write_page(day_dir / "index.html", render_page(template, snapshot, depth=2), minify)
+        for key in snapshot.get("places", {}):
+            _write_page(day_dir / f"{key}.html", render_page(template, snapshot, key, depth=2), minify)
+            pages += 1
+        _copy(menu_store.snapshot_path(day), site_dir / "history" / f"{day}.json")
+        pages += 1
+        days += 1
+
+    return {"site_dir": str(site_dir), "days": days, "pages": pages}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="메뉴를 미리 그린 정적 사이트를 만듭니다.")
+    arg_parser.add_argument("--from", dest="start", type=date.fromisoformat, default=None)
+    arg_parser.add_argument("--to", dest="end", type=date.fromisoformat, default=None)
+    arg_parser.add_argument("--out", type=Path, default=SITE_DIR, help="출력 디렉터리 (기본: site/)")
+    arg_parser.add_argument("--no-minify", action="store_true", help="HTML 공백을 줄이지 않음")
+    args = arg_parser.parse_args()
+
+    stats = build(args.out, args.start, args.end, minify=not args.no_minify)
+    print(f"✅ {stats['days']}일치, 페이지 {stats['pages']}개를 {stats['site_dir']}에 만들었습니다.")
+    if brotli is None:
+        print("  (brotli가 설치되어 있지 않아 .br 파일은 만들지 않았습니다. pip install brotli)")
+
+
+if __name__ == "__main__":
+    main()
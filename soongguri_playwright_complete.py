@@ -1,28 +1,43 @@
 # soongguri_playwright_complete.py (수정된 전체 코드)
 
-import json
-import re
-from datetime import datetime
+import argparse
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from datetime import date, datetime
 from dateutil import tz
-from playwright.sync_api import sync_playwright, Page
 from pathlib import Path
 
+import browser_pool
+import dish_index
+import har_capture
+import menu_cache
+import menu_calendar
+import menu_changes
+import menu_json
+import menu_parquet
+import menu_sources
+import menu_split
+import menu_store
+import menu_subscriptions
+import resource_governor
+import site_build
+# 기존 코드와의 호환을 위해 파서를 이 모듈에서도 가져올 수 있게 둡니다.
+from menu_parsers import parse_dodam_corner, parse_students_corner  # noqa: F401
+
 # --- 상수 정의 ---
 
 # 시간대 설정
 KST = tz.gettz("Asia/Seoul")
 
-# 식당 정보 (기숙사 식당 포함)
-TARGETS = [
-    {"key": "students", "label": "학생식당", "building": "학생회관", "location_detail": "2층"},
-    {"key": "dodam", "label": "숭실도담식당", "building": "숭실도담", "location_detail": "생활관 1층"},
-    {"key": "foodcourt", "label": "푸드코트", "building": "신양관", "location_detail": "1층"},
-    {"key": "dorm", "label": "기숙사 식당", "building": "레지던스 홀", "location_detail": "B1층"},
-]
-
-SOONGGURI_URL = "https://soongguri.com/m/"
-DORM_URL = "https://ssudorm.ssu.ac.kr:444/SShostel/mall_main.php?viewform=B0001_foodboard_list&board_no=1"
+# 식당 정보는 menu_sources.py의 소스 플러그인에 있습니다.
+SOONGGURI_URL = menu_sources.SOONGGURI_URL
+DORM_URL = menu_sources.DORM_URL
 OUT_PATH = Path(__file__).resolve().parent / "menus.json"
+# 재생 결과는 지난 메뉴이므로 서비스 중인 menus.json을 덮어쓰지 않도록 따로 씁니다.
+REPLAY_OUT_PATH = har_capture.CAPTURE_DIR / "replay" / "menus.json"
+
+USER_AGENT = "Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1"
 
 
 # --- 유틸리티 함수 ---
@@ -32,239 +47,216 @@ def _now_kr_iso():
     return datetime.now(tz=KST).isoformat(timespec="seconds")
 
 
-# --- soongguri.com 파싱 함수 (기존과 동일) ---
-
-def parse_students_corner(text: str) -> dict:
-    """학생식당 형식 파싱: [코너명] ★ 메뉴 - 별점"""
-    lines = text.strip().split('\n')
-    corner_name = None
-    menu_name = None
-    menu_name_en = None
-    rating = None
-    side_items = []
-    current_meal = "중식"
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        if line.startswith('[') and line.endswith(']'):
-            corner_name = line[1:-1]
-            if '천원의아침밥' in corner_name:
-                current_meal = "조식"
-        elif '★' in line and '-' in line:
-            parts = line.split('★')[1].strip()
-            if '-' in parts:
-                name_part, rating_part = parts.rsplit('-', 1)
-                menu_name = name_part.strip()
-                try:
-                    rating = float(rating_part.strip())
-                except ValueError:
-                    rating = None
-        elif line and len(line) > 5 and line[0].isupper() and ' ' in line and not line.startswith('*'):
-            alpha_count = sum(1 for c in line if c.isalpha())
-            if alpha_count / len(line) > 0.5:
-                menu_name_en = line
-        elif line.startswith('*'):
-            continue
-        elif len(line) < 30 and not menu_name_en:
-            if menu_name and corner_name:
-                side_items.append(line)
-
-    if corner_name and menu_name:
-        items = [{"name": menu_name, "name_en": menu_name_en, "rating": rating}]
-        for side in side_items:
-            items.append({"name": side})
-        return {"meal": current_meal, "corner": corner_name, "items": items}
-    return None
-
-def parse_dodam_corner(text: str) -> dict:
-    """도담식당 형식 파싱: [코너명] ★ 메뉴1 ★ 메뉴2 ... 메뉴들- 별점"""
-    lines = text.strip().split('\n')
-    corner_name = None
-    menu_names = []
-    menu_name_en = None
-    rating = None
-    side_items = []
-    current_meal = "중식"
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        if line.startswith('[') and line.endswith(']'):
-            corner_name = line[1:-1]
-        elif line.startswith('★'):
-            menu_name = line.replace('★', '').strip()
-            if menu_name:
-                menu_names.append(menu_name)
-        elif '-' in line and any(char.isdigit() for char in line):
-            if '-' in line:
-                parts = line.rsplit('-', 1)
-                if len(parts) == 2:
-                    try:
-                        rating = float(parts[1].strip())
-                    except ValueError:
-                        pass
-        elif '(' in line and ')' in line and not line.startswith('*'):
-            menu_name_en = line.strip('()')
-        elif line.startswith('*'):
-            continue
-        elif len(line) < 30 and corner_name and menu_names:
-            if not line.startswith('★') and not '-' in line:
-                side_items.append(line)
-
-    if corner_name and menu_names:
-        main_menu_name = ' & '.join(menu_names)
-        items = [{"name": main_menu_name, "name_en": menu_name_en, "rating": rating}]
-        for side in side_items[:5]:
-            if side and not any(word in side for word in ['알러지', '원산지']):
-                items.append({"name": side})
-        return {"meal": current_meal, "corner": corner_name, "items": items}
-    return None
-
+# --- 메인 크롤링 함수 ---
+
+async def scrape_places(mode: str = "live", har_path: Path | None = None,
+                        places: list | None = None, pool: browser_pool.BrowserPool | None = None,
+                        limits: resource_governor.ResourceLimits | None = None,
+                        direct: bool = True, calendar: bool = True) -> tuple[dict, dict]:
+    """
+    등록된 소스 플러그인들을 동시에 실행해 (결과 dict, 식당별 원본 캡처)를 반환합니다. 파일은 저장하지 않습니다.
+    places를 주면 해당 식당만 스크랩합니다.
+    pool을 주면 그 브라우저 풀의 브라우저를 빌려 쓰고, 없으면 이번 실행용 풀을 만들어 쓴 뒤 닫습니다.
+    limits를 주면 자원 제한 모드로 실행하고 자원 사용 보고서를 남깁니다. (resource_governor.py)
+    direct가 True면 브라우저 없이 읽을 수 있는 식당(기숙사)은 HTTP 요청으로 먼저 읽고, 실패한 식당만 브라우저로 읽습니다.
+    calendar가 True면 휴무 달력(menu_calendar.py)에서 그날 쉬는 식당은 열어 보지 않고 휴무로 채웁니다.
+    """
+    now = datetime.now(tz=KST)
+    if mode == "replay":
+        # 재생 시에는 기록 당시 날짜를 기준으로 삼아야 결과가 항상 같습니다.
+        recorded = har_capture.recorded_at(har_path)
+        if recorded:
+            now = recorded.astimezone(KST)
+    fast = mode == "replay"
 
-# --- 기숙사 식당 크롤링 함수 (수정됨) ---
-
-def scrape_dorm_menu(page: Page) -> dict:
-    """기숙사 식당 메뉴를 크롤링하고 파싱합니다."""
-    dorm_target = next((t for t in TARGETS if t["key"] == "dorm"), None)
-    if not dorm_target:
-        return None
-
-    place_data = {
-        "name": dorm_target["label"],
-        "building": dorm_target.get("building"),
-        "location_detail": dorm_target.get("location_detail"),
-        "menus": []
+    result = {
+        "generated_at": _now_kr_iso(),
+        "date": now.strftime("%Y-%m-%d"),
+        "places": {}
     }
+    sources = menu_sources.get_sources(places)
+    order = [s.key for s in sources]
+    captures = {}
+
+    # 브라우저 없이 결과를 얻은 식당 (휴무 달력, 직접 요청)
+    ready_places, ready_captures = {}, {}
+    # HAR 기록/재생은 브라우저 요청만 다루므로 휴무 달력과 직접 요청은 실제 스크랩(live)에서만 씁니다.
+    if calendar and mode == "live":
+        for key, reason in menu_calendar.closed_places(order, now.date()).items():
+            print(f"  💤 [{key}] 휴무 달력에 따라 건너뜁니다: {reason}")
+            source = menu_sources.get_sources([key])[0]
+            ready_places[key] = source.place_info()
+            ready_captures[key] = {"closed": True, "raw": [], "reason": reason, "skipped": True}
+        sources = [s for s in sources if s.key not in ready_places]
+    if direct and mode == "live":
+        direct_places, direct_captures, sources = await menu_sources.run_direct(sources, now)
+        ready_places.update(direct_places)
+        ready_captures.update(direct_captures)
+    if not sources:
+        # 브라우저가 필요한 식당이 없으면 브라우저를 띄우지 않습니다.
+        result["places"] = {k: ready_places[k] for k in order}
+        return result, {k: ready_captures[k] for k in order}
+
+    own_pool = pool is None
+    if own_pool:
+        pool = (browser_pool.BrowserPool(max_contexts=1, launch_args=resource_governor.LOW_MEMORY_ARGS)
+                if limits else browser_pool.BrowserPool())
+
+    @asynccontextmanager
+    async def open_context():
+        # record 모드의 HAR 파일은 컨텍스트를 닫을 때(블록을 빠져나갈 때) 기록됩니다.
+        async with pool.context(viewport={"width": 390, "height": 844}, user_agent=USER_AGENT) as context:
+            await har_capture.attach(context, mode, har_path)
+            yield context
 
-    print(f"\n{dorm_target['label']} 크롤링 중...")
     try:
-        page.goto(DORM_URL, wait_until="networkidle", timeout=30000)
-        page.wait_for_timeout(2000)
-
-        # 오늘 요일 (월요일=0, ..., 일요일=6)
-        today_weekday = datetime.now(tz=KST).weekday()
-        # CSS nth-child는 1부터 시작. 첫 열이 '구분'이므로 +2
-        # (월: 0+2=2, 화: 1+2=3, ..., 일: 6+2=8)
-        today_col_index = today_weekday + 2
-
-        meal_types = {"조식": "조식", "중식": "중식", "석식": "석식"}
-        rows = page.locator(".ht_area tbody tr").all()
-
-        for row in rows:
-            meal_name = row.locator("td").first.inner_text().strip()
-            if meal_name in meal_types:
-                menu_cell = row.locator(f"td:nth-child({today_col_index})")
-
-                # inner_html을 사용하여 <br> 태그로 분리
-                cell_html = menu_cell.inner_html()
-
-                # HTML 태그 제거 및 공백 정리
-                menu_items_raw = re.split(r'\s*<br\s*/?>\s*', cell_html.strip())
-
-                # 비어있거나 특정 단어가 포함된 항목 제외
-                items = [
-                    {"name": item.strip()}
-                    for item in menu_items_raw
-                    if item.strip() and "운영없음" not in item and "휴무" not in item
-                ]
-
-                if items:
-                    place_data["menus"].append({
-                        "meal": meal_types[meal_name],
-                        "corner": "오늘의 메뉴",  # 기숙사는 코너가 없음
-                        "items": items
-                    })
-                    print(f"  ✓ [{meal_types[meal_name]}] {items[0]['name']} 등 {len(items)}개 메뉴 발견")
-
-        print(f"  ✅ 총 {len(place_data['menus'])}개 식사 수집 완료")
-        return place_data
-
+        if limits:
+            result["places"], captures, report = await resource_governor.run_governed(
+                pool, open_context, sources, now, fast, limits)
+            report_path = resource_governor.save_report(report)
+            summary = report["summary"]
+            print(f"📈 자원 보고서 저장: {report_path} "
+                  f"(최대 RSS {summary['peak_rss_mb']}MB, 최대 CPU {summary['peak_cpu_percent']}%)")
+        else:
+            async with open_context() as context:
+                result["places"], captures = await menu_sources.run_sources(context, sources, now, fast)
     except Exception as e:
-        print(f"  ✗ 기숙사 식당 크롤링 에러: {e}")
+        print(f"\n크롤링 전체 에러: {e}")
         import traceback
         traceback.print_exc()
-        return place_data
-
-
-# --- 메인 크롤링 함수 (기존과 동일) ---
-
-def scrape_today():
-    """soongguri.com과 기숙사 식당 메뉴를 모두 스크랩하여 JSON으로 저장합니다."""
-    result = {
-        "generated_at": _now_kr_iso(),
-        "date": datetime.now(tz=KST).strftime("%Y-%m-%d"),
-        "places": {}
-    }
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            viewport={"width": 390, "height": 844},
-            user_agent="Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1"
-        )
-        page = context.new_page()
-
-        try:
-            # 1. soongguri.com 크롤링
-            soongguri_targets = [t for t in TARGETS if t["key"] != "dorm"]
-            print("soongguri.com 페이지 접속 중...")
-            page.goto(SOONGGURI_URL, wait_until="networkidle", timeout=30000)
-            page.wait_for_timeout(3000)
-
-            for t in soongguri_targets:
-                place_data = {
-                    "name": t["label"], "building": t.get("building"),
-                    "location_detail": t.get("location_detail"), "menus": []
-                }
-                print(f"\n{t['label']} 크롤링 중...")
-                page.select_option('select[name="rest"]', label=t["label"])
-                page.wait_for_timeout(2000)
-
-                body_text = page.locator("body").inner_text()
-                if t["key"] == "foodcourt" and ("오늘은 쉽니다" in body_text or "휴무" in body_text):
-                    print("  ⚠️  오늘은 휴무입니다.")
-                else:
-                    try:
-                        page.wait_for_selector("td.menu_list", state="visible", timeout=5000)
-                        menu_cells = page.locator("td.menu_list").all()
-                        print(f"  발견된 메뉴 코너 수: {len(menu_cells)}")
-                        for idx, cell in enumerate(menu_cells):
-                            parser = parse_students_corner if t["key"] == "students" else parse_dodam_corner
-                            menu_info = parser(cell.inner_text())
-                            if menu_info:
-                                place_data["menus"].append(menu_info)
-                                print(f"  ✓ [{idx+1}] {menu_info['corner']}: {menu_info['items'][0]['name']}")
-                            else:
-                                print(f"  ⚠️  [{idx+1}] 파싱 실패")
-                    except Exception:
-                        print("  ⚠️  메뉴를 찾을 수 없습니다.")
-
-                result["places"][t["key"]] = place_data
-                print(f"  ✅ 총 {len(place_data['menus'])}개 메뉴 수집 완료")
-
-            # 2. 기숙사 식당 크롤링
-            dorm_data = scrape_dorm_menu(page)
-            if dorm_data:
-                result["places"]["dorm"] = dorm_data
-
-        except Exception as e:
-            print(f"\n크롤링 전체 에러: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            browser.close()
-
-    # 최종 JSON 저장
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    finally:
+        if own_pool:
+            await pool.close()
+
+    # 결과 식당 순서는 등록 순서를 따릅니다.
+    browser_places = result["places"]
+    result["places"] = {k: ready_places.get(k, browser_places.get(k)) for k in order
+                        if k in ready_places or k in browser_places}
+    captures = {k: ready_captures.get(k, captures.get(k)) for k in order if k in ready_captures or k in captures}
+    return result, captures
+
+
+def save_result(result: dict, captures: dict, out_path: Path = OUT_PATH, partial: bool = False,
+                record: bool = True) -> dict:
+    """
+    스크랩 결과를 menus.json(out_path)과 분할 파일로 쓰고, record가 True면 기록 저장소 등에도 남깁니다.
+    partial이 True면(일부 식당만 스크랩) 같은 날의 기존 기록에 합쳐 나머지 식당 메뉴를 잃지 않게 합니다.
+    실제로 저장한 결과를 반환합니다.
+    """
+    if partial and record:
+        # 일부 식당만 스크랩했다면 같은 날의 기존 기록에 덮어써서 나머지 식당 메뉴를 잃지 않게 합니다.
+        previous = menu_store.load_snapshot(result["date"])
+        if previous:
+            result["places"] = {**previous.get("places", {}), **result["places"]}
+
+    # 재생 결과는 기록용이 아니므로 메뉴 ID 사전에도 남기지 않습니다.
+    if record:
+        with dish_index.open_index() as index:
+            index.annotate(result)
+
+    change = None
+    if record:
+        # 모든 쓰기가 함께 쓰는 기준 스냅샷과 비교해 바뀐 코너만 다음 버전의 패치로 남기고,
+        # result에 버전을 넣습니다. (/api/changes)
+        change = menu_changes.publish(result)
+        if change:
+            print(f"🧩 변경 기록: 버전 {change['version']} (연산 {len(change['patch'])}개)")
+
+    # 최종 JSON 저장. 쓰는 도중 API가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(".json.tmp")
+    menu_json.dump(result, tmp_path, pretty=True)
+    os.replace(tmp_path, out_path)
+    # index.html이 목차부터 받아 식당별로 나눠 그릴 수 있도록 분할 파일도 씁니다.
+    split_path = menu_split.write_split(result, out_path.parent / "menus")
+    print(f"🗂️ 식당별 분할 파일 저장: {split_path.parent}")
+
+    # 재생 결과는 기록용이 아니므로 날짜별 기록 저장소에는 남기지 않습니다.
+    if record:
+        history_path = menu_store.save_snapshot(result)
+        print(f"📚 기록 저장: {history_path}")
+        # 파서를 고친 뒤 과거 기록을 다시 만들 수 있도록 원본도 함께 보관합니다. (menu_reparse.py)
+        menu_store.save_raw_capture(result, captures)
+        # 페이지에서 명시적인 휴무 안내를 본 식당은 같은 날 다시 스크랩할 때 건너뛰도록 기록하고,
+        # (강제로 다시 스크랩해) 열려 있는 것을 확인한 식당은 예전 휴무 기록을 지웁니다.
+        menu_calendar.record_observed(result["date"], {
+            k: c["notice"] for k, c in captures.items() if c.get("closed") and c.get("notice")
+        })
+        menu_calendar.clear_observed(result["date"], [
+            k for k, c in captures.items() if not c.get("closed") and not c.get("error")
+        ])
+        if menu_parquet.available():
+            parquet_path = menu_parquet.append_snapshot(result)
+            print(f"📊 분석용 Parquet 저장: {parquet_path}")
+        # 정적 호스트에서 바로 서비스할 수 있도록 그날 페이지를 미리 그려 둡니다. (site_build.py)
+        day = date.fromisoformat(result["date"])
+        site = site_build.build(start=day, end=day, today_path=out_path)
+        print(f"🌐 정적 사이트 갱신: {site['site_dir']} (페이지 {site['pages']}개)")
+    # 공유 캐시를 쓰는 API 노드들이 새 메뉴를 다시 읽도록 알립니다. (SSU_DINING_CACHE_URL이 없으면 아무것도 안 함)
+    # 재생 결과는 서비스할 메뉴가 아니므로 알리지 않습니다.
+    if record and menu_cache.publish_invalidation({"generated_at": result.get("generated_at"), "date": result.get("date"),
+                                        "places": list(result["places"]),
+                                        "version": change["version"] if change else None}):
+        print("📣 캐시 무효화 알림 전송")
+    if change:
+        # 그날의 모든 코너를 구독과 맞춰 보고, 이미 알린 (구독, 날짜, 식당, 식사, 메뉴)는 빼고 대기열에 넣습니다.
+        # 실제 전달은 API 서버나 `python menu_subscriptions.py deliver`가 저장과 따로 합니다.
+        stats = menu_subscriptions.notify(result)
+        if stats["queued"]:
+            print(f"🔔 메뉴 알림: 구독 {stats['queued']}건을 보낼 목록에 넣었습니다.")
+    return result
+
+
+def scrape_today(mode: str = "live", har_path: Path | None = None, out_path: Path | None = None,
+                 places: list | None = None, limits: resource_governor.ResourceLimits | None = None,
+                 direct: bool = True, calendar: bool = True):
+    """
+    soongguri.com과 기숙사 식당 메뉴를 모두 스크랩하여 JSON으로 저장합니다.
+    mode가 "record"이면 받은 응답을 har_path에 기록하고,
+    "replay"이면 네트워크 없이 har_path에 기록된 응답만으로 스크랩합니다.
+    out_path를 생략하면 menus.json(OUT_PATH)에, 재생이면 REPLAY_OUT_PATH에 씁니다.
+    재생 결과는 기록 저장소, 변경 기록, 캐시 무효화 알림, 구독 알림에 남기지 않습니다.
+    """
+    if out_path is None:
+        out_path = REPLAY_OUT_PATH if mode == "replay" else OUT_PATH
+    result, captures = asyncio.run(scrape_places(mode, har_path, places, limits=limits, direct=direct,
+                                                   calendar=calendar))
+    save_result(result, captures, out_path, partial=bool(places), record=mode != "replay")
 
     total_menus = sum(len(p.get('menus', [])) for p in result['places'].values())
-    print(f"\n✅ 저장 완료: {OUT_PATH}")
+    print(f"\n✅ 저장 완료: {out_path}")
     print(f"총 {total_menus}개의 메뉴가 수집되었습니다.")
 
 if __name__ == "__main__":
-    scrape_today()
\ No newline at end of file
+    arg_parser = argparse.ArgumentParser(description="숭실대 학식 메뉴 스크래퍼")
+    group = arg_parser.add_mutually_exclusive_group()
+    group.add_argument("--record", nargs="?", const="", metavar="HAR",
+                       help="받은 응답을 HAR로 기록 (기본: captures/<오늘>.har)")
+    group.add_argument("--replay", metavar="HAR", help="네트워크 없이 기록된 HAR로 스크랩")
+    arg_parser.add_argument("--out", type=Path, default=None,
+                            help="결과 JSON 경로 (기본: menus.json, --replay면 captures/replay/menus.json)")
+    arg_parser.add_argument("--places", default=None,
+                            help="쉼표로 구분한 식당 키만 스크랩 (예: students,dorm)")
+    arg_parser.add_argument("--browser-only", action="store_true",
+                            help="기숙사 식단도 HTTP 요청 대신 브라우저로 읽기")
+    arg_parser.add_argument("--ignore-calendar", action="store_true",
+                            help="휴무 달력과 상관없이 모든 식당을 스크랩")
+    arg_parser.add_argument("--governed", action="store_true",
+                            help="자원 제한 모드: 저메모리 옵션, 페이지 수 제한, RSS/CPU 측정과 보고서")
+    arg_parser.add_argument("--max-rss-mb", type=float, default=512.0, help="자원 제한 모드의 브라우저 RSS 한도 (MB)")
+    arg_parser.add_argument("--max-cpu", type=float, default=150.0, help="자원 제한 모드의 브라우저 CPU 한도 (%%)")
+    arg_parser.add_argument("--max-pages", type=int, default=1, help="자원 제한 모드의 동시 페이지 수")
+    args = arg_parser.parse_args()
+    places = [p.strip() for p in args.places.split(",") if p.strip()] if args.places else None
+    limits = (resource_governor.ResourceLimits(max_rss_mb=args.max_rss_mb, max_cpu_percent=args.max_cpu,
+                                               max_pages=args.max_pages)
+              if args.governed else None)
+
+    if args.replay:
+        scrape_today("replay", Path(args.replay), args.out, places, limits)
+    elif args.record is not None:
+        har = Path(args.record) if args.record else har_capture.default_har_path(datetime.now(tz=KST).strftime("%Y-%m-%d"))
+        scrape_today("record", har, args.out, places, limits)
+    else:
+        scrape_today(out_path=args.out, places=places, limits=limits, direct=not args.browser_only,
+                     calendar=not args.ignore_calendar)
\ No newline at end of file
@@ -0,0 +1,121 @@
+// sw.js
+//
+// 웹 페이지용 서비스 워커.
+// - 설치할 때 페이지 뼈대(index.html)를 미리 캐시해 두어 네트워크가 없어도 바로 뜨게 합니다.
+//   미리 그린 다른 페이지(days/<날짜>/...)는 뼈대로 대신하지 않고, 한 번 연 페이지를 그 주소로 캐시해 둡니다.
+// - 메뉴 데이터(menus.json, menus/index.json, history/, /api/...)는 stale-while-revalidate로 다룹니다.
+//   캐시된 마지막 응답을 즉시 돌려주고, 뒤에서 조건부 요청(If-None-Match)으로 다시 확인합니다.
+//   서버가 304를 주면 본문은 다시 받지 않습니다.
+//   ETag(없으면 Last-Modified)가 바뀌었으면 캐시를 교체하고 페이지에 'menus-updated' 메시지를 보냅니다.
+// - 버전이 붙은 식당 파일(menus/<식당키>.json?v=...)은 내용이 바뀌지 않으므로 캐시에 있으면 네트워크에 묻지 않습니다.
+//
+// 페이지 뼈대를 바꿨다면 SHELL_VERSION을 올려 새 뼈대를 받게 합니다.
+
+const SHELL_VERSION = 'v2';
+const SHELL_CACHE = `shell-${SHELL_VERSION}`;
+const DATA_CACHE = 'menus';
+const SHELL_FILES = ['./', './index.html'];
+const SHELL_PATHS = new Set(SHELL_FILES.map(file => new URL(file, self.location).pathname));
+
+// stale-while-revalidate로 다룰 메뉴 데이터 경로
+const DATA_PATTERNS = [/\/menus\.json$/, /\/menus\/index\.json$/, /\/history\/[^/]+\.json$/, /\/api\/(today|week|range)$/];
+const VERSIONED_PLACE = /\/menus\/[^/]+\.json$/;
+
+self.addEventListener('install', event => {
+  event.waitUntil(
+    caches.open(SHELL_CACHE)
+      .then(cache => cache.addAll(SHELL_FILES))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil(
+    caches.keys()
+      .then(keys => Promise.all(
+        keys.filter(key => key.startsWith('shell-') && key !== SHELL_CACHE).map(key => caches.delete(key))
+      ))
+      .then(() => self.clients.claim())
+  );
+});
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  if (request.method !== 'GET') return;
+  const url = new URL(request.url);
+
+  if (request.mode === 'navigate' && url.origin === self.location.origin) {
+    event.respondWith(servePage(event, request, url));
+  } else if (VERSIONED_PLACE.test(url.pathname) && url.searchParams.has('v')) {
+    event.respondWith(serveVersioned(request, url));
+  } else if (DATA_PATTERNS.some(pattern => pattern.test(url.pathname))) {
+    event.respondWith(staleWhileRevalidate(event, request));
+  }
+});
+
+function versionOf(response) {
+  return response.headers.get('ETag') || response.headers.get('Last-Modified');
+}
+
+// 페이지는 캐시된 것을 먼저 내주고 뒤에서 새로 받아 둡니다. 캐시 키는 쿼리를 뺀 페이지 주소입니다.
+// 뼈대(./, ./index.html)만 서로를 대신할 수 있고, 다른 페이지는 자기 주소로 캐시된 것만 씁니다.
+async function servePage(event, request, url) {
+  const cache = await caches.open(SHELL_CACHE);
+  const key = url.origin + url.pathname;
+  let cached = await cache.match(key);
+  if (!cached && SHELL_PATHS.has(url.pathname)) cached = await cache.match('./index.html');
+  const network = fetch(request).then(response => {
+    if (response.ok) cache.put(key, response.clone());
+    return response;
+  });
+  if (cached) {
+    event.waitUntil(network.catch(() => {}));
+    return cached;
+  }
+  return network;
+}
+
+async function serveVersioned(request, url) {
+  const cache = await caches.open(DATA_CACHE);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+
+  const response = await fetch(request);
+  if (response.ok) {
+    // 같은 식당의 이전 버전은 더 쓰지 않으므로 지웁니다.
+    const keys = await cache.keys();
+    await Promise.all(keys
+      .filter(key => new URL(key.url).pathname === url.pathname)
+      .map(key => cache.delete(key)));
+    await cache.put(request, response.clone());
+  }
+  return response;
+}
+
+async function staleWhileRevalidate(event, request) {
+  const cache = await caches.open(DATA_CACHE);
+  const cached = await cache.match(request);
+
+  // 'no-cache'로 보내면 브라우저가 HTTP 캐시의 ETag로 조건부 요청을 보냅니다.
+  const network = fetch(request, { cache: 'no-cache' }).then(async response => {
+    if (response.ok) {
+      const changed = cached && versionOf(cached) !== versionOf(response);
+      await cache.put(request, response.clone());
+      if (changed) await notifyClients(request.url);
+    }
+    return response;
+  });
+
+  if (cached) {
+    event.waitUntil(network.catch(() => {}));
+    return cached;
+  }
+  return network;
+}
+
+async function notifyClients(url) {
+  const clients = await self.clients.matchAll({ type: 'window' });
+  for (const client of clients) {
+    client.postMessage({ type: 'menus-updated', url });
+  }
+}
@@ -0,0 +1,246 @@
+# conftest.py
+#
+# 스크랩 성능 회귀 테스트의 공용 픽스처.
+#   - fixture_server: 저장해 둔 soongguri/기숙사 페이지를 돌려주는 로컬 HTTP 서버 (요청마다 지연을 넣을 수 있음)
+#   - perf: 실행 한 번의 벽시계 시간, 서버 왕복 수, 최대 메모리를 재고 tests/baselines.json과 비교
+#
+# 기준값 갱신: python -m pytest tests --update-baselines
+# 기준값이 없는 경우는 처음 측정한 값을 tests/baselines.json에 기록하고 건너뜁니다(skip).
+# 기준값은 측정한 기계마다 다르므로, 새 경우를 추가했거나 브라우저 테스트(full_pipeline)를 처음 돌린 기계에서는
+# 이렇게 기록된 baselines.json을 확인해 커밋합니다. 그 다음 실행부터 기준값과 비교합니다.
+
+import functools
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+# 스크래퍼가 저장소 안의 기록/분석 파일을 건드리지 않도록 import 전에 경로를 임시 디렉터리로 돌립니다.
+_WORK_DIR = Path(tempfile.mkdtemp(prefix="ssu-dining-tests-"))
+os.environ["SSU_DINING_HISTORY_DIR"] = str(_WORK_DIR / "history")
+os.environ["SSU_DINING_PARQUET_DIR"] = str(_WORK_DIR / "analytics")
+os.environ.pop("SSU_DINING_CACHE_URL", None)
+
+import menu_json  # noqa: E402
+import resource_governor  # noqa: E402
+
+PAGES_DIR = Path(__file__).resolve().parent / "fixtures" / "pages"
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"
+
+# 기준값보다 이만큼 나빠지면 실패합니다. 벽시계 시간은 비율 + 여유(초)로 봅니다.
+WALL_TOLERANCE = 0.5
+WALL_SLACK_S = 0.25
+RSS_TOLERANCE = 0.5
+
+DORM_PATH = "/SShostel/mall_main.php"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-baselines", action="store_true", help="이번 측정값을 tests/baselines.json에 저장")
+
+
+# --- 로컬 픽스처 서버 ---
+
+class FixtureServer:
+    """저장해 둔 페이지를 돌려주는 HTTP 서버. latency초만큼 늦게 응답하고, 받은 요청 경로를 모두 기록합니다."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path != "/favicon.ico":
+                    server.requests.append(self.path)
+                page = server.page_for(url.path, parse_qs(url.query))
+                if server.latency:
+                    time.sleep(server.latency)
+                if page is None:
+                    self.send_error(404)
+                    return
+                body = page.read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page_for(self, path: str, query: dict) -> Path | None:
+        if path == "/m/":
+            # 식당 선택 상자를 바꾸면 ?rest=<번호>로 다시 불러옵니다. (1 학생식당, 2 도담, 3 푸드코트)
+            return PAGES_DIR / f"soongguri_{query.get('rest', ['1'])[0]}.html"
+        if path == DORM_PATH:
+            return PAGES_DIR / "dorm_board.html"
+        return None
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def fixture_server(request, monkeypatch, tmp_path):
+    """
+    로컬 픽스처 서버를 띄우고 스크래퍼가 그 서버를 보도록 주소를 바꿉니다.
+    지연은 indirect 파라미터(초)로 줍니다. 정적 사이트는 tmp_path에 만듭니다.
+    """
+    import menu_sources
+    import site_build
+
+    server = FixtureServer(getattr(request, "param", 0.0))
+    server.start()
+    monkeypatch.setattr(menu_sources, "SOONGGURI_URL", f"{server.url}/m/")
+    monkeypatch.setattr(menu_sources, "DORM_URL", f"{server.url}{DORM_PATH}?viewform=B0001_foodboard_list&board_no=1")
+    monkeypatch.setattr(site_build, "build", functools.partial(site_build.build, tmp_path / "site"))
+    yield server
+    server.stop()
+
+
+# --- 측정과 기준값 비교 ---
+
+class PeakMemory:
+    """이 프로세스와 자손 프로세스(브라우저)의 RSS 합을 주기적으로 재서 최댓값을 기록합니다."""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        pid = os.getpid()
+        self.peak = max(self.peak, resource_governor.process_rss(pid) + resource_governor.sample_tree(pid)[2])
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+_session_results = []
+
+
+class PerfRecorder:
+    def __init__(self, config):
+        self.update = config.getoption("--update-baselines")
+        self.baselines = menu_json.load(BASELINES_PATH) if BASELINES_PATH.exists() else {}
+        self.changed = False
+
+    @contextmanager
+    def measure(self, name: str, server: FixtureServer):
+        """블록 하나의 벽시계 시간, 서버 왕복 수, 최대 메모리를 재서 yield한 dict에 채웁니다."""
+        metrics = {}
+        started = time.perf_counter()
+        with PeakMemory() as memory:
+            yield metrics
+        metrics.update({
+            "wall_s": round(time.perf_counter() - started, 3),
+            "round_trips": len(server.requests),
+            "peak_rss_mb": round(memory.peak / 2**20, 1),
+        })
+        _session_results.append({"name": name, "latency_s": server.latency, **metrics})
+
+    def check(self, name: str, metrics: dict):
+        """
+        측정값을 기준값과 비교해 크게 나빠졌으면 테스트를 실패시킵니다.
+        (--update-baselines면 비교하지 않고 기준값을 바꿈, 기준값이 없으면 이번 측정값을 기준값으로 기록하고 건너뜀)
+        """
+        if self.update:
+            self.baselines[name] = metrics
+            self.changed = True
+            return
+        baseline = self.baselines.get(name)
+        if baseline is None:
+            self.baselines[name] = metrics
+            self.changed = True
+            pytest.skip(f"{name}의 기준값이 없어 이번 측정값을 tests/baselines.json에 기록했습니다. "
+                        f"확인한 뒤 커밋해주세요. (측정값: {metrics})")
+        failures = []
+        if metrics["round_trips"] > baseline["round_trips"]:
+            failures.append(f"왕복 {metrics['round_trips']}회 > 기준 {baseline['round_trips']}회")
+        if metrics["wall_s"] > baseline["wall_s"] * (1 + WALL_TOLERANCE) + WALL_SLACK_S:
+            failures.append(f"시간 {metrics['wall_s']}s > 기준 {baseline['wall_s']}s")
+        if metrics["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + RSS_TOLERANCE):
+            failures.append(f"최대 메모리 {metrics['peak_rss_mb']}MB > 기준 {baseline['peak_rss_mb']}MB")
+        if failures:
+            pytest.fail(f"{name} 성능 회귀: " + ", ".join(failures))
+
+    def save(self):
+        if self.changed:
+            menu_json.dump(dict(sorted(self.baselines.items())), BASELINES_PATH, pretty=True)
+
+
+@pytest.fixture(scope="session")
+def perf(request):
+    recorder = PerfRecorder(request.config)
+    yield recorder
+    recorder.save()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _session_results:
+        return
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    started_at = datetime.now()
+    menu_json.dump({
+        "benchmark": "scrape",
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "results": _session_results,
+    }, RESULTS_DIR / f"scrape-{started_at.strftime('%Y%m%d-%H%M%S')}.json", pretty=True)
+
+
+@pytest.fixture(scope="session")
+def browser_available() -> bool:
+    """Playwright Chromium을 띄울 수 있는지 여부. (브라우저가 설치되지 않은 환경에서는 브라우저 테스트를 건너뜀)"""
+    import asyncio
+
+    from playwright.async_api import async_playwright
+
+    async def probe():
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            await browser.close()
+
+    try:
+        asyncio.run(probe())
+        return True
+    except Exception:
+        return False
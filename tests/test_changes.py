@@ -0,0 +1,59 @@
+# test_changes.py
+#
+# 변경 기록(menu_changes.py)의 기준 스냅샷이 버전을 잃지 않는지 확인합니다.
+# msgspec이 설치된 환경에서는 스키마 검증을 거쳐 읽으므로, 그때도 "version"과 스키마에 없는 키가 남아야 합니다.
+#
+# 실행: python -m pytest tests/test_changes.py
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import menu_changes
+import menu_json
+import menu_store
+
+SERVER_DIR = Path(__file__).resolve().parent.parent / "old" / "server"
+
+SNAPSHOT = {
+    "generated_at": "2025-10-20T11:00:00+09:00",
+    "date": "2025-10-20",
+    "places": {"dorm": {"name": "기숙사 식당", "extra": 1, "menus": [
+        {"meal": "중식", "corner": "중식", "items": [{"name": "김치찌개", "dish_id": 3}]},
+    ]}},
+}
+
+
+def _publish(history_dir, dish=None):
+    snapshot = menu_json.loads(menu_json.dumps(SNAPSHOT))
+    if dish:
+        snapshot["places"]["dorm"]["menus"][0]["items"][0]["name"] = dish
+    return menu_changes.publish(snapshot, history_dir)
+
+
+def test_base_keeps_version(tmp_path):
+    _publish(tmp_path)
+    _publish(tmp_path, "된장찌개")
+    menu_changes._base_cache.clear()
+
+    base = menu_changes.load_base(tmp_path)
+    assert base["version"] == menu_changes.latest_version(tmp_path) == 2
+    assert base["places"]["dorm"]["extra"] == 1
+    # 기록 저장소처럼 스키마 검증을 거쳐 읽어도 버전과 모르는 키가 남아야 합니다.
+    checked = menu_json.load_snapshot(menu_changes.base_path(tmp_path))
+    assert checked["version"] == 2
+    assert checked["places"]["dorm"]["extra"] == 1
+
+
+def test_changes_reset_has_version(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(SERVER_DIR))
+    import app
+
+    monkeypatch.setattr(menu_store, "HISTORY_DIR", tmp_path)
+    _publish(tmp_path)
+
+    response = TestClient(app.app).get("/api/changes")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reset"] is True
+    assert body["version"] == body["snapshot"]["version"] == 1
@@ -0,0 +1,68 @@
+# test_parsers.py
+#
+# 주간 식단 <pre> 파서(parse_weekly_text)가 Grammar 토크나이저로 옮기기 전의 구현과
+# 같은 결과를 내는지, 무작위로 만든 텍스트로 비교합니다.
+#
+# 실행: python -m pytest tests/test_parsers.py
+
+import random
+import re
+
+import pytest
+
+from menu_parsers import parse_weekly_text
+
+LABELS = ["학생식당", "숭실도담식당", "푸드코트"]
+
+# 줄을 만들 때 쓰는 조각: 식당 이름, ★, 공백, 기호, 일반 글자
+_PIECES = LABELS + ["★", "★ ", " ", "  ", "\t", "\r", "-", "[중식]", "김치찌개", "Rice", "*원산지", "5.0", ""]
+
+
+def _legacy_parse_weekly_text(text: str, labels: list) -> dict:
+    """Grammar로 옮기기 전의 parse_weekly_text입니다. (비교 기준)"""
+    star_re = re.compile(r"^★\s*(.+)$")
+    label_re = re.compile("|".join(re.escape(label) for label in labels))
+    menus = {label: [] for label in labels}
+    seen = set()
+    current = None
+
+    for line in text.split('\n'):
+        m = label_re.search(line)
+        if m:
+            label = m.group(0)
+            if label != current:
+                current = None if label in seen else label
+                seen.add(label)
+            line = line[m.end():]
+        if current is None:
+            continue
+        star = star_re.match(line)
+        if star:
+            menus[current].append(star.group(1).strip())
+
+    return menus
+
+
+def _random_text(rng: random.Random) -> str:
+    lines = []
+    for _ in range(rng.randint(0, 30)):
+        lines.append("".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 5))))
+    return "\n".join(lines)
+
+
+def test_weekly_sample():
+    text = "학생식당\n★ 김치찌개\n반찬\n★돈까스\n숭실도담식당 ★ 비빔밥\n  ★ 들여쓴 줄\n학생식당\n★ 무시됨\n푸드코트★ 라면"
+    assert parse_weekly_text(text, LABELS) == {
+        "학생식당": ["김치찌개", "돈까스"],
+        "숭실도담식당": [],
+        "푸드코트": ["라면"],
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_weekly_matches_legacy(seed):
+    rng = random.Random(seed)
+    for _ in range(2000):
+        text = _random_text(rng)
+        labels = rng.sample(LABELS, rng.randint(1, len(LABELS)))
+        assert parse_weekly_text(text, labels) == _legacy_parse_weekly_text(text, labels), text
@@ -0,0 +1,69 @@
+# test_scrape_perf.py
+#
+# scrape_today() 전체 과정(스크랩 → 파싱 → 저장)을 로컬 픽스처 서버에 대고 실행해
+# 결과가 맞는지 확인하고, 벽시계 시간/서버 왕복 수/최대 메모리를 기준값(tests/baselines.json)과 비교합니다.
+# 서버 응답마다 지연을 넣어 느린 네트워크에서의 시간도 함께 봅니다.
+#
+# 실행: python -m pytest tests
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+import menu_json
+import soongguri_playwright_complete as scraper
+
+EXPECTED = menu_json.load(Path(__file__).resolve().parent / "fixtures" / "expected_menus.json")
+
+LATENCIES = [0.0, 0.2]
+
+
+def _without_ids(menus: list) -> list:
+    """저장할 때 붙는 메뉴 ID(dish_id, component_ids)를 빼고 비교합니다."""
+    return [{**menu, "items": [{k: v for k, v in item.items() if k not in ("dish_id", "component_ids")}
+                               for item in menu["items"]]}
+            for menu in menus]
+
+
+def _run(tmp_path, places=None, direct=True) -> dict:
+    out_path = tmp_path / "menus.json"
+    # 실행하는 날의 요일/공휴일에 따라 결과가 달라지지 않도록 휴무 달력은 끕니다.
+    scraper.scrape_today(out_path=out_path, places=places, direct=direct, calendar=False)
+    return menu_json.load(out_path)
+
+
+@pytest.mark.parametrize("fixture_server", LATENCIES, indirect=True, ids=lambda s: f"latency={s * 1000:.0f}ms")
+def test_dorm_direct(fixture_server, perf, tmp_path):
+    """기숙사 식단은 브라우저 없이 요청 한 번으로 읽어야 합니다."""
+    name = f"dorm_direct[latency={fixture_server.latency * 1000:.0f}ms]"
+    with perf.measure(name, fixture_server) as metrics:
+        result = _run(tmp_path, places=["dorm"])
+
+    assert list(result["places"]) == ["dorm"]
+    expected = EXPECTED["dorm_by_weekday"][datetime.now(tz=scraper.KST).weekday()]
+    assert _without_ids(result["places"]["dorm"]["menus"]) == expected
+    assert fixture_server.requests and all(path.startswith("/SShostel/") for path in fixture_server.requests)
+    perf.check(name, metrics)
+
+
+@pytest.mark.parametrize("fixture_server", LATENCIES, indirect=True, ids=lambda s: f"latency={s * 1000:.0f}ms")
+def test_full_pipeline(fixture_server, perf, tmp_path, browser_available):
+    """모든 식당을 스크랩해 코너 파싱, 푸드코트 휴무 판단, 기숙사 요일 열 선택까지 확인합니다."""
+    if not browser_available:
+        pytest.skip("Playwright Chromium을 띄울 수 없습니다. (playwright install chromium)")
+    name = f"full_pipeline[latency={fixture_server.latency * 1000:.0f}ms]"
+    with perf.measure(name, fixture_server) as metrics:
+        result = _run(tmp_path)
+
+    places = result["places"]
+    assert list(places) == ["students", "dodam", "foodcourt", "dorm"]
+    assert _without_ids(places["students"]["menus"]) == EXPECTED["students"]
+    assert _without_ids(places["dodam"]["menus"]) == EXPECTED["dodam"]
+    assert places["foodcourt"]["menus"] == EXPECTED["foodcourt"]
+    expected_dorm = EXPECTED["dorm_by_weekday"][datetime.now(tz=scraper.KST).weekday()]
+    assert _without_ids(places["dorm"]["menus"]) == expected_dorm
+    # 메뉴 ID가 붙어 저장되고, 식당별 분할 파일도 함께 써야 합니다.
+    assert all("dish_id" in item for menu in places["students"]["menus"] for item in menu["items"])
+    assert (tmp_path / "menus" / "index.json").exists()
+    perf.check(name, metrics)